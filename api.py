@@ -1,15 +1,64 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import (Flask, render_template, request, redirect, url_for, flash, jsonify, session, g, has_app_context,
+                   has_request_context, Response)
 from flask_sqlalchemy import SQLAlchemy
-from flask_restful import Api, abort, Resource, reqparse, fields, marshal_with
+from flask_sqlalchemy.session import Session as FlaskSession
+from flask.logging import default_handler
+from flask_restful import Api, abort, Resource, reqparse, fields, marshal, marshal_with as restful_marshal_with
+from flask_restful.representations.json import output_json as restful_output_json
+from flask_restful.utils import unpack
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.exceptions import BadRequest, NotFound, InternalServerError
+from werkzeug.middleware.proxy_fix import ProxyFix
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import and_, bindparam, case, create_engine, event, insert, literal, or_, select, update
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm import Session as OrmSession, selectinload, with_loader_criteria
+from sqlalchemy.pool import Pool
+from sqlalchemy.schema import CreateColumn, CreateTable, ForeignKeyConstraint
+from sqlalchemy.sql.util import find_tables
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.utils import parsedate_to_datetime
 from functools import wraps
+import atexit
+import collections
+import contextlib
+import copy
+import gzip
+import hashlib
+import json
+import logging
+import math
+import logging.handlers
 import os
+import queue
+import random
+import re
+import smtplib
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import zlib
 import pytest
 import subprocess
 from dotenv import load_dotenv
 
+# Optional encoders: used for Accept-Encoding negotiation only when installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Load environment variables
 load_dotenv()
 
@@ -22,10 +71,1078 @@ api = Api(app)
 
 # Use absolute path for database
 basedir = os.path.abspath(os.path.dirname(__file__))
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(basedir, "instance", "database.db")
+app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
+    "DATABASE_URL", "sqlite:///" + os.path.join(basedir, "instance", "database.db")
+)
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# Per-request query count / timing breakdown in a Server-Timing header
+app.config["SQL_INSTRUMENTATION"] = os.environ.get("SQL_INSTRUMENTATION", "0") == "1"
+# Slow query / slow request log (thresholds in ms, 0 disables)
+app.config["SLOW_QUERY_MS"] = float(os.environ.get("SLOW_QUERY_MS", "0"))
+app.config["SLOW_REQUEST_MS"] = float(os.environ.get("SLOW_REQUEST_MS", "0"))
+app.config["SLOW_REQUEST_SAMPLE_RATE"] = float(os.environ.get("SLOW_REQUEST_SAMPLE_RATE", "1.0"))
+app.config["SLOW_LOG_FILE"] = os.environ.get("SLOW_LOG_FILE", os.path.join(basedir, "instance", "slow.log"))
+# Deleted boards/lists/tasks/users stay restorable this long before the purge worker removes them
+app.config["PURGE_GRACE_SECONDS"] = int(os.environ.get("PURGE_GRACE_SECONDS", str(24 * 3600)))
+# Tasks sitting in the Done list longer than this are archived out of board payloads
+app.config["ARCHIVE_DONE_AFTER_DAYS"] = float(os.environ.get("ARCHIVE_DONE_AFTER_DAYS", "14"))
+# Board payloads carry this many tasks per list; the rest is paged from /api/lists/<id>/tasks
+app.config["TASKS_PAGE_SIZE"] = int(os.environ.get("TASKS_PAGE_SIZE", "50"))
+# Board change log entries older than this are compacted away (clients behind that resync)
+app.config["CHANGELOG_RETENTION_HOURS"] = float(os.environ.get("CHANGELOG_RETENTION_HOURS", str(7 * 24)))
+# Serialized board snapshots: "memory" (per process), "sqlite" (shared by all workers) or "none"
+app.config["BOARD_CACHE_BACKEND"] = os.environ.get("BOARD_CACHE_BACKEND", "memory")
+app.config["BOARD_CACHE_MAX_BYTES"] = int(os.environ.get("BOARD_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+app.config["BOARD_CACHE_PATH"] = os.environ.get("BOARD_CACHE_PATH", os.path.join(basedir, "instance", "board_cache.db"))
+# Token-bucket rate limits as "requests/seconds": auth = password-hashing endpoints per IP,
+# write = API writes per user. Backend "memory" (per process), "sqlite" (shared by all workers) or "none"
+app.config["RATE_LIMIT_BACKEND"] = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+app.config["RATE_LIMIT_PATH"] = os.environ.get("RATE_LIMIT_PATH", os.path.join(basedir, "instance", "rate_limit.db"))
+app.config["RATE_LIMIT_AUTH"] = os.environ.get("RATE_LIMIT_AUTH", "10/60")
+app.config["RATE_LIMIT_WRITE"] = os.environ.get("RATE_LIMIT_WRITE", "120/60")
+# Idempotency-Key replay for POSTs: "memory" (per process), "sqlite" (shared by all workers) or "none".
+# Responses are kept for IDEMPOTENCY_TTL_SECONDS; a duplicate waits up to IDEMPOTENCY_WAIT_SECONDS for the first
+app.config["IDEMPOTENCY_BACKEND"] = os.environ.get("IDEMPOTENCY_BACKEND", "memory")
+app.config["IDEMPOTENCY_PATH"] = os.environ.get("IDEMPOTENCY_PATH", os.path.join(basedir, "instance", "idempotency.db"))
+app.config["IDEMPOTENCY_TTL_SECONDS"] = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+app.config["IDEMPOTENCY_WAIT_SECONDS"] = float(os.environ.get("IDEMPOTENCY_WAIT_SECONDS", "10"))
+# Reverse proxies in front of the app (1 behind nginx) whose X-Forwarded-For is trusted for client IPs
+app.config["PROXY_FIX_HOPS"] = int(os.environ.get("PROXY_FIX_HOPS", "0"))
+# Compiled templates survive restarts here ("" disables); TEMPLATE_WARMUP compiles every template at boot
+app.config["JINJA_BYTECODE_CACHE_DIR"] = os.environ.get("JINJA_BYTECODE_CACHE_DIR", os.path.join(basedir, "instance", "jinja_cache"))
+app.config["TEMPLATE_WARMUP"] = os.environ.get("TEMPLATE_WARMUP", "1") == "1"
+# Response compression: server preference order (unavailable encoders are skipped) and size floor in bytes
+app.config["COMPRESS_ALGORITHMS"] = os.environ.get("COMPRESS_ALGORITHMS", "br,zstd,gzip").split(",")
+app.config["COMPRESS_MIN_SIZE"] = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+# Application log: JSON lines to LOG_FILE ("" = stderr) at LOG_LEVEL, with "logger=LEVEL,..." overrides in LOG_LEVELS
+app.config["LOG_LEVEL"] = os.environ.get("LOG_LEVEL", "INFO").upper()
+app.config["LOG_LEVELS"] = os.environ.get("LOG_LEVELS", "")
+app.config["LOG_FILE"] = os.environ.get("LOG_FILE", "")
+# Sharded storage: boards, lists and tasks of new users go to one of SHARD_COUNT SQLite files in SHARD_DIR
+# (0 keeps everything in the main database); management/shard_db.py moves existing users
+app.config["SHARD_COUNT"] = int(os.environ.get("SHARD_COUNT", "0"))
+app.config["SHARD_DIR"] = os.environ.get("SHARD_DIR", os.path.join(basedir, "instance", "shards"))
+# Background jobs (management/run_worker.py): attempts before a job fails, first retry delay (doubles per attempt),
+# how long a claim lasts without a worker heartbeat, and how long finished jobs stay readable
+app.config["JOB_MAX_ATTEMPTS"] = int(os.environ.get("JOB_MAX_ATTEMPTS", "5"))
+app.config["JOB_BACKOFF_SECONDS"] = float(os.environ.get("JOB_BACKOFF_SECONDS", "5"))
+app.config["JOB_LEASE_SECONDS"] = float(os.environ.get("JOB_LEASE_SECONDS", "60"))
+app.config["JOB_RETENTION_HOURS"] = float(os.environ.get("JOB_RETENTION_HOURS", "72"))
+# Due-date reminders (management/run_scheduler.py): how early the "upcoming" reminder goes out, where reminders
+# are sent (log, smtp or none), and how long a scheduler may hold a claimed batch before another one retries it
+app.config["REMINDER_LEAD_MINUTES"] = float(os.environ.get("REMINDER_LEAD_MINUTES", "60"))
+app.config["REMINDER_SINK"] = os.environ.get("REMINDER_SINK", "log")
+app.config["REMINDER_BATCH_SIZE"] = int(os.environ.get("REMINDER_BATCH_SIZE", "200"))
+app.config["REMINDER_LEASE_SECONDS"] = float(os.environ.get("REMINDER_LEASE_SECONDS", "60"))
+app.config["REMINDER_SMTP_HOST"] = os.environ.get("REMINDER_SMTP_HOST", "localhost")
+app.config["REMINDER_SMTP_PORT"] = int(os.environ.get("REMINDER_SMTP_PORT", "1025"))
+app.config["REMINDER_SMTP_FROM"] = os.environ.get("REMINDER_SMTP_FROM", "kanban@localhost")
+
+if app.config["PROXY_FIX_HOPS"]:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_HOPS"], x_proto=app.config["PROXY_FIX_HOPS"])
+
+class ShardedSession(FlaskSession):
+    """Sends statements on board data to the shard of the current user (see shard_scope).
+
+    Everything else, and board data of users still in the main database, uses the default engine.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        shard = g.get('shard') if has_app_context() else None
+        if bind is None and shard is not None and touches_shard(mapper, clause):
+            return shard_engine(shard)
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(app, session_options={'class_': ShardedSession})
+
+
+@event.listens_for(Engine, "connect")
+def _sqlite_connection_pragmas(dbapi_connection, connection_record):
+    """SQLite ships with foreign keys off; ON DELETE CASCADE needs them on for every connection.
+
+    auto_vacuum only takes effect on a file that has no tables yet (or at its next VACUUM), so new
+    databases and shards come up ready for management/maintain_db.py's incremental vacuum.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.close()
+
+
+# Structured logging
+# Values of these record fields never reach the log; e-mail addresses are masked
+LOG_REDACTED_FIELDS = {'password', 'name', 'token', 'secret', 'authorization', 'cookie', 'session'}
+REQUEST_ID_PATTERN = re.compile(r'[A-Za-z0-9._-]{1,64}')
+
+log = logging.getLogger('kanban')
+
+
+def mask_email(email):
+    """'alice@example.com' -> 'a***@example.com'"""
+    local, at, domain = str(email).partition('@')
+    return f"{local[:1]}***{at}{domain}" if at else "***"
+
+
+def redact_field(key, value):
+    if value is None:
+        return None
+    if key.lower() in LOG_REDACTED_FIELDS:
+        return "<redacted>"
+    if key.lower() == 'email':
+        return mask_email(value)
+    return value
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the request id, method and path while still on the request thread"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.method = request.method
+            record.path = request.path
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; extra= fields become keys and pass through redact_field"""
+
+    RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.utcfromtimestamp(record.created).isoformat(timespec='milliseconds') + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self.RESERVED and not key.startswith('_'):
+                entry[key] = redact_field(key, value)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread; a full queue drops the record instead of waiting"""
+
+    def prepare(self, record):
+        # Only the cheap parts run here: merge args and render the traceback while it still exists
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_DROPPED.inc()
+
+
+def setup_logging():
+    """Route the 'kanban' loggers through a bounded queue to a background writer thread"""
+    if app.config["LOG_FILE"]:
+        target = logging.handlers.RotatingFileHandler(
+            app.config["LOG_FILE"], maxBytes=10 * 1024 * 1024, backupCount=5, encoding='utf-8')
+    else:
+        target = logging.StreamHandler(sys.stderr)
+    target.setFormatter(JsonFormatter())
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=10000))
+    handler.addFilter(RequestContextFilter())
+    log.addHandler(handler)
+    log.setLevel(app.config["LOG_LEVEL"])
+    log.propagate = False
+    # Flask logs unhandled exceptions (with traceback) on app.logger
+    app.logger.removeHandler(default_handler)
+    app.logger.addHandler(handler)
+    for override in filter(None, app.config["LOG_LEVELS"].split(',')):
+        name, _, level = override.partition('=')
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    listener = logging.handlers.QueueListener(handler.queue, target, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # drains what is still queued
+    return handler, listener
+
+
+log_handler, log_listener = setup_logging()
+
+
+@app.before_request
+def assign_request_id():
+    """Reuse the proxy's X-Request-ID (nginx sets $request_id) or mint one"""
+    incoming = request.headers.get('X-Request-ID', '')
+    g.request_id = incoming if REQUEST_ID_PATTERN.fullmatch(incoming) else uuid.uuid4().hex
+
+
+@app.after_request
+def echo_request_id(response):
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    return response
+
+
+# Request instrumentation
+class RequestTimings:
+    """Statement count and time buckets collected for a single request"""
+    __slots__ = ('started', 'queries', 'db', 'serialize', 'statements')
+
+    def __init__(self, keep_statements=False):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        # (sql, seconds) pairs, only kept when slow requests are being sampled
+        self.statements = [] if keep_statements else None
+
+    def server_timing(self):
+        total = time.perf_counter() - self.started
+        handler = max(total - self.db - self.serialize, 0.0)
+        return (
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize * 1000:.2f}, '
+            f'handler;dur={handler * 1000:.2f}, '
+            f'total;dur={total * 1000:.2f}'
+        )
+
+
+def current_timings():
+    """Timings of the running request, None when instrumentation is off"""
+    return g.get('timings') if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own context: a statement that raises never reaches after_cursor_execute,
+    # and its start time goes away with the context instead of piling up on the pooled connection
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_query_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    timings = current_timings()
+    if timings is not None:
+        timings.queries += 1
+        timings.db += elapsed
+        if timings.statements is not None:
+            timings.statements.append((statement, elapsed))
+    threshold = app.config["SLOW_QUERY_MS"]
+    if threshold and elapsed * 1000 >= threshold:
+        slow_log.query(conn.engine, statement, parameters, executemany, elapsed)
+
+
+def install_sql_listeners(engine):
+    """Attach the statement timers once; nothing is registered while instrumentation is off"""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+@app.before_request
+def start_request_timings():
+    if app.config["SQL_INSTRUMENTATION"] or app.config["SLOW_QUERY_MS"] or app.config["SLOW_REQUEST_MS"]:
+        install_sql_listeners(db.engine)
+        g.timings = RequestTimings(keep_statements=bool(app.config["SLOW_REQUEST_MS"]))
+
+
+@app.after_request
+def add_server_timing(response):
+    timings = current_timings()
+    if timings is not None:
+        if app.config["SQL_INSTRUMENTATION"]:
+            response.headers['Server-Timing'] = timings.server_timing()
+        slow_log.request(timings, response)
+    return response
+
+
+class marshal_with(restful_marshal_with):
+    """flask_restful.marshal_with that books marshalling time under 'serialize'"""
+
+    def __call__(self, f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            resp = f(*args, **kwargs)
+            timings = current_timings()
+            started = time.perf_counter()
+            if isinstance(resp, tuple):
+                data, code, headers = unpack(resp)
+                result = marshal(data, self.fields, self.envelope), code, headers
+            else:
+                result = marshal(resp, self.fields, self.envelope)
+            if timings is not None:
+                timings.serialize += time.perf_counter() - started
+            return result
+        return wrapper
+
+
+@api.representation('application/json')
+def output_json(data, code, headers=None):
+    """flask_restful's JSON output, with encoding time booked under 'serialize'"""
+    timings = current_timings()
+    started = time.perf_counter()
+    resp = restful_output_json(data, code, headers)
+    if timings is not None:
+        timings.serialize += time.perf_counter() - started
+    return resp
+
+
+# Metrics
+# Set PROMETHEUS_MULTIPROC_DIR (before the app is imported) when running preforked workers,
+# so /metrics aggregates every worker's samples instead of only the one serving the scrape.
+REQUEST_COUNT = Counter('kanban_http_requests_total', 'HTTP requests by endpoint, method and status',
+                        ['endpoint', 'method', 'status'])
+REQUEST_LATENCY = Histogram('kanban_http_request_duration_seconds', 'HTTP request latency by endpoint',
+                            ['endpoint', 'method'])
+HANDLER_ERRORS = Counter('kanban_handler_errors_total', 'Responses produced by the error handlers', ['handler'])
+DB_POOL_CHECKED_OUT = Gauge('kanban_db_pool_checked_out', 'Pooled DB connections currently in use',
+                            multiprocess_mode='livesum')
+DB_COMMIT_LATENCY = Histogram('kanban_db_commit_duration_seconds', 'Session commit latency (flush + COMMIT)')
+SLOW_EVENTS = Counter('kanban_slow_events_total', 'Statements/requests over the slow-log thresholds', ['kind'])
+PURGED_ROWS = Counter('kanban_purged_rows_total', 'Tombstoned rows removed by the purge worker', ['table'])
+PURGE_PENDING = Gauge('kanban_purge_pending', 'Tombstones waiting for the purge worker', ['table'],
+                      multiprocess_mode='liveall')
+PURGE_BATCH_LATENCY = Histogram('kanban_purge_batch_duration_seconds', 'Write-lock hold time of one purge batch')
+ARCHIVED_TASKS = Counter('kanban_archived_tasks_total', 'Done tasks moved to the archive tier')
+BOARD_CACHE_LOOKUPS = Counter('kanban_board_cache_lookups_total', 'Board snapshot cache lookups', ['result'])
+BOARD_CACHE_EVICTIONS = Counter('kanban_board_cache_evictions_total', 'Snapshots evicted to stay under the byte budget')
+BOARD_CACHE_BYTES = Gauge('kanban_board_cache_bytes', 'Bytes held by the board snapshot cache',
+                          multiprocess_mode='liveall')
+RESPONSE_BYTES = Counter('kanban_response_bytes_total', 'Response body bytes sent, by content encoding', ['encoding'])
+COMPRESSION_LATENCY = Histogram('kanban_compression_duration_seconds', 'Time spent compressing a body', ['encoding'],
+                                buckets=(.0001, .0005, .001, .0025, .005, .01, .025, .05, .1))
+LOG_DROPPED = Counter('kanban_log_records_dropped_total', 'Log records dropped because the log queue was full')
+CHANGELOG_COMPACTED = Counter('kanban_changelog_compacted_total', 'Change log rows removed by compaction', ['reason'])
+IDEMPOTENCY_REQUESTS = Counter('kanban_idempotency_requests_total', 'POSTs carrying an Idempotency-Key, by outcome',
+                               ['result'])
+RATE_LIMITED = Counter('kanban_rate_limited_total', 'Requests rejected by the rate limiter', ['rule', 'endpoint'])
+JOBS_PROCESSED = Counter('kanban_jobs_processed_total', 'Background job runs by kind and outcome', ['kind', 'outcome'])
+JOB_DURATION = Histogram('kanban_job_duration_seconds', 'Background job run time', ['kind'],
+                         buckets=(.01, .05, .1, .5, 1, 5, 15, 60, 300, float('inf')))
+JOB_QUEUE_WAIT = Histogram('kanban_job_queue_wait_seconds', 'Time from enqueue to the first run of a job', ['kind'],
+                           buckets=(.01, .1, .5, 1, 5, 15, 60, 300, float('inf')))
+REMINDERS = Counter('kanban_reminders_total', 'Due-date reminders by kind and outcome', ['kind', 'outcome'])
+REMINDER_DELAY = Histogram('kanban_reminder_delay_seconds', 'Time between a reminder falling due and going out',
+                           buckets=(.1, .5, 1, 5, 15, 60, 300, 3600, float('inf')))
+PASSWORD_HASH_LATENCY = Histogram('kanban_password_hash_duration_seconds', 'Password hash/check time',
+                                  ['operation'], buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5))
+
+
+@event.listens_for(Pool, 'checkout')
+def _pool_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKED_OUT.inc()
+
+
+@event.listens_for(Pool, 'checkin')
+def _pool_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+
+@event.listens_for(OrmSession, 'before_commit')
+def _commit_started(session):
+    session.info['commit_started'] = time.perf_counter()
+
+
+@event.listens_for(OrmSession, 'after_commit')
+def _commit_finished(session):
+    started = session.info.pop('commit_started', None)
+    if started is not None:
+        DB_COMMIT_LATENCY.observe(time.perf_counter() - started)
+
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.endpoint or 'unmatched'
+        REQUEST_LATENCY.labels(endpoint, request.method).observe(time.perf_counter() - started)
+        REQUEST_COUNT.labels(endpoint, request.method, response.status_code).inc()
+    return response
+
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus scrape endpoint"""
+    registry = REGISTRY
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+# Slow query / slow request log
+class SlowLog:
+    """Writes slow statements (with EXPLAIN QUERY PLAN) and sampled slow requests to a rotating file.
+
+    The request thread only enqueues; the plan is captured and the line written by a
+    background thread, so a slow request is not made slower by logging it.
+    """
+
+    def __init__(self, maxsize=1000):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.logger = logging.getLogger('kanban.slow')
+        self.logger.propagate = False
+        self.lock = threading.Lock()
+        self.handler = None
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            if self.handler is None:
+                self.handler = logging.handlers.RotatingFileHandler(
+                    app.config["SLOW_LOG_FILE"], maxBytes=10 * 1024 * 1024, backupCount=5, encoding='utf-8')
+                self.logger.addHandler(self.handler)
+                self.logger.setLevel(logging.INFO)
+            self.thread = threading.Thread(target=self._run, name='slow-log', daemon=True)
+            self.thread.start()
+
+    def _put(self, item):
+        if self.thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            SLOW_EVENTS.labels('dropped').inc()  # never block the request on the log
+
+    def query(self, engine, statement, parameters, executemany, elapsed):
+        SLOW_EVENTS.labels('query').inc()
+        if executemany and parameters:
+            parameters = parameters[0]
+        self._put({
+            "type": "slow_query",
+            "duration_ms": round(elapsed * 1000, 2),
+            "endpoint": request.endpoint if has_request_context() else None,
+            "sql": statement,
+            "params": redact_params(parameters),
+            # raw parameters stay in memory for EXPLAIN only, they are never written out
+            "_explain": (engine, statement, parameters),
+        })
+
+    def request(self, timings, response):
+        threshold = app.config["SLOW_REQUEST_MS"]
+        elapsed = time.perf_counter() - timings.started
+        if not threshold or elapsed * 1000 < threshold:
+            return
+        SLOW_EVENTS.labels('request').inc()
+        if random.random() >= app.config["SLOW_REQUEST_SAMPLE_RATE"]:
+            return
+        statements = sorted(timings.statements or [], key=lambda item: item[1], reverse=True)
+        self._put({
+            "type": "slow_request",
+            "duration_ms": round(elapsed * 1000, 2),
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "queries": timings.queries,
+            "db_ms": round(timings.db * 1000, 2),
+            "top_statements": [{"sql": sql, "duration_ms": round(sec * 1000, 2)} for sql, sec in statements[:10]],
+        })
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                explain = item.pop("_explain", None)
+                if explain is not None:
+                    item["plan"] = explain_query_plan(*explain)
+                self.logger.info(json.dumps(item, default=str))
+            except Exception:
+                # One bad entry must not stop the only thread draining the queue
+                log.exception("Slow log entry failed", extra={'type': item.get('type')})
+            finally:
+                self.queue.task_done()
+
+
+def redact_params(parameters):
+    """Keep numbers/dates for context, hide every string or blob value"""
+    def redact(value):
+        if isinstance(value, (str, bytes)):
+            return f"<redacted {type(value).__name__} len={len(value)}>"
+        if value is None or isinstance(value, (int, float)):
+            return value
+        return str(value)
+    if isinstance(parameters, dict):
+        return {key: redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(value) for value in parameters]
+    return parameters
+
+
+def explain_query_plan(engine, statement, parameters):
+    """Rows of SQLite's EXPLAIN QUERY PLAN for a statement, on a separate connection"""
+    if engine.dialect.name != 'sqlite':
+        return None
+    # Raw DBAPI connection: the EXPLAIN must not re-enter the statement listeners.
+    # The checkout itself can time out while requests hold the pool, so it is inside the try too.
+    connection = None
+    try:
+        connection = engine.raw_connection()
+        cursor = connection.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as exc:
+        return f"unavailable: {exc}"
+    finally:
+        if connection is not None:
+            connection.close()
+
+
+slow_log = SlowLog()
+
+
+# Response compression
+COMPRESSORS = {'gzip': lambda body: gzip.compress(body, compresslevel=6, mtime=0)}
+if brotli is not None:
+    COMPRESSORS['br'] = lambda body: brotli.compress(body, quality=5)
+if zstandard is not None:
+    COMPRESSORS['zstd'] = zstandard.ZstdCompressor(level=3).compress
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'image/svg+xml')
+
+
+def negotiate_encoding():
+    """Best encoding both sides support, in server preference order; None for identity"""
+    for name in app.config["COMPRESS_ALGORITHMS"]:
+        if name in COMPRESSORS and request.accept_encodings[name]:
+            return name
+    return None
+
+
+def etag_variants(tag):
+    """A strong ETag as sent for each encoding: compress_response appends "-<encoding>" to it"""
+    return [tag] + [f"{tag}-{encoding}" for encoding in COMPRESSORS]
+
+
+def compress(body, encoding):
+    with COMPRESSION_LATENCY.labels(encoding).time():
+        return COMPRESSORS[encoding](body)
+
+
+@app.after_request
+def compress_response(response):
+    """Compress large textual responses for clients that accept it (snapshots arrive pre-compressed)"""
+    if not (response.mimetype.startswith('text/') or response.mimetype in COMPRESSIBLE_TYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+            or response.status_code in (204, 304) or 'Content-Encoding' in response.headers):
+        RESPONSE_BYTES.labels(response.headers.get('Content-Encoding', 'identity')).inc(response.content_length or 0)
+        return response
+    encoding = negotiate_encoding()
+    body = response.get_data()
+    if encoding is not None and len(body) >= app.config["COMPRESS_MIN_SIZE"]:
+        body = compress(body, encoding)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        # A strong ETag names exact bytes, so the compressed representation needs its own
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f"{etag}-{encoding}")
+    RESPONSE_BYTES.labels(encoding if 'Content-Encoding' in response.headers else 'identity').inc(len(body))
+    return response
+
+
+# Static assets
+ASSET_MANIFEST = os.path.join(app.static_folder, 'dist', 'manifest.json')
+_asset_manifest = {'mtime': None, 'entries': {}}
+
+
+def load_asset_manifest():
+    """Manifest entries, re-read whenever build_assets.py rewrites the file"""
+    try:
+        mtime = os.path.getmtime(ASSET_MANIFEST)
+    except OSError:
+        mtime = None
+    if mtime != _asset_manifest['mtime']:
+        entries = {}
+        if mtime is not None:
+            with open(ASSET_MANIFEST, encoding='utf-8') as handle:
+                entries = json.load(handle)
+        _asset_manifest.update(mtime=mtime, entries=entries)
+    return _asset_manifest['entries']
+
+
+@app.template_global()
+def asset_url(path):
+    """url_for('static', ...) that resolves to the fingerprinted bundle built by management/build_assets.py.
+
+    Falls back to the unbuilt file, so a fresh checkout works without a build.
+    """
+    return url_for('static', filename=load_asset_manifest().get(path, path))
+
+
+@app.after_request
+def cache_static_assets(response):
+    """Fingerprinted bundles never change under the same name, so browsers may keep them for a year"""
+    if (request.endpoint == 'static' and response.status_code in (200, 304)
+            and request.view_args.get('filename', '').startswith('dist/')):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 365 * 24 * 3600
+        response.cache_control.immutable = True
+    return response
+
+
+# Rate limiting
+def parse_rate(value):
+    """'10/60' -> (capacity 10, refill 10/60 tokens per second)"""
+    requests, _, seconds = value.partition('/')
+    return int(requests), int(requests) / float(seconds or 1)
+
+
+class MemoryRateLimiter:
+    """Token buckets in a per-process dict"""
+
+    MAX_BUCKETS = 100000
+
+    def __init__(self):
+        self.buckets = collections.OrderedDict()  # key -> (tokens, updated), least recently used first
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        """Spend one token; returns 0 when allowed, else the seconds until a token is available"""
+        now = time.monotonic()
+        with self.lock:
+            if key not in self.buckets and len(self.buckets) >= self.MAX_BUCKETS:
+                # A missing bucket counts as full, so eviction forgives; the one idle longest is
+                # the likeliest to have refilled already, and no other client's bucket is touched
+                self.buckets.popitem(last=False)
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            self.buckets[key] = (tokens - 1 if allowed else tokens, now)
+            self.buckets.move_to_end(key)
+            return 0 if allowed else (1 - tokens) / rate
+
+    def reset(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class SqliteRateLimiter:
+    """Token buckets in a local SQLite file, so every worker on the host draws from the same bucket"""
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection().execute(
+            "CREATE TABLE IF NOT EXISTS bucket (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self.local.conn = conn
+        return conn
+
+    def take(self, key, capacity, rate):
+        conn = self.connection()
+        now = time.time()
+        # Refill and spend in one statement: the upsert only applies while a whole token is left
+        taken = conn.execute("""
+            INSERT INTO bucket (key, tokens, updated) VALUES (:key, :capacity - 1, :now)
+            ON CONFLICT (key) DO UPDATE
+                SET tokens = min(:capacity, tokens + (:now - updated) * :rate) - 1, updated = :now
+                WHERE min(:capacity, tokens + (:now - updated) * :rate) >= 1
+            RETURNING tokens
+        """, {'key': key, 'capacity': capacity, 'now': now, 'rate': rate}).fetchone()
+        if random.random() < 0.001:
+            # Buckets idle long enough to be full again carry no information
+            conn.execute("DELETE FROM bucket WHERE updated < ?", (now - 24 * 3600,))
+        if taken is not None:
+            return 0
+        row = conn.execute("SELECT tokens, updated FROM bucket WHERE key = ?", (key,)).fetchone()
+        tokens = min(capacity, row[0] + (now - row[1]) * rate) if row else capacity
+        return max((1 - tokens) / rate, 0.001)
+
+    def reset(self):
+        self.connection().execute("DELETE FROM bucket")
+
+
+def make_rate_limiter():
+    backend = app.config["RATE_LIMIT_BACKEND"]
+    if backend == 'memory':
+        return MemoryRateLimiter()
+    if backend == 'sqlite':
+        return SqliteRateLimiter(app.config["RATE_LIMIT_PATH"])
+    if backend == 'none':
+        return None
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+
+rate_limiter = make_rate_limiter()
+
+# Endpoints that hash a password on every call: limited per client IP and endpoint
+AUTH_ENDPOINTS = {('signin', 'POST'), ('register', 'POST'), ('login', 'POST'), ('signup', 'POST'), ('users', 'POST')}
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+def rate_limit_rule():
+    """(rule, bucket key) for the current request, None when it is not limited"""
+    if (request.endpoint, request.method) in AUTH_ENDPOINTS:
+        return 'auth', f"auth:{request.endpoint}:{request.remote_addr}"
+    if request.method in WRITE_METHODS and request.path.startswith('/api/'):
+        client = f"user:{session['user_id']}" if 'user_id' in session else f"ip:{request.remote_addr}"
+        return 'write', f"write:{client}"
+    return None
+
+
+@app.before_request
+def enforce_rate_limit():
+    """Reject over-limit requests before any database or password hashing work"""
+    if rate_limiter is None:
+        return None
+    rule = rate_limit_rule()
+    if rule is None:
+        return None
+    name, key = rule
+    capacity, rate = parse_rate(app.config[f"RATE_LIMIT_{name.upper()}"])
+    retry_after = rate_limiter.take(key, capacity, rate)
+    if not retry_after:
+        return None
+    RATE_LIMITED.labels(name, request.endpoint).inc()
+    seconds = math.ceil(retry_after)
+    if request.path.startswith('/api/'):
+        response = jsonify({"error": "Too many requests", "retry_after": seconds})
+    else:
+        response = Response(f"Too many attempts, please try again in {seconds} seconds.", mimetype='text/plain')
+    response.status_code = 429
+    response.headers['Retry-After'] = str(seconds)
+    return response
+
+
+# Idempotency keys
+# An in-flight claim left behind by a crashed worker frees up after this long
+IDEMPOTENCY_LEASE_SECONDS = 60
+
+
+class IdempotentEntry:
+    __slots__ = ('fingerprint', 'expires', 'response', 'done')
+
+    def __init__(self, fingerprint, expires):
+        self.fingerprint = fingerprint
+        self.expires = expires
+        self.response = None  # (status, JSON body) once the first request finished
+        self.done = threading.Event()
+
+
+class MemoryIdempotencyStore:
+    """Keys in a per-process dict in claim order; expired keys are dropped from the front"""
+
+    MAX_KEYS = 100000
+
+    def __init__(self):
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def claim(self, key, fingerprint):
+        """('claimed', None) | ('done', (status, body)) | ('busy', handle for wait) | ('mismatch', None)"""
+        now = time.time()
+        with self.lock:
+            while self.entries:
+                oldest = next(iter(self.entries.values()))
+                if oldest.expires > now and len(self.entries) < self.MAX_KEYS:
+                    break
+                self.entries.popitem(last=False)[1].done.set()
+            entry = self.entries.get(key)
+            if entry is None or entry.expires <= now:
+                self.entries.pop(key, None)
+                self.entries[key] = IdempotentEntry(fingerprint, now + IDEMPOTENCY_LEASE_SECONDS)
+                return 'claimed', None
+            if entry.fingerprint != fingerprint:
+                return 'mismatch', None
+            if entry.response is not None:
+                return 'done', entry.response
+            return 'busy', entry.done
+
+    def wait(self, busy, timeout):
+        busy.wait(timeout)
+
+    def complete(self, key, response, ttl):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.response = response
+                entry.expires = time.time() + ttl
+                entry.done.set()
+
+    def release(self, key):
+        with self.lock:
+            entry = self.entries.pop(key, None)
+        if entry is not None:
+            entry.done.set()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class SqliteIdempotencyStore:
+    """Keys in a local SQLite file shared by every worker on the host; duplicates poll for the result"""
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection().execute("""
+            CREATE TABLE IF NOT EXISTS idempotency_key (
+                key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, status INTEGER, body TEXT, expires REAL NOT NULL)
+        """)
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def claim(self, key, fingerprint):
+        conn = self.connection()
+        now = time.time()
+        if random.random() < 0.01:
+            conn.execute("DELETE FROM idempotency_key WHERE expires <= ?", (now,))
+        # Insert, or take over a key whose TTL (or a crashed worker's lease) ran out, in one statement
+        claimed = conn.execute("""
+            INSERT INTO idempotency_key (key, fingerprint, status, body, expires) VALUES (?, ?, NULL, NULL, ?)
+            ON CONFLICT (key) DO UPDATE
+                SET fingerprint = excluded.fingerprint, status = NULL, body = NULL, expires = excluded.expires
+                WHERE idempotency_key.expires <= ?
+            RETURNING key
+        """, (key, fingerprint, now + IDEMPOTENCY_LEASE_SECONDS, now)).fetchone()
+        if claimed is not None:
+            return 'claimed', None
+        row = conn.execute("SELECT fingerprint, status, body FROM idempotency_key WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return 'busy', None  # released between the two statements; the next claim takes it
+        if row[0] != fingerprint:
+            return 'mismatch', None
+        if row[1] is not None:
+            return 'done', (row[1], row[2])
+        return 'busy', None
+
+    def wait(self, busy, timeout):
+        time.sleep(min(self.POLL_INTERVAL, timeout))
+
+    def complete(self, key, response, ttl):
+        self.connection().execute("UPDATE idempotency_key SET status = ?, body = ?, expires = ? WHERE key = ?",
+                                  (*response, time.time() + ttl, key))
+
+    def release(self, key):
+        self.connection().execute("DELETE FROM idempotency_key WHERE key = ?", (key,))
+
+    def clear(self):
+        self.connection().execute("DELETE FROM idempotency_key")
+
+
+def make_idempotency_store():
+    backend = app.config["IDEMPOTENCY_BACKEND"]
+    if backend == 'memory':
+        return MemoryIdempotencyStore()
+    if backend == 'sqlite':
+        return SqliteIdempotencyStore(app.config["IDEMPOTENCY_PATH"])
+    if backend == 'none':
+        return None
+    raise ValueError(f"Unknown IDEMPOTENCY_BACKEND: {backend}")
+
+
+idempotency_store = make_idempotency_store()
+
+
+# Templates
+if app.config["JINJA_BYTECODE_CACHE_DIR"]:
+    os.makedirs(app.config["JINJA_BYTECODE_CACHE_DIR"], exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config["JINJA_BYTECODE_CACHE_DIR"])
+
+
+def warm_templates():
+    """Compile every template now (from the bytecode cache when possible) instead of on first hit"""
+    started = time.perf_counter()
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        try:
+            app.jinja_env.get_template(name)
+        except Exception as exc:
+            log.warning("Template failed to compile", extra={'template': name, 'error': str(exc)})
+    return len(names), time.perf_counter() - started
+
+
+_rendered_pages = {}
+
+
+def render_static_page(template, status=200, cache_control='public, max-age=300', variant=None):
+    """Serve a template whose output only depends on `variant`, rendered once per process.
+
+    The body is kept in memory with an ETag; a new asset build (or template auto-reload in
+    debug mode) renders it again.
+    """
+    load_asset_manifest()
+    key = (template, variant, _asset_manifest['mtime'])
+    page = None if app.jinja_env.auto_reload else _rendered_pages.get(key)
+    if page is None:
+        body = render_template(template).encode('utf-8')
+        page = (body, hashlib.sha1(body).hexdigest())
+        _rendered_pages[key] = page
+    response = Response(page[0], status=status, mimetype='text/html')
+    response.set_etag(page[1])
+    response.headers['Cache-Control'] = cache_control
+    if status != 200:
+        return response
+    # Clients revalidating a compressed copy send its encoded ETag back
+    for tag in etag_variants(page[1])[1:]:
+        if request.if_none_match.contains(tag):
+            response = Response(status=304, headers={'Cache-Control': cache_control})
+            response.set_etag(tag)
+            return response
+    return response.make_conditional(request)
+
+
+# Board snapshot cache
+class MemorySnapshotCache:
+    """Per-process LRU of serialized boards, bounded by total bytes.
+
+    Entries are stored under a key (board id + content encoding) and only returned while their
+    tag (the board revision) still matches.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()  # key -> (tag, body)
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, tag):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != tag:
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, tag, body):
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self.entries[key] = (tag, body)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+                BOARD_CACHE_EVICTIONS.inc()
+            BOARD_CACHE_BYTES.set(self.size)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            BOARD_CACHE_BYTES.set(0)
+
+
+class SqliteSnapshotCache:
+    """LRU of serialized boards in a local SQLite file, shared by every worker on the host"""
+
+    # Recency is only rewritten when it is this stale, so hot boards don't turn reads into writes
+    TOUCH_INTERVAL = 5.0
+
+    def __init__(self, max_bytes, path):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection().executescript("""
+            CREATE TABLE IF NOT EXISTS snapshot (
+                key TEXT PRIMARY KEY,
+                tag TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                used_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_snapshot_used_at ON snapshot (used_at);
+        """)
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")  # a lost snapshot is just a cache miss
+            self.local.conn = conn
+        return conn
+
+    def get(self, key, tag):
+        conn = self.connection()
+        row = conn.execute("SELECT body, used_at FROM snapshot WHERE key = ? AND tag = ?",
+                           (key, tag)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.TOUCH_INTERVAL:
+            conn.execute("UPDATE snapshot SET used_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key, tag, body):
+        if len(body) > self.max_bytes:
+            return
+        conn = self.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT OR REPLACE INTO snapshot VALUES (?, ?, ?, ?, ?)",
+                         (key, tag, body, len(body), time.time()))
+            size = conn.execute("SELECT coalesce(sum(size), 0) FROM snapshot").fetchone()[0]
+            if size > self.max_bytes:
+                for evicted_key, evicted_size in conn.execute(
+                        "SELECT key, size FROM snapshot ORDER BY used_at").fetchall():
+                    if size <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM snapshot WHERE key = ?", (evicted_key,))
+                    size -= evicted_size
+                    BOARD_CACHE_EVICTIONS.inc()
+        BOARD_CACHE_BYTES.set(size)
+
+    def clear(self):
+        self.connection().execute("DELETE FROM snapshot")
+        BOARD_CACHE_BYTES.set(0)
+
+
+def make_board_cache():
+    backend = app.config["BOARD_CACHE_BACKEND"]
+    if backend == 'memory':
+        return MemorySnapshotCache(app.config["BOARD_CACHE_MAX_BYTES"])
+    if backend == 'sqlite':
+        return SqliteSnapshotCache(app.config["BOARD_CACHE_MAX_BYTES"], app.config["BOARD_CACHE_PATH"])
+    if backend == 'none':
+        return None
+    raise ValueError(f"Unknown BOARD_CACHE_BACKEND: {backend}")
+
+
+board_cache = make_board_cache()
 
-db = SQLAlchemy(app)
 
 # Authentication helpers
 def login_required(f):
@@ -40,11 +1157,30 @@ def login_required(f):
     return decorated_function
 
 def get_current_user():
-    """Get current logged in user"""
+    """Get current logged in user; their board data is served from their shard for the rest of the request"""
     if 'user_id' in session:
-        return UserModel.query.get(session['user_id'])
+        user = UserModel.query.get(session['user_id'])
+        if user is not None:
+            g.shard = user.shard
+        return user
     return None
 
+def find_registered_user(**filters):
+    """The user holding a unique name or email, deleted accounts included: the unique constraint
+    keeps their values reserved until the purge worker removes the row"""
+    return UserModel.query.execution_options(include_deleted=True).filter_by(**filters).first()
+
+
+def abort_if_registered(name, email):
+    """400 before the INSERT hits the unique constraint"""
+    for field, value in (('email', email), ('name', name)):
+        user = find_registered_user(**{field: value})
+        if user is not None:
+            if user.deleted_at is not None:
+                abort(400, message=f"This {field} belonged to a deleted account and cannot be reused yet")
+            abort(400, message=f"User with this {field} already exists")
+
+
 def api_auth_required(f):
     """Decorator for API endpoints requiring authentication"""
     @wraps(f)
@@ -60,9 +1196,70 @@ def api_auth_required(f):
         return f(self, *args, **kwargs)
     return decorated_function
 
+def idempotent(f):
+    """Replay the stored response when a POST repeats its Idempotency-Key instead of running it again.
+
+    Keys are scoped per user (per client IP before login) and endpoint; reusing one with a different
+    body is a 422. A duplicate arriving while the first request still runs waits for its response.
+    Failed requests (exceptions, 5xx) release the key so the retry runs for real.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if idempotency_store is None or not key:
+            return f(*args, **kwargs)
+        if len(key) > 255:
+            abort(400, message="Idempotency-Key must be at most 255 characters")
+
+        owner = f"user:{session['user_id']}" if 'user_id' in session else f"ip:{request.remote_addr}"
+        scoped_key = f"{owner}:{request.endpoint}:{key}"
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        deadline = time.monotonic() + app.config["IDEMPOTENCY_WAIT_SECONDS"]
+        waited = False
+        while True:
+            state, value = idempotency_store.claim(scoped_key, fingerprint)
+            if state == 'claimed':
+                break
+            if state == 'mismatch':
+                IDEMPOTENCY_REQUESTS.labels('mismatch').inc()
+                abort(422, message="Idempotency-Key was already used with a different request body")
+            if state == 'done':
+                IDEMPOTENCY_REQUESTS.labels('coalesced' if waited else 'replayed').inc()
+                status, body = value
+                return json.loads(body), status, {'Idempotent-Replayed': 'true'}
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                IDEMPOTENCY_REQUESTS.labels('in_flight').inc()
+                abort(409, message="A request with this Idempotency-Key is still in progress")
+            waited = True
+            idempotency_store.wait(value, remaining)
+
+        IDEMPOTENCY_REQUESTS.labels('new').inc()
+        try:
+            result = f(*args, **kwargs)
+        except BaseException:
+            idempotency_store.release(scoped_key)
+            raise
+        data, status, _ = unpack(result)
+        if status >= 500 or isinstance(data, Response):
+            idempotency_store.release(scoped_key)
+        else:
+            idempotency_store.complete(scoped_key, (status, json.dumps(data)), app.config["IDEMPOTENCY_TTL_SECONDS"])
+        return result
+    return decorated_function
+
 # Flask Error Handlers
+def error_page(status):
+    """404.html only varies with the login state, unless it has a matched endpoint to show"""
+    if request.endpoint is not None:
+        return render_template('404.html'), status
+    return render_static_page('404.html', status, cache_control='private, max-age=60',
+                              variant='user' if session.get('user_id') else 'anonymous')
+
+
 @app.errorhandler(404)
 def not_found(error):
+    HANDLER_ERRORS.labels('not_found').inc()
     # API endpoint'leri için JSON response
     if request.path.startswith('/api/'):
         return jsonify({
@@ -75,82 +1272,198 @@ def not_found(error):
         }), 404
     
     # Web sayfaları için HTML template
-    return render_template('404.html'), 404
+    return error_page(404)
 
 @app.errorhandler(400)
 def bad_request(error):
+    HANDLER_ERRORS.labels('bad_request').inc()
     if request.path.startswith('/api/'):
         return jsonify({"error": "Bad request", "message": "Invalid request data"}), 400
-    return render_template('404.html'), 400
+    return error_page(400)
 
 @app.errorhandler(500)
 def internal_error(error):
+    HANDLER_ERRORS.labels('internal_error').inc()
     db.session.rollback()
     if request.path.startswith('/api/'):
         return jsonify({
             "error": "Internal server error",
             "message": "Something went wrong on our end. Please try again later."
         }), 500
-    return render_template('404.html'), 500
+    return error_page(500)
 
 @app.errorhandler(IntegrityError)
 def handle_integrity_error(error):
+    HANDLER_ERRORS.labels('handle_integrity_error').inc()
     db.session.rollback()
+    if not request.path.startswith('/api/'):
+        # A form post that lost a race with a concurrent registration
+        flash("⚠️ Registration Failed: This name or email is already registered.")
+        return redirect(url_for("unsuccess"))
     if "UNIQUE constraint" in str(error):
         return jsonify({"error": "User with this name or email already exists"}), 400
     return jsonify({"error": "Database constraint violation"}), 400
 
 
-class UserModel(db.Model):
+@app.errorhandler(StaleDataError)
+def handle_stale_data(error):
+    """A concurrent write won the compare-and-swap between this request's read and its UPDATE.
+
+    Flask-RESTful only hands this to Flask while exceptions propagate (TESTING/DEBUG);
+    resources commit through commit_versioned, which answers the 409 itself.
+    """
+    HANDLER_ERRORS.labels('handle_stale_data').inc()
+    return jsonify(stale_data_conflict()), 409
+
+
+def stale_data_conflict():
+    """Roll back the lost write; 409 body with the row that won, as check_version registered it"""
+    db.session.rollback()
+    body = {"error": "Conflict", "message": "Modified by someone else; review the current state and retry"}
+    versioned = g.pop('versioned', None)
+    if versioned is not None:
+        model, item_id, item_fields = versioned
+        current = db.session.get(model, item_id)
+        if current is not None:
+            body["current"] = marshal(current, item_fields)
+    return body
+
+
+class SoftDeleteMixin:
+    """deleted_at tombstone; tombstoned rows are hidden from ORM selects (see _exclude_deleted)"""
+    deleted_at = db.Column(db.DateTime, nullable=True)
+
+
+def tombstone_index(tablename):
+    """Partial index on deleted_at: tombstones are rare, so it stays tiny and keeps purge scans cheap"""
+    return db.Index(f'ix_{tablename}_deleted_at', 'deleted_at', sqlite_where=db.text('deleted_at IS NOT NULL'))
+
+
+class UserModel(SoftDeleteMixin, db.Model):
+    __table_args__ = (tombstone_index('user_model'),)
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String, unique=True, nullable=False)  # name hem username hem password
     email = db.Column(db.String, unique=True, nullable=False)
     name_hash = db.Column(db.String, nullable=False)  # name'i hash'li tut
+    # Shard directory: the file holding this user's boards, NULL while they are still in the main database
+    shard = db.Column(db.Integer, nullable=True)
     
     # Relationships
-    boards = db.relationship('BoardModel', backref='owner', lazy=True, cascade='all, delete-orphan')
+    boards = db.relationship('BoardModel', backref='owner', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
     
     def set_name_as_password(self, name):
         """Name'i password olarak hash'leyerek kaydet"""
         self.name = name
-        self.name_hash = generate_password_hash(name)
+        with PASSWORD_HASH_LATENCY.labels('hash').time():
+            self.name_hash = generate_password_hash(name)
     
     def check_name_as_password(self, name):
         """Name'i password olarak kontrol et"""
-        return check_password_hash(self.name_hash, name)
+        with PASSWORD_HASH_LATENCY.labels('check').time():
+            return check_password_hash(self.name_hash, name)
 
     def __repr__(self):
         return f"User(name={self.name}, email={self.email})"
 
 
-class BoardModel(db.Model):
+class BoardModel(SoftDeleteMixin, db.Model):
+    __table_args__ = (tombstone_index('board_model'),)
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    user_id = db.Column(db.Integer, db.ForeignKey('user_model.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user_model.id', ondelete='CASCADE'), nullable=False, index=True)
+    # Counter cache of live lists and the hot tasks in them, see adjust_list_counters / repair_counters
+    list_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    task_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Moves on every change to the board, its lists or their tasks; keys the snapshot cache
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Change log entries up to this seq were compacted away; older cursors must resync
+    changelog_floor = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Bumped by every write; UPDATEs compare-and-swap on it (see check_version)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    __mapper_args__ = {'version_id_col': version}
     
     # Relationships
-    lists = db.relationship('ListModel', backref='board', lazy=True, cascade='all, delete-orphan', order_by='ListModel.position')
+    lists = db.relationship('ListModel', backref='board', lazy=True, cascade='all, delete-orphan', passive_deletes=True,
+                            order_by='ListModel.position')
+
+    @property
+    def change_cursor(self):
+        """Newest change log seq of this board: where a client that just loaded it syncs from;
+        filled for many boards at once by load_change_cursors"""
+        if '_change_cursor' not in self.__dict__:
+            load_change_cursors([self])
+        return self._change_cursor
     
     def __repr__(self):
         return f"Board(title={self.title}, owner={self.owner.name})"
 
 
-class ListModel(db.Model):
+class ListModel(SoftDeleteMixin, db.Model):
+    __table_args__ = (tombstone_index('list_model'),)
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     position = db.Column(db.Integer, nullable=False, default=0)
-    board_id = db.Column(db.Integer, db.ForeignKey('board_model.id'), nullable=False)
+    board_id = db.Column(db.Integer, db.ForeignKey('board_model.id', ondelete='CASCADE'), nullable=False, index=True)
+    # Counter cache of hot (not deleted, not archived) tasks, see adjust_task_counters / repair_counters
+    task_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    low_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    medium_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    high_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Bumped by every write; UPDATEs compare-and-swap on it (see check_version)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    __mapper_args__ = {'version_id_col': version}
     
     # Relationships
-    tasks = db.relationship('TaskModel', backref='list', lazy=True, cascade='all, delete-orphan', order_by='TaskModel.position')
+    # Read-only view of the hot tasks: archived ones are served by /api/boards/<id>/archive instead.
+    # Child rows are removed by ON DELETE CASCADE, so no ORM cascade is needed here.
+    tasks = db.relationship('TaskModel', lazy=True, viewonly=True, order_by='TaskModel.position',
+                            primaryjoin='and_(ListModel.id == TaskModel.list_id, TaskModel.archived_at.is_(None))')
+
+    @property
+    def task_page(self):
+        """(first page of hot tasks, more pages follow); filled for many lists at once by load_task_pages"""
+        if '_task_page' not in self.__dict__:
+            load_task_pages([self])
+        return self._task_page
+
+    @property
+    def page_tasks(self):
+        return self.task_page[0]
+
+    @property
+    def next_cursor(self):
+        tasks, has_more = self.task_page
+        return task_cursor(tasks[-1]) if has_more else None
     
     def __repr__(self):
         return f"List(title={self.title}, board={self.board.title})"
 
 
-class TaskModel(db.Model):
+# Tasks that still owe a reminder; claim_reminders repeats this exact predicate so SQLite picks the partial index
+PENDING_REMINDER = ('due_date IS NOT NULL AND reminder_stage < 2 AND done_at IS NULL '
+                    'AND archived_at IS NULL AND deleted_at IS NULL')
+
+
+class TaskModel(SoftDeleteMixin, db.Model):
+    __table_args__ = (
+        # Reminder scans walk (stage, due_date) in order; done, archived and fully reminded tasks drop out
+        db.Index('ix_task_model_due', 'reminder_stage', 'due_date', sqlite_where=db.text(PENDING_REMINDER)),
+        tombstone_index('task_model'),
+        # Archive candidates: only unarchived tasks that are sitting in Done
+        db.Index('ix_task_model_done_at', 'done_at',
+                 sqlite_where=db.text('done_at IS NOT NULL AND archived_at IS NULL')),
+        # Archive browsing per list; hot tasks never enter this index
+        db.Index('ix_task_model_archived', 'list_id', 'archived_at',
+                 sqlite_where=db.text('archived_at IS NOT NULL')),
+        # Task pages walk a list in (position, id) order
+        db.Index('ix_task_model_list_position', 'list_id', 'position'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=True)
@@ -158,12 +1471,477 @@ class TaskModel(db.Model):
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     due_date = db.Column(db.DateTime, nullable=True)
     priority = db.Column(db.String(10), default='medium')  # low, medium, high
-    list_id = db.Column(db.Integer, db.ForeignKey('list_model.id'), nullable=False)
+    list_id = db.Column(db.Integer, db.ForeignKey('list_model.id', ondelete='CASCADE'), nullable=False, index=True)
+    done_at = db.Column(db.DateTime, nullable=True)  # when the task entered the Done list
+    archived_at = db.Column(db.DateTime, nullable=True)
+    # Bumped by every write; UPDATEs compare-and-swap on it (see check_version)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    # Reminders already sent for the current due_date: 0 none, 1 upcoming, 2 overdue (see claim_reminders)
+    reminder_stage = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    reminder_lease = db.Column(db.DateTime, nullable=True)  # a scheduler is sending this task's reminder until then
+    __mapper_args__ = {'version_id_col': version}
+
+    # Relationships
+    list = db.relationship('ListModel')
+
+    @db.validates('due_date')
+    def _reset_reminders(self, key, value):
+        """A new due date owes its reminders again"""
+        if value != self.due_date:
+            self.reminder_stage = 0
+            self.reminder_lease = None
+        return value
     
     def __repr__(self):
         return f"Task(title={self.title}, list={self.list.title})"
 
 
+class ChangeModel(db.Model):
+    """Append-only log of what changed on a board (itself, its lists, their tasks), replayed by GET /api/boards/<id>/changes.
+
+    Rows only name the entity; readers send its current state, so compaction may drop superseded rows.
+    """
+    __table_args__ = (
+        db.Index('ix_change_model_board_seq', 'board_id', 'seq'),
+        # Seqs are cursors: AUTOINCREMENT never hands out a seq again after compaction deletes the newest rows
+        {'sqlite_autoincrement': True},
+    )
+
+    seq = db.Column(db.Integer, primary_key=True)
+    board_id = db.Column(db.Integer, db.ForeignKey('board_model.id', ondelete='CASCADE'), nullable=False)
+    entity = db.Column(db.String(10), nullable=False)  # board, list, task
+    entity_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class JobModel(db.Model):
+    """Work run off the request path by management/run_worker.py (see claim_job / run_job).
+
+    A worker leases the row while it runs; a job whose lease runs out (dead worker) is claimed again.
+    """
+    __table_args__ = (
+        # The claim query walks runnable jobs in run_at order; finished jobs never enter this index
+        db.Index('ix_job_model_runnable', 'run_at', sqlite_where=db.text("status IN ('queued', 'running')")),
+        db.Index('ix_job_model_user', 'user_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')  # JSON keyword arguments of the handler
+    status = db.Column(db.String(10), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    leased_until = db.Column(db.DateTime, nullable=True)
+    worker = db.Column(db.String(100), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user_model.id', ondelete='CASCADE'), nullable=True)
+    shard = db.Column(db.Integer, nullable=True)  # handlers run against the enqueuing user's shard
+    result = db.Column(db.Text, nullable=True)  # JSON
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def result_url(self):
+        return f"/api/jobs/{self.id}/result" if self.status == 'done' else None
+
+
+# Sharded storage
+# Board data lives next to its owner's shard; users and everything else stay in the main database
+SHARDED_TABLES = {'board_model', 'list_model', 'task_model', 'change_model'}
+SHARD_FILE_PATTERN = re.compile(r'shard_(\d+)\.db')
+shard_engines = {}
+shard_engines_lock = threading.Lock()
+
+
+def touches_shard(mapper, clause):
+    """True when the statement reads or writes board data"""
+    if mapper is not None:
+        return db.inspect(mapper).local_table.name in SHARDED_TABLES
+    if isinstance(clause, db.Table):
+        return clause.name in SHARDED_TABLES
+    if clause is not None:
+        return any(getattr(table, 'name', None) in SHARDED_TABLES
+                   for table in find_tables(clause, include_crud=True, include_joins=True, include_aliases=True))
+    return False
+
+
+def shard_metadata():
+    """Copies of the board tables without the foreign key to user_model, which only exists in the main database"""
+    metadata = db.MetaData()
+    for name in sorted(SHARDED_TABLES):
+        db.metadata.tables[name].to_metadata(metadata)
+    for table in metadata.tables.values():
+        for constraint in [c for c in table.constraints if isinstance(c, ForeignKeyConstraint)]:
+            if constraint.elements[0].target_fullname.startswith('user_model.'):
+                table.constraints.discard(constraint)
+                for element in constraint.elements:
+                    element.parent.foreign_keys.discard(element)
+                    table.foreign_keys.discard(element)
+    return metadata
+
+
+def shard_path(shard):
+    return os.path.join(app.config["SHARD_DIR"], f"shard_{shard:03d}.db")
+
+
+def shard_engine(shard):
+    """Engine of one shard file; the file and its tables are created on first use"""
+    engine = shard_engines.get(shard)
+    if engine is None:
+        with shard_engines_lock:
+            engine = shard_engines.get(shard)
+            if engine is None:
+                os.makedirs(app.config["SHARD_DIR"], exist_ok=True)
+                engine = create_engine("sqlite:///" + shard_path(shard))
+                metadata = shard_metadata()
+                metadata.create_all(engine)
+                upgrade_schema(engine, metadata)
+                if app.config["SQL_INSTRUMENTATION"] or app.config["SLOW_QUERY_MS"] or app.config["SLOW_REQUEST_MS"]:
+                    install_sql_listeners(engine)
+                shard_engines[shard] = engine
+    return engine
+
+
+def shard_for(email):
+    """Hash bucket for a new user; after that the directory (UserModel.shard) decides"""
+    return zlib.crc32(email.lower().encode()) % app.config["SHARD_COUNT"]
+
+
+def each_shard():
+    """None (the main database), then every shard that is configured or exists on disk"""
+    shards = set(range(app.config["SHARD_COUNT"]))
+    if os.path.isdir(app.config["SHARD_DIR"]):
+        for name in os.listdir(app.config["SHARD_DIR"]):
+            match = SHARD_FILE_PATTERN.fullmatch(name)
+            if match:
+                shards.add(int(match.group(1)))
+    return [None, *sorted(shards)]
+
+
+def database_files():
+    """(label, path) of the main SQLite file and of every shard file that exists"""
+    files = [("main", db.engine.url.database)]
+    for shard in each_shard()[1:]:
+        if os.path.exists(shard_path(shard)):
+            files.append((f"shard_{shard:03d}", shard_path(shard)))
+    return files
+
+
+@contextlib.contextmanager
+def shard_scope(shard):
+    """Route board data statements inside the block to `shard` (None = main database)"""
+    previous = g.get('shard')
+    g.shard = shard
+    try:
+        yield
+    finally:
+        g.shard = previous
+
+
+def on_every_shard(f):
+    """Run a maintenance job on the main database and then on each shard; results are added up"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        total = None
+        for shard in each_shard():
+            with shard_scope(shard):
+                result = f(*args, **kwargs)
+            if total is None:
+                total = result
+            elif isinstance(result, dict):
+                total = {key: total[key] + value for key, value in result.items()}
+            else:
+                total += result
+        return total
+    return decorated_function
+
+
+@event.listens_for(OrmSession, 'before_flush')
+def _assign_shards(session, flush_context, instances):
+    """New users get their shard from the hash of their e-mail while sharding is on"""
+    if app.config["SHARD_COUNT"]:
+        for obj in session.new:
+            if isinstance(obj, UserModel) and obj.shard is None:
+                obj.shard = shard_for(obj.email)
+
+
+@event.listens_for(OrmSession, 'do_orm_execute')
+def _exclude_deleted(execute_state):
+    """Add 'deleted_at IS NULL' for every soft-deletable entity in ORM selects and lazy loads.
+
+    Opt out per query with .execution_options(include_deleted=True). Refreshes of objects
+    already in the session are left alone so a just-deleted object can still be read.
+    """
+    if (execute_state.is_select and not execute_state.is_column_load
+            and not execute_state.execution_options.get('include_deleted', False)):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
+
+
+@event.listens_for(OrmSession, 'before_flush')
+def _bump_board_revisions(session, flush_context, instances):
+    """Any ORM change to a board, one of its lists or one of their tasks gives the board a new revision.
+
+    Core UPDATEs (counters, archive job, repairs) bump the revision themselves.
+    """
+    board_ids, list_ids = set(), set()
+    for obj in [*session.new, *session.dirty, *session.deleted]:
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if isinstance(obj, BoardModel):
+            board_ids.add(obj.id)
+        elif isinstance(obj, ListModel):
+            board_ids.add(obj.board_id)
+        elif isinstance(obj, TaskModel):
+            # A moved task changes both the list it left and the one it entered
+            for values in db.inspect(obj).attrs.list_id.history:
+                list_ids.update(values or ())
+    board_ids.discard(None)
+    list_ids.discard(None)
+    if board_ids or list_ids:
+        boards, lists = BoardModel.__table__, ListModel.__table__
+        session.connection(bind_arguments={'mapper': BoardModel}).execute(
+            boards.update()
+            .where(or_(boards.c.id.in_(board_ids),
+                       boards.c.id.in_(select(lists.c.board_id).where(lists.c.id.in_(list_ids)))))
+            .values(revision=boards.c.revision + 1)
+        )
+
+
+@event.listens_for(OrmSession, 'after_flush')
+def _record_changes(session, flush_context):
+    """Log every board, list and task this flush touched, in the flush's own transaction.
+
+    A moved task is logged on the boards of both lists, and every list and board whose counters
+    moved is logged too. Deleting or restoring a list logs its hot tasks, which appear or vanish with it.
+    Core UPDATEs (reorders, archive job, repairs) call record_changes themselves.
+    """
+    board_ids, list_ids, task_lists, toggled = set(), set(), {}, set()
+    for obj in [*session.new, *session.dirty, *session.deleted]:
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if isinstance(obj, BoardModel):
+            board_ids.add(obj.id)
+        elif isinstance(obj, ListModel):
+            list_ids.add(obj.id)
+            if db.inspect(obj).attrs.deleted_at.history.has_changes():
+                toggled.add(obj.id)
+        elif isinstance(obj, TaskModel):
+            lists_seen = task_lists.setdefault(obj.id, set())
+            for values in db.inspect(obj).attrs.list_id.history:
+                lists_seen.update(values or ())
+            list_ids.update(lists_seen)
+    list_ids.discard(None)
+    if not board_ids and not list_ids:
+        return
+
+    conn = session.connection(bind_arguments={'mapper': ChangeModel})
+    lists, tasks = ListModel.__table__, TaskModel.__table__
+    boards_of = {}
+    if list_ids:
+        boards_of = dict(conn.execute(select(lists.c.id, lists.c.board_id).where(lists.c.id.in_(list_ids))).all())
+    # Board entries carry the counters, which move with every list/task change
+    changes = [(board_id, 'board', board_id) for board_id in board_ids | set(boards_of.values())]
+    changes += [(boards_of[list_id], 'list', list_id) for list_id in list_ids if list_id in boards_of]
+    for task_id, lists_seen in task_lists.items():
+        for board_id in {boards_of[list_id] for list_id in lists_seen if list_id in boards_of}:
+            changes.append((board_id, 'task', task_id))
+    record_changes(changes, conn)
+    if toggled:
+        conn.execute(insert(ChangeModel.__table__).from_select(
+            ['board_id', 'entity', 'entity_id', 'created_at'],
+            select(lists.c.board_id, literal('task'), tasks.c.id, literal(datetime.utcnow()))
+            .select_from(tasks.join(lists, lists.c.id == tasks.c.list_id))
+            .where(tasks.c.list_id.in_(toggled), tasks.c.deleted_at.is_(None), tasks.c.archived_at.is_(None))
+        ))
+
+
+def record_changes(changes, conn=None):
+    """Append (board_id, entity, entity_id) rows to the change log with one executemany INSERT"""
+    if not changes:
+        return
+    now = datetime.utcnow()
+    rows = [{'board_id': board_id, 'entity': entity, 'entity_id': entity_id, 'created_at': now}
+            for board_id, entity, entity_id in changes]
+    (conn or db.session.connection(bind_arguments={'mapper': ChangeModel})).execute(insert(ChangeModel.__table__), rows)
+
+
+def load_change_cursors(boards):
+    """Attach the change cursor of every board in one grouped query"""
+    latest = {}
+    if boards:
+        latest = dict(db.session.execute(
+            select(ChangeModel.board_id, db.func.max(ChangeModel.seq))
+            .where(ChangeModel.board_id.in_([board.id for board in boards]))
+            .group_by(ChangeModel.board_id)
+        ).all())
+    for board in boards:
+        board._change_cursor = max(latest.get(board.id) or 0, board.changelog_floor or 0)
+
+
+def load_task_pages(lists, limit=None):
+    """Attach the first `limit` hot tasks of every list in one window query"""
+    limit = limit or app.config["TASKS_PAGE_SIZE"]
+    tasks = {list_item.id: [] for list_item in lists}
+    if tasks:
+        ranked = (
+            select(
+                TaskModel.id,
+                db.func.row_number().over(partition_by=TaskModel.list_id,
+                                          order_by=(TaskModel.position, TaskModel.id)).label('rank'),
+            )
+            .where(TaskModel.list_id.in_(list(tasks)), TaskModel.archived_at.is_(None))
+            .subquery()
+        )
+        # One extra row per list tells whether another page follows
+        rows = db.session.scalars(
+            select(TaskModel)
+            .join(ranked, ranked.c.id == TaskModel.id)
+            .where(ranked.c.rank <= limit + 1)
+            .order_by(TaskModel.list_id, ranked.c.rank)
+        )
+        for task in rows:
+            tasks[task.list_id].append(task)
+    for list_item in lists:
+        page = tasks[list_item.id]
+        list_item._task_page = (page[:limit], len(page) > limit)
+
+
+PRIORITIES = ('low', 'medium', 'high')
+
+
+def adjust_task_counters(list_id, priority, delta):
+    """Add `delta` hot tasks of `priority` to the counters of a list and its board.
+
+    Runs as atomic `col = col + delta` UPDATEs inside the caller's transaction, so concurrent
+    writers never lose an increment.
+    """
+    list_values = {'task_count': ListModel.task_count + delta}
+    if priority in PRIORITIES:
+        list_values[f'{priority}_count'] = getattr(ListModel, f'{priority}_count') + delta
+    db.session.execute(update(ListModel).where(ListModel.id == list_id).values(list_values),
+                       execution_options={'synchronize_session': False})
+    db.session.execute(
+        update(BoardModel)
+        .where(BoardModel.id == select(ListModel.board_id).where(ListModel.id == list_id).scalar_subquery())
+        .values(task_count=BoardModel.task_count + delta, revision=BoardModel.revision + 1),
+        execution_options={'synchronize_session': False}
+    )
+
+
+def adjust_list_counters(list_id, delta):
+    """Add or remove a whole list (and the hot tasks it holds) from its board's counters"""
+    board_id = select(ListModel.board_id).where(ListModel.id == list_id).scalar_subquery()
+    task_count = select(ListModel.task_count).where(ListModel.id == list_id).scalar_subquery()
+    db.session.execute(
+        update(BoardModel)
+        .where(BoardModel.id == board_id)
+        .values(list_count=BoardModel.list_count + delta, task_count=BoardModel.task_count + delta * task_count,
+                revision=BoardModel.revision + 1),
+        execution_options={'synchronize_session': False}
+    )
+
+
+def apply_order(model, parent_column, parent_id, ordered_ids, *criteria):
+    """Renumber the children of one parent 1..n so `ordered_ids` come first, in that order.
+
+    Children left out (e.g. tasks on pages the client never loaded) keep their relative order
+    after the listed ones. Only rows whose position changes are written, in one executemany UPDATE.
+    Returns the ids of the rows written.
+    """
+    current = db.session.execute(
+        select(model.id, model.position).where(parent_column == parent_id, *criteria)
+        .order_by(model.position, model.id)
+    ).all()
+    positions = {row.id: row.position for row in current}
+    listed = set(ordered_ids)
+    if len(listed) != len(ordered_ids):
+        abort(400, message="Order contains duplicate ids")
+    unknown = listed - positions.keys()
+    if unknown:
+        abort(400, message=f"Ids not found in this container: {sorted(unknown)[:10]}")
+
+    order = [*ordered_ids, *(row.id for row in current if row.id not in listed)]
+    changes = [{'row_id': row_id, 'new_position': position}
+               for position, row_id in enumerate(order, start=1) if positions[row_id] != position]
+    if changes:
+        table = model.__table__
+        db.session.execute(
+            # A new position is a new version: an edit based on the old order fails its If-Match
+            table.update().where(table.c.id == bindparam('row_id'))
+            .values(position=bindparam('new_position'), version=table.c.version + 1),
+            changes
+        )
+    return [change['row_id'] for change in changes]
+
+
+def order_versions(model, moved):
+    """{"versions": {id: version}} of the rows a reorder renumbered, so clients can keep their If-Match current"""
+    rows = db.session.execute(select(model.id, model.version).where(model.id.in_(moved))).all() if moved else []
+    return {"versions": {str(row_id): version for row_id, version in rows}}
+
+
+def check_version(item, item_fields):
+    """Honour If-Match against the version the client last saw: 409 with the current state when stale.
+
+    Without If-Match the write still compares-and-swaps against the version this request read.
+    """
+    g.versioned = (type(item), item.id, item_fields)
+    if request.if_match and not any(request.if_match.contains(tag) for tag in etag_variants(str(item.version))):
+        abort(409, error="Conflict", message="Modified by someone else; review the current state and retry",
+              current=marshal(item, item_fields))
+
+
+def commit_versioned():
+    """Commit a write guarded by check_version; a lost compare-and-swap becomes a 409"""
+    try:
+        db.session.commit()
+    except StaleDataError:
+        HANDLER_ERRORS.labels('handle_stale_data').inc()
+        abort(409, **stale_data_conflict())
+
+
+def version_headers(item):
+    return {'ETag': f'"{item.version}"'}
+
+
+def bump_board_revision(board_id):
+    """Core UPDATEs bypass the before_flush hook; give the board a new revision explicitly"""
+    db.session.execute(update(BoardModel).where(BoardModel.id == board_id).values(revision=BoardModel.revision + 1),
+                       execution_options={'synchronize_session': False})
+
+
+def task_cursor(task):
+    """Opaque keyset cursor: the (position, id) of the last task on a page"""
+    return f"{task.position}:{task.id}"
+
+
+def parse_due_date(value):
+    """ISO 8601 or RFC 822 (as returned in due_date) -> naive UTC datetime"""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            raise ValueError("due_date must be an ISO 8601 or RFC 822 date")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_task_cursor(value):
+    try:
+        position, task_id = value.split(':')
+        return int(position), int(task_id)
+    except ValueError:
+        abort(400, message="Invalid cursor")
+
+
 user_args = reqparse.RequestParser()
 user_args.add_argument("name", type=str, help="Name cannot be blank", required=True)
 user_args.add_argument("email", type=str, help="Email cannot be blank", required=True)
@@ -184,6 +1962,7 @@ task_create_args.add_argument("title", type=str, help="Title cannot be blank", r
 task_create_args.add_argument("description", type=str, required=False)
 task_create_args.add_argument("position", type=int, required=False, default=0)
 task_create_args.add_argument("priority", type=str, required=False, default='medium')
+task_create_args.add_argument("due_date", type=parse_due_date, required=False)
 task_create_args.add_argument("list_id", type=int, help="List ID required", required=True)
 
 # Task args for PATCH (update) - all optional
@@ -192,8 +1971,29 @@ task_update_args.add_argument("title", type=str, required=False)
 task_update_args.add_argument("description", type=str, required=False)
 task_update_args.add_argument("position", type=int, required=False)
 task_update_args.add_argument("priority", type=str, required=False)
+# Absent: unchanged, null: cleared
+task_update_args.add_argument("due_date", type=parse_due_date, required=False, store_missing=False)
 task_update_args.add_argument("list_id", type=int, required=False)
 
+task_page_args = reqparse.RequestParser()
+task_page_args.add_argument("after", type=str, location='args', required=False)
+task_page_args.add_argument("limit", type=int, location='args', required=False)
+
+change_args = reqparse.RequestParser()
+change_args.add_argument("since", type=int, location='args', required=True, help="since must be a change cursor")
+change_args.add_argument("limit", type=int, location='args', required=False)
+
+task_order_args = reqparse.RequestParser()
+task_order_args.add_argument("task_ids", type=int, action='append', location='json', required=True,
+                             help="task_ids must be a list of task ids")
+
+list_order_args = reqparse.RequestParser()
+list_order_args.add_argument("list_ids", type=int, action='append', location='json', required=True,
+                             help="list_ids must be a list of list ids")
+
+# Tasks that stay in this list long enough are archived (see archive_done_tasks)
+DONE_LIST = 'Done'
+
 userfields = {
     "id": fields.Integer,
     "name": fields.String,
@@ -207,7 +2007,9 @@ taskfields = {
     "position": fields.Integer,
     "priority": fields.String,
     "created_at": fields.DateTime,
-    "list_id": fields.Integer
+    "due_date": fields.DateTime,
+    "list_id": fields.Integer,
+    "version": fields.Integer
 }
 
 listfields = {
@@ -215,7 +2017,28 @@ listfields = {
     "title": fields.String,
     "position": fields.Integer,
     "board_id": fields.Integer,
-    "tasks": fields.List(fields.Nested(taskfields))
+    "tasks": fields.List(fields.Nested(taskfields), attribute='page_tasks'),
+    "task_count": fields.Integer,
+    "low_count": fields.Integer,
+    "medium_count": fields.Integer,
+    "high_count": fields.Integer,
+    "version": fields.Integer,
+    "next_cursor": fields.String
+}
+
+taskpagefields = {
+    "tasks": fields.List(fields.Nested(taskfields)),
+    "next_cursor": fields.String
+}
+
+archivedtaskfields = dict(taskfields, done_at=fields.DateTime, archived_at=fields.DateTime)
+
+archivefields = {
+    "tasks": fields.List(fields.Nested(archivedtaskfields)),
+    "page": fields.Integer,
+    "per_page": fields.Integer,
+    "total": fields.Integer,
+    "pages": fields.Integer
 }
 
 boardfields = {
@@ -224,9 +2047,30 @@ boardfields = {
     "description": fields.String,
     "created_at": fields.DateTime,
     "user_id": fields.Integer,
+    "list_count": fields.Integer,
+    "task_count": fields.Integer,
+    "version": fields.Integer,
+    "change_cursor": fields.Integer,
     "lists": fields.List(fields.Nested(listfields))
 }
 
+# Delta sync entries carry the entity itself; lists and tasks arrive as their own entries
+listheaderfields = {name: field for name, field in listfields.items() if name not in ("tasks", "next_cursor")}
+boardheaderfields = {name: field for name, field in boardfields.items() if name not in ("lists", "change_cursor")}
+
+jobfields = {
+    "id": fields.Integer,
+    "kind": fields.String,
+    "status": fields.String,
+    "attempts": fields.Integer,
+    "max_attempts": fields.Integer,
+    "error": fields.String,
+    "created_at": fields.DateTime,
+    "run_at": fields.DateTime,
+    "finished_at": fields.DateTime,
+    "result_url": fields.String
+}
+
 
 
 class Users(Resource):
@@ -242,6 +2086,7 @@ class Users(Resource):
     def post(self):
         """Yeni kullanıcı kaydı (public)"""
         args = user_args.parse_args()
+        abort_if_registered(args["name"], args["email"])
         user = UserModel(email=args["email"])
         user.set_name_as_password(args["name"])  # Name'i hem username hem password olarak ayarla
         db.session.add(user)
@@ -274,7 +2119,15 @@ class User(Resource):
         user = UserModel.query.filter_by(id=id).first()
         if not user:
             abort(404, message="User not found")
-        db.session.delete(user)
+        # Tombstone the user and their boards in two UPDATEs; the purge worker removes the tree later
+        now = datetime.utcnow()
+        user.deleted_at = now
+        with shard_scope(user.shard):
+            db.session.execute(
+                BoardModel.__table__.update()
+                .where(BoardModel.user_id == user.id, BoardModel.deleted_at.is_(None))
+                .values(deleted_at=now)
+            )
         db.session.commit()
         return '', 204
                 
@@ -305,6 +2158,7 @@ class Login(Resource):
 
 # Fixed Signup class
 class Signup(Resource):
+    @idempotent
     @marshal_with(userfields)
     def post(self):
         """Create new user via JSON - proper signup"""
@@ -315,6 +2169,7 @@ class Signup(Resource):
             
         if not data.get("name") or not data.get("email"):
             abort(400, message="Name and email are required")
+        abort_if_registered(data["name"], data["email"])
         
         # Create new user
         user = UserModel(email=data["email"])
@@ -331,10 +2186,13 @@ class Boards(Resource):
     @marshal_with(boardfields)
     def get(self):
         """Get all boards for current user"""
-        boards = BoardModel.query.filter_by(user_id=self.current_user.id).all()
+        boards = BoardModel.query.options(selectinload(BoardModel.lists)).filter_by(user_id=self.current_user.id).all()
+        load_task_pages([list_item for board in boards for list_item in board.lists])
+        load_change_cursors(boards)
         return boards
     
     @api_auth_required
+    @idempotent
     @marshal_with(boardfields)
     def post(self):
         """Create new board for current user"""
@@ -354,13 +2212,30 @@ class Boards(Resource):
 
 class Board(Resource):
     @api_auth_required
-    @marshal_with(boardfields)
     def get(self, id):
-        """Get specific board with all lists and tasks (only if owned by current user)"""
+        """Get specific board with all lists and tasks (only if owned by current user).
+
+        While the board revision is unchanged the serialized body comes from the snapshot cache.
+        """
         board = BoardModel.query.filter_by(id=id, user_id=self.current_user.id).first()
         if not board:
             abort(404, message="Board not found or access denied")
-        return board
+
+        encoding = negotiate_encoding()
+        if encoding is not None:
+            body = cached_snapshot(snapshot_key(board, encoding), snapshot_tag(board))
+            if body is not None:
+                return snapshot_response(body, encoding)
+
+        body = board_snapshot(board)
+        if encoding is None or len(body) < app.config["COMPRESS_MIN_SIZE"]:
+            return snapshot_response(body, None)
+
+        # Compressed once per revision and encoding, then served as-is
+        body = compress(body, encoding)
+        if board_cache is not None:
+            board_cache.put(snapshot_key(board, encoding), snapshot_tag(board), body)
+        return snapshot_response(body, encoding)
     
     @api_auth_required
     @marshal_with(boardfields)
@@ -369,6 +2244,7 @@ class Board(Resource):
         board = BoardModel.query.filter_by(id=id, user_id=self.current_user.id).first()
         if not board:
             abort(404, message="Board not found or access denied")
+        check_version(board, boardfields)
             
         args = board_args.parse_args()
         if args.get("title"):
@@ -376,8 +2252,8 @@ class Board(Resource):
         if args.get("description") is not None:
             board.description = args["description"]
             
-        db.session.commit()
-        return board
+        commit_versioned()
+        return board, 200, version_headers(board)
     
     @api_auth_required
     def delete(self, id):
@@ -385,14 +2261,134 @@ class Board(Resource):
         board = BoardModel.query.filter_by(id=id, user_id=self.current_user.id).first()
         if not board:
             abort(404, message="Board not found or access denied")
+        check_version(board, boardfields)
             
-        db.session.delete(board)
-        db.session.commit()
+        board.deleted_at = datetime.utcnow()
+        commit_versioned()
         return '', 204
 
 
+class BoardChanges(Resource):
+    @api_auth_required
+    def get(self, id):
+        """Board, lists and tasks changed after ?since=<cursor>, each once with its current state.
+
+        Answers 410 when the log was compacted past the cursor: the client reloads the board
+        and continues from its change_cursor.
+        """
+        board = BoardModel.query.filter_by(id=id, user_id=self.current_user.id).first()
+        if not board:
+            abort(404, message="Board not found or access denied")
+
+        args = change_args.parse_args()
+        if args["since"] < board.changelog_floor:
+            abort(410, message="Change log no longer reaches this cursor, reload the board", resync=True)
+        limit = max(1, min(args["limit"] or 500, 1000))
+
+        latest = db.func.max(ChangeModel.seq).label('latest')
+        rows = db.session.execute(
+            select(ChangeModel.entity, ChangeModel.entity_id, latest)
+            .where(ChangeModel.board_id == board.id, ChangeModel.seq > args["since"])
+            .group_by(ChangeModel.entity, ChangeModel.entity_id)
+            .order_by(latest)
+            .limit(limit + 1)
+        ).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        task_ids = {row.entity_id for row in rows if row.entity == 'task'}
+        current = {
+            'board': {board.id: board},
+            'list': {list_item.id: list_item for list_item in ListModel.query.filter_by(board_id=board.id)},
+            'task': {},
+        }
+        if task_ids:
+            current['task'] = {task.id: task for task in TaskModel.query.filter(
+                TaskModel.id.in_(task_ids), TaskModel.list_id.in_(list(current['list'])),
+                TaskModel.archived_at.is_(None))}
+        entity_fields = {'board': boardheaderfields, 'list': listheaderfields, 'task': taskfields}
+
+        changes = []
+        for row in rows:
+            item = current[row.entity].get(row.entity_id)
+            if item is None:
+                # Deleted, archived or moved to another board
+                changes.append({"entity": row.entity, "id": row.entity_id, "op": "delete"})
+            else:
+                changes.append({"entity": row.entity, "id": row.entity_id, "op": "upsert",
+                                "data": marshal(item, entity_fields[row.entity])})
+        return {
+            "changes": changes,
+            "cursor": rows[-1].latest if rows else args["since"],
+            "has_more": has_more
+        }
+
+
+class BoardOrder(Resource):
+    @api_auth_required
+    def put(self, id):
+        """Set the order of a board's lists from {"list_ids": [...]} in one UPDATE; returns the new versions"""
+        board = BoardModel.query.filter_by(id=id, user_id=self.current_user.id).first()
+        if not board:
+            abort(404, message="Board not found or access denied")
+
+        args = list_order_args.parse_args()
+        moved = apply_order(ListModel, ListModel.board_id, board.id, args["list_ids"])
+        if moved:
+            bump_board_revision(board.id)
+            record_changes([(board.id, 'list', list_id) for list_id in moved])
+        db.session.commit()
+        return order_versions(ListModel, moved), 200
+
+
+def snapshot_tag(board):
+    # created_at tells a reused board id apart from a purged board that had the same id
+    return f"{board.revision}:{board.created_at}"
+
+
+def snapshot_key(board, variant):
+    # Board ids are only unique within one shard
+    shard = g.get('shard')
+    return f"{board.id}:{variant}" if shard is None else f"s{shard}:{board.id}:{variant}"
+
+
+def board_snapshot(board):
+    """Uncompressed board JSON, from the snapshot cache while the revision is unchanged"""
+    body = cached_snapshot(snapshot_key(board, 'identity'), snapshot_tag(board))
+    if body is None:
+        body = serialize_board(board)
+        if board_cache is not None:
+            board_cache.put(snapshot_key(board, 'identity'), snapshot_tag(board), body)
+    return body
+
+
+def cached_snapshot(key, tag):
+    body = board_cache.get(key, tag) if board_cache is not None else None
+    BOARD_CACHE_LOOKUPS.labels('miss' if body is None else 'hit').inc()
+    return body
+
+
+def snapshot_response(body, encoding):
+    response = Response(body, mimetype='application/json')
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def serialize_board(board):
+    """Board payload as the exact bytes the JSON representation would send"""
+    load_task_pages(board.lists)
+    timings = current_timings()
+    started = time.perf_counter()
+    data = marshal(board, boardfields)
+    if timings is not None:
+        timings.serialize += time.perf_counter() - started
+    return output_json(data, 200).get_data()
+
+
 class Lists(Resource):
     @api_auth_required
+    @idempotent
     @marshal_with(listfields)
     def post(self):
         """Create new list (only in user's own boards)"""
@@ -415,6 +2411,8 @@ class Lists(Resource):
         )
         
         db.session.add(list_item)
+        db.session.flush()
+        adjust_list_counters(list_item.id, 1)
         db.session.commit()
         return list_item, 201
 
@@ -430,6 +2428,7 @@ class List(Resource):
         ).first()
         if not list_item:
             abort(404, message="List not found or access denied")
+        check_version(list_item, listfields)
             
         args = list_args.parse_args()
         if args.get("title"):
@@ -437,8 +2436,8 @@ class List(Resource):
         if args.get("position") is not None:
             list_item.position = args["position"]
             
-        db.session.commit()
-        return list_item
+        commit_versioned()
+        return list_item, 200, version_headers(list_item)
     
     @api_auth_required
     def delete(self, id):
@@ -449,19 +2448,72 @@ class List(Resource):
         ).first()
         if not list_item:
             abort(404, message="List not found or access denied")
+        check_version(list_item, listfields)
         
         # Protected lists that cannot be deleted
         PROTECTED_LISTS = ['Backlog', 'To Do', 'In Progress', 'Testing', 'Done']
         if list_item.title in PROTECTED_LISTS:
             abort(400, message=f"Cannot delete '{list_item.title}' - This is a protected system list")
             
-        db.session.delete(list_item)
-        db.session.commit()
+        list_item.deleted_at = datetime.utcnow()
+        adjust_list_counters(list_item.id, -1)
+        commit_versioned()
         return '', 204
 
 
+class ListTasks(Resource):
+    @api_auth_required
+    @marshal_with(taskpagefields)
+    def get(self, id):
+        """Hot tasks of a list in position order, a page at a time (?after=<next_cursor>&limit=)"""
+        list_item = ListModel.query.join(BoardModel).filter(
+            ListModel.id == id,
+            BoardModel.user_id == self.current_user.id
+        ).first()
+        if not list_item:
+            abort(404, message="List not found or access denied")
+
+        args = task_page_args.parse_args()
+        limit = max(1, min(args["limit"] or app.config["TASKS_PAGE_SIZE"], 200))
+        query = TaskModel.query.filter(TaskModel.list_id == list_item.id, TaskModel.archived_at.is_(None))
+        if args["after"]:
+            position, task_id = parse_task_cursor(args["after"])
+            query = query.filter(or_(
+                TaskModel.position > position,
+                and_(TaskModel.position == position, TaskModel.id > task_id)
+            ))
+        # One extra row tells whether another page follows
+        tasks = query.order_by(TaskModel.position, TaskModel.id).limit(limit + 1).all()
+        return {
+            "tasks": tasks[:limit],
+            "next_cursor": task_cursor(tasks[limit - 1]) if len(tasks) > limit else None
+        }
+
+
+class ListOrder(Resource):
+    @api_auth_required
+    def put(self, id):
+        """Set the order of a list's hot tasks from {"task_ids": [...]} in one UPDATE; returns the new versions"""
+        list_item = ListModel.query.join(BoardModel).filter(
+            ListModel.id == id,
+            BoardModel.user_id == self.current_user.id
+        ).first()
+        if not list_item:
+            abort(404, message="List not found or access denied")
+
+        args = task_order_args.parse_args()
+        moved = apply_order(TaskModel, TaskModel.list_id, list_item.id, args["task_ids"],
+                            TaskModel.archived_at.is_(None))
+        if moved:
+            bump_board_revision(list_item.board_id)
+            record_changes([(list_item.board_id, 'task', task_id) for task_id in moved])
+        db.session.commit()
+        return order_versions(TaskModel, moved), 200
+
+
 class Tasks(Resource):
     @api_auth_required
+    @idempotent
     @marshal_with(taskfields)
     def post(self):
         """Create new task (only in user's own lists)"""
@@ -485,10 +2537,13 @@ class Tasks(Resource):
             description=args.get("description"),
             position=args["position"],
             priority=args.get("priority", "medium"),
-            list_id=args["list_id"]
+            due_date=args.get("due_date"),
+            list_id=args["list_id"],
+            done_at=datetime.utcnow() if list_item.title == DONE_LIST else None
         )
         
         db.session.add(task)
+        adjust_task_counters(list_item.id, task.priority, 1)
         db.session.commit()
         return task, 201
 
@@ -504,7 +2559,9 @@ class Task(Resource):
         ).first()
         if not task:
             abort(404, message="Task not found or access denied")
+        check_version(task, taskfields)
             
+        counted_as = (task.list_id, task.priority, task.archived_at is None)
         args = task_update_args.parse_args()
         if args.get("title"):
             task.title = args["title"]
@@ -514,6 +2571,8 @@ class Task(Resource):
             task.position = args["position"]
         if args.get("priority"):
             task.priority = args["priority"]
+        if "due_date" in args:
+            task.due_date = args["due_date"]
         if args.get("list_id"):
             # Verify new list also belongs to user before moving
             new_list = ListModel.query.join(BoardModel).filter(
@@ -522,10 +2581,21 @@ class Task(Resource):
             ).first()
             if not new_list:
                 abort(404, message="Target list not found or access denied")
+            if new_list.id != task.list_id:
+                # The archive clock starts when a task enters Done; moving it anywhere brings it back hot
+                task.done_at = datetime.utcnow() if new_list.title == DONE_LIST else None
+                task.archived_at = None
             task.list_id = args["list_id"]
+
+        # Moves, priority changes and un-archiving shift the counters from the old bucket to the new one
+        if (task.list_id, task.priority, task.archived_at is None) != counted_as:
+            if counted_as[2]:
+                adjust_task_counters(counted_as[0], counted_as[1], -1)
+            if task.archived_at is None:
+                adjust_task_counters(task.list_id, task.priority, 1)
             
-        db.session.commit()
-        return task
+        commit_versioned()
+        return task, 200, version_headers(task)
     
     @api_auth_required
     def delete(self, id):
@@ -536,12 +2606,145 @@ class Task(Resource):
         ).first()
         if not task:
             abort(404, message="Task not found or access denied")
+        check_version(task, taskfields)
             
-        db.session.delete(task)
-        db.session.commit()
+        task.deleted_at = datetime.utcnow()
+        if task.archived_at is None:
+            adjust_task_counters(task.list_id, task.priority, -1)
+        commit_versioned()
         return '', 204
 
 
+class BoardArchive(Resource):
+    @api_auth_required
+    @marshal_with(archivefields)
+    def get(self, id):
+        """Archived tasks of a board, most recently archived first (?page=&per_page=)"""
+        board = BoardModel.query.filter_by(id=id, user_id=self.current_user.id).first()
+        if not board:
+            abort(404, message="Board not found or access denied")
+
+        query = (
+            select(TaskModel)
+            .join(ListModel, TaskModel.list_id == ListModel.id)
+            .where(ListModel.board_id == board.id, TaskModel.archived_at.isnot(None))
+            .order_by(TaskModel.archived_at.desc(), TaskModel.id.desc())
+        )
+        page = db.paginate(query, max_per_page=200, error_out=False)
+        return {
+            "tasks": page.items,
+            "page": page.page,
+            "per_page": page.per_page,
+            "total": page.total,
+            "pages": page.pages
+        }
+
+
+class BoardExport(Resource):
+    @api_auth_required
+    @idempotent
+    def post(self, id):
+        """Queue a full export of the board; poll the job at Location, then fetch its result_url"""
+        board = BoardModel.query.filter_by(id=id, user_id=self.current_user.id).first()
+        if not board:
+            abort(404, message="Board not found or access denied")
+
+        job = enqueue_job('export_board', {'board_id': board.id}, user_id=self.current_user.id)
+        db.session.commit()
+        return marshal(job, jobfields), 202, {'Location': f"/api/jobs/{job.id}"}
+
+
+class Jobs(Resource):
+    @api_auth_required
+    @marshal_with(jobfields)
+    def get(self):
+        """The current user's most recent jobs"""
+        return JobModel.query.filter_by(user_id=self.current_user.id).order_by(JobModel.id.desc()).limit(50).all()
+
+
+class Job(Resource):
+    @api_auth_required
+    def get(self, id):
+        """Job status; unfinished jobs carry Retry-After as a polling hint"""
+        job = JobModel.query.filter_by(id=id, user_id=self.current_user.id).first()
+        if not job:
+            abort(404, message="Job not found or access denied")
+        headers = {'Retry-After': '1'} if job.status in JOB_RUNNING_STATES else {}
+        return marshal(job, jobfields), 200, headers
+
+
+class JobResult(Resource):
+    @api_auth_required
+    def get(self, id):
+        """The stored result of a finished job"""
+        job = JobModel.query.filter_by(id=id, user_id=self.current_user.id).first()
+        if not job:
+            abort(404, message="Job not found or access denied")
+        if job.status != 'done':
+            abort(409, message="Job has no result yet", status=job.status)
+        return Response(job.result, mimetype='application/json')
+
+
+class BoardRestore(Resource):
+    @api_auth_required
+    @marshal_with(boardfields)
+    def post(self, id):
+        """Undo a board delete that has not been purged yet"""
+        board = BoardModel.query.execution_options(include_deleted=True).filter(
+            BoardModel.id == id,
+            BoardModel.user_id == self.current_user.id,
+            BoardModel.deleted_at.isnot(None)
+        ).first()
+        if not board:
+            abort(404, message="Deleted board not found or already purged")
+
+        board.deleted_at = None
+        db.session.commit()
+        return board
+
+
+class ListRestore(Resource):
+    @api_auth_required
+    @marshal_with(listfields)
+    def post(self, id):
+        """Undo a list delete that has not been purged yet (its board must still exist)"""
+        list_item = ListModel.query.execution_options(include_deleted=True).join(BoardModel).filter(
+            ListModel.id == id,
+            ListModel.deleted_at.isnot(None),
+            BoardModel.user_id == self.current_user.id,
+            BoardModel.deleted_at.is_(None)
+        ).first()
+        if not list_item:
+            abort(404, message="Deleted list not found or already purged")
+
+        list_item.deleted_at = None
+        adjust_list_counters(list_item.id, 1)
+        db.session.commit()
+        return list_item
+
+
+class TaskRestore(Resource):
+    @api_auth_required
+    @marshal_with(taskfields)
+    def post(self, id):
+        """Undo a task delete that has not been purged yet (its list and board must still exist)"""
+        task = TaskModel.query.execution_options(include_deleted=True).join(ListModel).join(BoardModel).filter(
+            TaskModel.id == id,
+            TaskModel.deleted_at.isnot(None),
+            ListModel.deleted_at.is_(None),
+            BoardModel.user_id == self.current_user.id,
+            BoardModel.deleted_at.is_(None)
+        ).first()
+        if not task:
+            abort(404, message="Deleted task not found or already purged")
+
+        task.deleted_at = None
+        if task.archived_at is None:
+            adjust_task_counters(task.list_id, task.priority, 1)
+        db.session.commit()
+        return task
+
+
 api.add_resource(Users, "/api/users/")
 api.add_resource(User, "/api/users/<int:id>")
 api.add_resource(Login, "/api/login")
@@ -552,39 +2755,51 @@ api.add_resource(Boards, "/api/boards/")
 api.add_resource(Board, "/api/boards/<int:id>")
 api.add_resource(Lists, "/api/lists/")
 api.add_resource(List, "/api/lists/<int:id>")
+api.add_resource(ListTasks, "/api/lists/<int:id>/tasks")
+api.add_resource(ListOrder, "/api/lists/<int:id>/order")
+api.add_resource(BoardOrder, "/api/boards/<int:id>/order")
+api.add_resource(BoardChanges, "/api/boards/<int:id>/changes")
 api.add_resource(Tasks, "/api/tasks/")
 api.add_resource(Task, "/api/tasks/<int:id>")
+api.add_resource(BoardArchive, "/api/boards/<int:id>/archive")
+api.add_resource(BoardRestore, "/api/boards/<int:id>/restore")
+api.add_resource(BoardExport, "/api/boards/<int:id>/export")
+api.add_resource(Jobs, "/api/jobs/")
+api.add_resource(Job, "/api/jobs/<int:id>")
+api.add_resource(JobResult, "/api/jobs/<int:id>/result")
+api.add_resource(ListRestore, "/api/lists/<int:id>/restore")
+api.add_resource(TaskRestore, "/api/tasks/<int:id>/restore")
 
 @app.route("/")
 def homepage():
     """Modern homepage with features and navigation"""
-    return render_template("homepage.html")
+    return render_static_page("homepage.html")
+
+auth_log = logging.getLogger('kanban.auth')
+job_log = logging.getLogger('kanban.jobs')
+reminder_log = logging.getLogger('kanban.reminders')
 
 @app.route("/signin", methods=["GET", "POST"])
 def signin():
     if request.method == "POST":
-        print("🔍 DEBUG: Form submitted")
         email = request.form.get("email")
         name = request.form.get("password")  # HTML'de password field ama aslında name alıyoruz
         
-        print(f"🔍 DEBUG: email='{email}', name='{name}'")
-        
         if not email or not name:
-            print("❌ DEBUG: Missing fields")
+            auth_log.info("Sign-in rejected", extra={'reason': 'missing_fields'})
             flash("⚠️ Missing Information: Please fill in both email and name fields.")
             return redirect(url_for("unsuccess"))
         
         user = UserModel.query.filter_by(email=email).first()
-        print(f"🔍 DEBUG: User found: {user}")
         
         if not user:
-            print("❌ DEBUG: User not found")
+            auth_log.info("Sign-in rejected", extra={'reason': 'unknown_email', 'email': email})
             flash(f"❌ Email Not Found: No account exists with email '{email}'. Please check your email or create a new account.")
             return redirect(url_for("unsuccess"))
         
         # Name'i password olarak kontrol et
         if user.check_name_as_password(name):
-            print("✅ DEBUG: Login successful")
+            auth_log.info("Sign-in succeeded", extra={'user_id': user.id})
             # Set session data
             session['user_id'] = user.id
             session['user_name'] = user.name
@@ -592,7 +2807,7 @@ def signin():
             flash(f"Welcome {user.name}!")
             return redirect(url_for("kanban"))  # Redirect to kanban instead of success
         else:
-            print("❌ DEBUG: Wrong password")
+            auth_log.info("Sign-in rejected", extra={'reason': 'wrong_password', 'user_id': user.id})
             flash(f"🔑 Incorrect Name: The name you entered doesn't match our records for '{email}'. Please check your spelling and try again.")
             return redirect(url_for("unsuccess"))
 
@@ -609,14 +2824,11 @@ def unsuccess():
 @app.route("/register", methods=["GET", "POST"])
 def register():
     if request.method == "POST":
-        print("🔍 DEBUG: Register form submitted")
         name = request.form.get("name")
         email = request.form.get("email")
         
-        print(f"🔍 DEBUG: name='{name}', email='{email}'")
-        
         if not name or not email:
-            print("❌ DEBUG: Missing fields")
+            auth_log.info("Registration rejected", extra={'reason': 'missing_fields'})
             if not name and not email:
                 flash("⚠️ Missing Information: Please fill in both name and email fields.")
             elif not name:
@@ -627,27 +2839,31 @@ def register():
         
         # Validate email format
         if '@' not in email or '.' not in email:
-            print("❌ DEBUG: Invalid email format")
+            auth_log.info("Registration rejected", extra={'reason': 'invalid_email', 'email': email})
             flash(f"📧 Invalid Email Format: '{email}' is not a valid email address. Please use format: example@domain.com")
             return redirect(url_for("unsuccess"))
         
         # Validate name length
         if len(name.strip()) < 2:
-            print("❌ DEBUG: Name too short")
+            auth_log.info("Registration rejected", extra={'reason': 'name_too_short'})
             flash("👤 Name Too Short: Your name must be at least 2 characters long.")
             return redirect(url_for("unsuccess"))
         
-        # Check if user already exists by email
-        existing_user_email = UserModel.query.filter_by(email=email).first()
+        # Check if user already exists by email (deleted accounts keep theirs until purged)
+        existing_user_email = find_registered_user(email=email)
+        if existing_user_email and existing_user_email.deleted_at is not None:
+            auth_log.info("Registration rejected", extra={'reason': 'email_deleted', 'email': email})
+            flash(f"📧 Email Recently Deleted: The account with email '{email}' was deleted and its email cannot be reused yet. Please use a different email.")
+            return redirect(url_for("unsuccess"))
         if existing_user_email:
-            print("❌ DEBUG: Email already exists")
+            auth_log.info("Registration rejected", extra={'reason': 'email_taken', 'email': email})
             flash(f"📧 Email Already Registered: An account with email '{email}' already exists. Please login instead or use a different email.")
             return redirect(url_for("unsuccess"))
         
         # Check if user already exists by name
-        existing_user_name = UserModel.query.filter_by(name=name).first()
+        existing_user_name = find_registered_user(name=name)
         if existing_user_name:
-            print("❌ DEBUG: Name already exists")
+            auth_log.info("Registration rejected", extra={'reason': 'name_taken'})
             flash(f"👤 Username Taken: The name '{name}' is already registered. Please choose a different name.")
             return redirect(url_for("unsuccess"))
         
@@ -658,7 +2874,7 @@ def register():
         db.session.add(user)
         db.session.commit()
         
-        print("✅ DEBUG: User registered successfully")
+        auth_log.info("User registered", extra={'user_id': user.id})
         # Auto-login after registration
         session['user_id'] = user.id
         session['user_name'] = user.name
@@ -672,7 +2888,18 @@ def register():
 @login_required
 def kanban():
     user = get_current_user()
-    return render_template('kanban.html', user=user)
+    if user is None:
+        # The account was deleted while this session was still open
+        session.clear()
+        return redirect(url_for('signin'))
+    # The page boots from the embedded board instead of fetching /api/boards/ and then the board
+    board = BoardModel.query.filter_by(user_id=user.id).order_by(BoardModel.id).first()
+    initial_board = None
+    if board is not None:
+        # Safe inside <script>: no "</script>" or "<!--" can survive the escaping
+        initial_board = (board_snapshot(board).decode()
+                         .replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026'))
+    return render_template('kanban.html', user=user, initial_board=initial_board)
 
 @app.route("/logout")
 def logout():
@@ -699,12 +2926,570 @@ def test_users_api(client):
 
 
 
+# Purge worker
+def _purge_batches(table, ids, batch_size):
+    """Delete the rows picked by `ids` (an id select) batch_size at a time, committing after each batch"""
+    total = 0
+    while True:
+        started = time.perf_counter()
+        result = db.session.execute(table.delete().where(table.c.id.in_(ids.limit(batch_size))))
+        db.session.commit()
+        PURGE_BATCH_LATENCY.observe(time.perf_counter() - started)
+        if result.rowcount:
+            total += result.rowcount
+            PURGED_ROWS.labels(table.name).inc(result.rowcount)
+        if result.rowcount < batch_size:
+            return total
+
+
+def _count_tombstones():
+    def count(table):
+        return db.session.execute(
+            select(db.func.count()).select_from(table).where(table.c.deleted_at.isnot(None))
+        ).scalar()
+
+    pending = {UserModel.__tablename__: count(UserModel.__table__)}
+    for shard in each_shard():
+        with shard_scope(shard):
+            for model in (BoardModel, ListModel, TaskModel):
+                pending[model.__tablename__] = pending.get(model.__tablename__, 0) + count(model.__table__)
+    for table, value in pending.items():
+        PURGE_PENDING.labels(table).set(value)
+
+
+def purge_tombstones(batch_size=500, grace_seconds=None):
+    """Hard-delete tombstoned trees older than the grace period, children first.
+
+    Every batch is its own short transaction, so other writers get the SQLite lock between
+    batches no matter how large the deleted board is. Returns rows removed per table.
+    """
+    if grace_seconds is None:
+        grace_seconds = app.config["PURGE_GRACE_SECONDS"]
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    users, boards, lists, tasks = (UserModel.__table__, BoardModel.__table__,
+                                   ListModel.__table__, TaskModel.__table__)
+    _count_tombstones()
+
+    dead_boards = select(boards.c.id).where(boards.c.deleted_at < cutoff)
+    dead_lists = select(lists.c.id).where(or_(lists.c.deleted_at < cutoff, lists.c.board_id.in_(dead_boards)))
+    purged = {'task_model': 0, 'list_model': 0, 'board_model': 0}
+    for shard in each_shard():
+        with shard_scope(shard):
+            purged['task_model'] += _purge_batches(tasks, select(tasks.c.id).where(
+                or_(tasks.c.deleted_at < cutoff, tasks.c.list_id.in_(dead_lists))), batch_size)
+            purged['list_model'] += _purge_batches(lists, dead_lists, batch_size)
+            purged['board_model'] += _purge_batches(boards, dead_boards, batch_size)
+    # A user's boards were tombstoned together with the user, so they are already gone here
+    purged['user_model'] = _purge_batches(users, select(users.c.id).where(users.c.deleted_at < cutoff), batch_size)
+
+    _count_tombstones()
+    return purged
+
+
+# Archive job
+@on_every_shard
+def archive_done_tasks(older_than_days=None, batch_size=1000):
+    """Flag tasks that have sat in Done longer than the cutoff as archived, one short transaction per batch"""
+    if older_than_days is None:
+        older_than_days = app.config["ARCHIVE_DONE_AFTER_DAYS"]
+    tasks, lists = TaskModel.__table__, ListModel.__table__
+    now = datetime.utcnow()
+    cutoff = now - timedelta(days=older_than_days)
+
+    # Tasks that were already in Done before done_at existed start their clock now
+    db.session.execute(
+        tasks.update()
+        .where(tasks.c.done_at.is_(None), tasks.c.archived_at.is_(None),
+               tasks.c.list_id.in_(select(lists.c.id).where(lists.c.title == DONE_LIST)))
+        .values(done_at=now)
+    )
+    db.session.commit()
+
+    candidates = (
+        select(tasks.c.id)
+        .where(tasks.c.done_at < cutoff, tasks.c.archived_at.is_(None), tasks.c.deleted_at.is_(None))
+        .limit(batch_size)
+    )
+    total = 0
+    while True:
+        archived = db.session.execute(
+            tasks.update().where(tasks.c.id.in_(candidates)).values(archived_at=now, version=tasks.c.version + 1)
+            .returning(tasks.c.id, tasks.c.list_id, tasks.c.priority)
+        ).all()
+        # Archived tasks leave the hot counters and board views in the same transaction
+        for (list_id, priority), count in collections.Counter((row.list_id, row.priority) for row in archived).items():
+            adjust_task_counters(list_id, priority, -count)
+        if archived:
+            boards_of = dict(db.session.execute(
+                select(lists.c.id, lists.c.board_id).where(lists.c.id.in_({row.list_id for row in archived}))).all())
+            record_changes([(boards_of[row.list_id], 'task', row.id) for row in archived]
+                           + [(board_id, 'list', list_id) for list_id, board_id in boards_of.items()]
+                           + [(board_id, 'board', board_id) for board_id in set(boards_of.values())])
+        db.session.commit()
+        total += len(archived)
+        ARCHIVED_TASKS.inc(len(archived))
+        if len(archived) < batch_size:
+            return total
+
+
+@on_every_shard
+def repair_counters(board_ids=None):
+    """Recompute list and board counters from the task table; returns how many rows were off.
+
+    One grouped scan of the hot tasks, then executemany UPDATEs for the rows that drifted.
+    Deleted lists keep their own counts (a restore adds them back) but don't count toward the board.
+    """
+    tasks, lists, boards = TaskModel.__table__, ListModel.__table__, BoardModel.__table__
+    counter_columns = ('task_count',) + tuple(f'{priority}_count' for priority in PRIORITIES)
+    list_scope = lists.c.board_id.in_(board_ids) if board_ids is not None else db.true()
+    board_scope = boards.c.id.in_(board_ids) if board_ids is not None else db.true()
+
+    actual = {}
+    rows = db.session.execute(
+        select(tasks.c.list_id, db.func.count(),
+               *[db.func.sum(case((tasks.c.priority == priority, 1), else_=0)) for priority in PRIORITIES])
+        .join(lists, lists.c.id == tasks.c.list_id)
+        .where(list_scope, tasks.c.deleted_at.is_(None), tasks.c.archived_at.is_(None))
+        .group_by(tasks.c.list_id)
+    )
+    for list_id, *counts in rows:
+        actual[list_id] = tuple(counts)
+
+    list_fixes, changed = [], []
+    board_actual = {}
+    touched = set()
+    for row in db.session.execute(select(lists.c.id, lists.c.board_id, lists.c.deleted_at,
+                                         *[lists.c[name] for name in counter_columns]).where(list_scope)):
+        counts = actual.get(row.id, (0,) * len(counter_columns))
+        if tuple(row[3:]) != counts:
+            list_fixes.append(dict(zip(counter_columns, counts), list_id=row.id))
+            changed.append((row.board_id, 'list', row.id))
+            touched.add(row.board_id)
+        if row.deleted_at is None:
+            list_count, task_count = board_actual.get(row.board_id, (0, 0))
+            board_actual[row.board_id] = (list_count + 1, task_count + counts[0])
+
+    board_fixes = []
+    for row in db.session.execute(select(boards.c.id, boards.c.list_count, boards.c.task_count).where(board_scope)):
+        counts = board_actual.get(row.id, (0, 0))
+        if (row.list_count, row.task_count) != counts:
+            board_fixes.append({'board_id': row.id, 'list_count': counts[0], 'task_count': counts[1]})
+            changed.append((row.id, 'board', row.id))
+            touched.add(row.id)
+
+    if list_fixes:
+        db.session.execute(
+            lists.update().where(lists.c.id == bindparam('list_id'))
+            .values({name: bindparam(name) for name in counter_columns}),
+            list_fixes
+        )
+    if board_fixes:
+        db.session.execute(
+            boards.update().where(boards.c.id == bindparam('board_id'))
+            .values(list_count=bindparam('list_count'), task_count=bindparam('task_count')),
+            board_fixes
+        )
+    if touched:
+        db.session.execute(boards.update().where(boards.c.id.in_(touched)).values(revision=boards.c.revision + 1))
+    record_changes(changed)
+    db.session.commit()
+    return {'lists': len(list_fixes), 'boards': len(board_fixes)}
+
+
+@on_every_shard
+def compact_changes(retention_hours=None):
+    """Shrink the change log; returns how many rows went, per reason.
+
+    Rows superseded by a newer row for the same entity carry no information (readers send
+    current state) and always go. Rows older than the retention go too, and the board's
+    changelog_floor moves past them so clients holding an older cursor are told to resync.
+    """
+    if retention_hours is None:
+        retention_hours = app.config["CHANGELOG_RETENTION_HOURS"]
+    changes, boards = ChangeModel.__table__, BoardModel.__table__
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+
+    latest = select(db.func.max(changes.c.seq)).group_by(changes.c.board_id, changes.c.entity, changes.c.entity_id)
+    superseded = db.session.execute(changes.delete().where(changes.c.seq.not_in(latest))).rowcount
+
+    expired_seq = (select(db.func.max(changes.c.seq))
+                   .where(changes.c.board_id == boards.c.id, changes.c.created_at < cutoff)
+                   .scalar_subquery())
+    db.session.execute(
+        boards.update()
+        .where(boards.c.id.in_(select(changes.c.board_id).where(changes.c.created_at < cutoff)))
+        .values(changelog_floor=db.func.max(boards.c.changelog_floor, expired_seq))
+    )
+    expired = db.session.execute(changes.delete().where(changes.c.created_at < cutoff)).rowcount
+    db.session.commit()
+    CHANGELOG_COMPACTED.labels('superseded').inc(superseded)
+    CHANGELOG_COMPACTED.labels('expired').inc(expired)
+    return {'superseded': superseded, 'expired': expired}
+
+
+# Background jobs
+JOB_HANDLERS = {}
+JOB_RUNNING_STATES = ('queued', 'running')
+
+
+class JobFailed(Exception):
+    """Raised by a job handler for errors a retry cannot fix"""
+
+
+def job_handler(kind):
+    """Register f(**payload) -> JSON-serializable result as the handler of a job kind"""
+    def register(f):
+        JOB_HANDLERS[kind] = f
+        return f
+    return register
+
+
+def enqueue_job(kind, payload=None, user_id=None, max_attempts=None):
+    """Add a job to the session (the caller commits); it runs against the current shard"""
+    job = JobModel(kind=kind, payload=json.dumps(payload or {}), user_id=user_id, shard=g.get('shard'),
+                   max_attempts=max_attempts or app.config["JOB_MAX_ATTEMPTS"])
+    db.session.add(job)
+    return job
+
+
+def claim_job(worker, lease_seconds=None):
+    """Lease the next runnable job to `worker` with one UPDATE ... RETURNING; returns the row or None.
+
+    Runnable: queued jobs whose run_at has come, and running jobs whose lease ran out.
+    SQLite serializes the UPDATE, so two workers never get the same job.
+    """
+    jobs = JobModel.__table__
+    now = datetime.utcnow()
+    lease = timedelta(seconds=lease_seconds or app.config["JOB_LEASE_SECONDS"])
+    runnable = (
+        select(jobs.c.id)
+        .where(jobs.c.status.in_(JOB_RUNNING_STATES), jobs.c.run_at <= now,
+               or_(jobs.c.status == 'queued', jobs.c.leased_until < now))
+        .order_by(jobs.c.run_at)
+        .limit(1)
+        .scalar_subquery()
+    )
+    job = db.session.execute(
+        jobs.update().where(jobs.c.id == runnable)
+        .values(status='running', worker=worker, attempts=jobs.c.attempts + 1, leased_until=now + lease)
+        .returning(*jobs.c)
+    ).first()
+    db.session.commit()
+    if job is not None and job.attempts == 1:
+        JOB_QUEUE_WAIT.labels(job.kind).observe((now - job.created_at).total_seconds())
+    return job
+
+
+def extend_job_leases(running, lease_seconds=None):
+    """Heartbeat: push out the leases of {job id: worker} jobs that are still running"""
+    if not running:
+        return
+    jobs = JobModel.__table__
+    leased_until = datetime.utcnow() + timedelta(seconds=lease_seconds or app.config["JOB_LEASE_SECONDS"])
+    db.session.execute(
+        jobs.update()
+        .where(jobs.c.id == bindparam('job_id'), jobs.c.worker == bindparam('job_worker'), jobs.c.status == 'running')
+        .values(leased_until=leased_until),
+        [{'job_id': job_id, 'job_worker': worker} for job_id, worker in running.items()]
+    )
+    db.session.commit()
+
+
+def run_job(job, worker):
+    """Run a claimed job and store the outcome: 'done', 'retried' (queued again with backoff) or 'failed'
+    ('lost' when another worker took the job over meanwhile).
+
+    Handlers may run more than once (a lost lease or a retry), so they must be safe to repeat.
+    The outcome is only written while `worker` still holds the job.
+    """
+    jobs = JobModel.__table__
+    handler = JOB_HANDLERS.get(job.kind)
+    started = time.perf_counter()
+    try:
+        if handler is None:
+            raise JobFailed(f"Unknown job kind: {job.kind}")
+        if job.attempts > job.max_attempts:
+            raise JobFailed("Gave up: the job outlived the lease of every attempt")
+        with shard_scope(job.shard):
+            result = handler(**json.loads(job.payload))
+        db.session.commit()
+        outcome, values = 'done', {'status': 'done', 'result': json.dumps(result), 'error': None}
+    except Exception as error:
+        db.session.rollback()
+        message = f"{type(error).__name__}: {error}"[:1000]
+        if not isinstance(error, JobFailed) and job.attempts < job.max_attempts:
+            # Exponential backoff with jitter, so a failing dependency is not hammered in lockstep
+            delay = min(app.config["JOB_BACKOFF_SECONDS"] * 2 ** (job.attempts - 1), 3600) * random.uniform(0.5, 1.5)
+            outcome, values = 'retried', {'status': 'queued', 'error': message, 'worker': None, 'leased_until': None,
+                                          'run_at': datetime.utcnow() + timedelta(seconds=delay)}
+        else:
+            outcome, values = 'failed', {'status': 'failed', 'error': message}
+        job_log.warning("Job %s", outcome, extra={'job_id': job.id, 'kind': job.kind, 'attempt': job.attempts,
+                                                 'error': message})
+    if outcome != 'retried':
+        values['finished_at'] = datetime.utcnow()
+    owned = db.session.execute(
+        jobs.update().where(jobs.c.id == job.id, jobs.c.worker == worker, jobs.c.status == 'running').values(values)
+    ).rowcount
+    db.session.commit()
+    if not owned:
+        # The lease ran out and another worker claimed the job; its run decides the outcome
+        outcome = 'lost'
+    JOBS_PROCESSED.labels(job.kind, outcome).inc()
+    JOB_DURATION.labels(job.kind).observe(time.perf_counter() - started)
+    return outcome
+
+
+def purge_jobs(retention_hours=None):
+    """Delete finished jobs older than the retention; returns how many went"""
+    if retention_hours is None:
+        retention_hours = app.config["JOB_RETENTION_HOURS"]
+    jobs = JobModel.__table__
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    removed = db.session.execute(
+        jobs.delete().where(jobs.c.status.not_in(JOB_RUNNING_STATES), jobs.c.finished_at < cutoff)
+    ).rowcount
+    db.session.commit()
+    return removed
+
+
+@job_handler('export_board')
+def export_board(board_id):
+    """The whole board: every list with all its tasks, archived ones included (board payloads page them)"""
+    board = db.session.get(BoardModel, board_id)
+    if board is None:
+        raise JobFailed("Board no longer exists")
+    lists = ListModel.query.filter_by(board_id=board.id).order_by(ListModel.position, ListModel.id).all()
+    tasks = {list_item.id: [] for list_item in lists}
+    if tasks:
+        for task in TaskModel.query.filter(TaskModel.list_id.in_(list(tasks))).order_by(
+                TaskModel.list_id, TaskModel.position, TaskModel.id):
+            tasks[task.list_id].append(marshal(task, archivedtaskfields))
+    data = marshal(board, boardheaderfields)
+    data["lists"] = [dict(marshal(list_item, listheaderfields), tasks=tasks[list_item.id]) for list_item in lists]
+    data["exported_at"] = datetime.utcnow().isoformat()
+    return data
+
+
+# Due-date reminders
+Reminder = collections.namedtuple('Reminder', 'kind task_id title due_date board_id board_title email')
+
+
+class LogReminderSink:
+    """Writes reminders to the kanban.reminders log"""
+
+    def send(self, reminders):
+        for reminder in reminders:
+            reminder_log.info("Task %s", reminder.kind, extra=reminder._asdict())
+        return len(reminders)
+
+
+class SmtpReminderSink:
+    """E-mails reminders through an SMTP server (e.g. a local `python -m aiosmtpd -n` stand-in)"""
+
+    def __init__(self, host, port, sender):
+        self.host, self.port, self.sender = host, port, sender
+
+    def send(self, reminders):
+        sent = 0
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            for reminder in reminders:
+                message = EmailMessage()
+                message['From'] = self.sender
+                message['To'] = reminder.email
+                message['Subject'] = f"{'Overdue' if reminder.kind == 'overdue' else 'Due soon'}: {reminder.title}"
+                message.set_content(f"\"{reminder.title}\" on {reminder.board_title} is due "
+                                    f"{reminder.due_date:%Y-%m-%d %H:%M} UTC.")
+                smtp.send_message(message)
+                sent += 1
+        return sent
+
+
+def make_reminder_sink():
+    """Sinks take a list of Reminder and return how many of them, in order, were delivered"""
+    backend = app.config["REMINDER_SINK"]
+    if backend == 'log':
+        return LogReminderSink()
+    if backend == 'smtp':
+        return SmtpReminderSink(app.config["REMINDER_SMTP_HOST"], app.config["REMINDER_SMTP_PORT"],
+                                app.config["REMINDER_SMTP_FROM"])
+    if backend == 'none':
+        return None
+    raise ValueError(f"Unknown REMINDER_SINK: {backend}")
+
+
+def _pending_reminders(stage, cutoff):
+    tasks = TaskModel.__table__
+    return select(tasks.c.id).where(db.text(PENDING_REMINDER), tasks.c.reminder_stage == stage,
+                                    tasks.c.due_date <= cutoff)
+
+
+def claim_reminders(limit=None, lease_seconds=None, now=None):
+    """Lease up to `limit` tasks of the current shard whose next reminder has fallen due.
+
+    Stage 0 tasks are due `REMINDER_LEAD_MINUTES` before their due_date, stage 1 tasks at it; both are
+    range scans of ix_task_model_due, so the cost depends on `limit`, not on how many tasks have dates.
+    Another scheduler skips leased rows until the lease runs out. Returns (id, due_date, stage, lease) rows.
+    """
+    tasks = TaskModel.__table__
+    now = now or datetime.utcnow()
+    limit = limit or app.config["REMINDER_BATCH_SIZE"]
+    lease = now + timedelta(seconds=lease_seconds or app.config["REMINDER_LEASE_SECONDS"])
+    lead = timedelta(minutes=app.config["REMINDER_LEAD_MINUTES"])
+    claimed = []
+    for stage, cutoff in ((0, now + lead), (1, now)):
+        if len(claimed) >= limit:
+            break
+        due = (_pending_reminders(stage, cutoff)
+               .where(or_(tasks.c.reminder_lease.is_(None), tasks.c.reminder_lease < now))
+               .order_by(tasks.c.due_date)
+               .limit(limit - len(claimed)))
+        claimed += db.session.execute(
+            tasks.update().where(tasks.c.id.in_(due.scalar_subquery())).values(reminder_lease=lease)
+            .returning(tasks.c.id, tasks.c.due_date, tasks.c.reminder_stage, tasks.c.reminder_lease)
+        ).all()
+    db.session.commit()
+    return claimed
+
+
+def next_reminder_times(limit):
+    """(fire time, task id) of up to `limit` upcoming reminders per stage in the current shard"""
+    tasks = TaskModel.__table__
+    lead = timedelta(minutes=app.config["REMINDER_LEAD_MINUTES"])
+    upcoming = []
+    for stage, offset in ((0, lead), (1, timedelta(0))):
+        rows = db.session.execute(
+            select(tasks.c.due_date, tasks.c.id).where(db.text(PENDING_REMINDER), tasks.c.reminder_stage == stage)
+            .order_by(tasks.c.due_date).limit(limit)
+        ).all()
+        upcoming += [(due_date - offset, task_id) for due_date, task_id in rows]
+    return upcoming
+
+
+def dispatch_reminders(sink, limit=None, lease_seconds=None, now=None):
+    """Claim one batch of due reminders in the current shard and hand it to `sink`; returns how many were claimed.
+
+    A task whose due date already passed gets the overdue reminder only. Delivery is at-least-once:
+    a reminder sent by a scheduler that dies before recording it goes out again after the lease.
+    """
+    now = now or datetime.utcnow()
+    claimed = claim_reminders(limit, lease_seconds, now)
+    if not claimed:
+        return 0
+    tasks, lists, boards = TaskModel.__table__, ListModel.__table__, BoardModel.__table__
+    details = {row.id: row for row in db.session.execute(
+        select(tasks.c.id, tasks.c.title, boards.c.id.label('board_id'), boards.c.title.label('board_title'),
+               boards.c.user_id)
+        .join(lists, lists.c.id == tasks.c.list_id).join(boards, boards.c.id == lists.c.board_id)
+        .where(tasks.c.id.in_([row.id for row in claimed]))
+    )}
+    emails = dict(db.session.execute(
+        select(UserModel.id, UserModel.email).where(UserModel.id.in_({row.user_id for row in details.values()}))
+    ).all())
+    lead = timedelta(minutes=app.config["REMINDER_LEAD_MINUTES"])
+    batch, leases = [], []
+    for row in claimed:
+        detail = details[row.id]
+        kind = 'overdue' if row.due_date <= now else 'upcoming'
+        batch.append(Reminder(kind, row.id, detail.title, row.due_date, detail.board_id, detail.board_title,
+                              emails.get(detail.user_id)))
+        leases.append((row, 2 if kind == 'overdue' else 1,
+                       row.due_date - (lead if kind == 'upcoming' else timedelta(0))))
+
+    try:
+        sent = sink.send(batch) if sink is not None else len(batch)
+    except Exception:
+        reminder_log.exception("Reminder sink failed", extra={'claimed': len(batch)})
+        sent = 0
+    for reminder in batch[sent:]:
+        REMINDERS.labels(reminder.kind, 'failed').inc()
+    if sent:
+        for reminder, (_, _, due_at) in zip(batch[:sent], leases):
+            REMINDERS.labels(reminder.kind, 'sent').inc()
+            REMINDER_DELAY.observe(max(0.0, (now - due_at).total_seconds()))
+        # Only while our lease holds: a due date edited meanwhile reset the row and owes new reminders
+        db.session.execute(
+            TaskModel.__table__.update()
+            .where(tasks.c.id == bindparam('task_id'), tasks.c.reminder_lease == bindparam('lease'))
+            .values(reminder_stage=bindparam('stage'), reminder_lease=None),
+            [{'task_id': row.id, 'lease': row.reminder_lease, 'stage': stage} for row, stage, _ in leases[:sent]]
+        )
+        db.session.commit()
+    # Unsent reminders stay leased, so a failing sink is retried once per lease instead of every tick
+    return len(claimed)
+
+
+def _rebuild_table(conn, table):
+    """SQLite can't ALTER constraints: copy the rows into a fresh copy of the table and swap it in"""
+    existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table.name})")}
+    columns = ', '.join(column.name for column in table.columns if column.name in existing)
+    new_name = f"{table.name}__new"
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect)).strip()
+    conn.exec_driver_sql(ddl.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {new_name} ", 1))
+    conn.exec_driver_sql(f"INSERT INTO {new_name} ({columns}) SELECT {columns} FROM {table.name}")
+    conn.exec_driver_sql(f"DROP TABLE {table.name}")
+    conn.exec_driver_sql(f"ALTER TABLE {new_name} RENAME TO {table.name}")
+    # Index names are global, so they can only be recreated once the old table is gone
+    for index in table.indexes:
+        index.create(conn)
+
+
+def upgrade_schema(engine=None, metadata=None):
+    """Bring an existing SQLite database (the main one unless a shard's engine and metadata are given)
+    in line with the models (create_all only adds missing tables).
+
+    Returns the "table.column" names that did not exist before.
+    """
+    added = set()
+    engine = engine or db.engine
+    metadata = metadata or db.metadata
+    if engine.dialect.name != 'sqlite':
+        return added
+    with engine.connect() as conn:
+        # Has to be switched off outside a transaction, otherwise the table swap cascades
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        try:
+            for table in metadata.sorted_tables:
+                existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table.name})")}
+                missing = [column for column in table.columns if column.name not in existing]
+                added.update(f"{table.name}.{column.name}" for column in missing)
+
+                actual = {row[3]: row[6] for row in conn.exec_driver_sql(f"PRAGMA foreign_key_list({table.name})")}
+                wanted = {fk.parent.name: (fk.ondelete or 'NO ACTION').upper() for fk in table.foreign_keys}
+                if any(actual.get(column, on_delete) != on_delete for column, on_delete in wanted.items()):
+                    _rebuild_table(conn, table)
+                    log.info("Rebuilt table with ON DELETE rules", extra={'table': table.name})
+                    continue
+
+                # New nullable / defaulted columns can simply be appended
+                for column in missing:
+                    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                    log.info("Added column", extra={'table': table.name, 'column': column.name})
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+            conn.commit()
+            orphans = conn.exec_driver_sql("PRAGMA foreign_key_check").fetchall()
+            if orphans:
+                log.warning("Rows reference missing parents", extra={'count': len(orphans), 'sample': orphans[:3]})
+        finally:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+    return added
+
+
 # Initialize database after all models are defined
 with app.app_context():
     if not os.path.exists(os.path.join(basedir, "instance")):
         os.makedirs(os.path.join(basedir, "instance"))
     db.create_all()
-    print("✅ Database tables created successfully!")
+    if {'list_model.task_count', 'board_model.task_count'} & upgrade_schema():
+        # Counter columns start at 0 on existing rows
+        log.info("Filled counter columns", extra={'repaired': repair_counters()})
+    log.info("Database tables ready")
+
+if app.config["TEMPLATE_WARMUP"]:
+    count, elapsed = warm_templates()
+    log.info("Templates compiled", extra={'count': count, 'duration_ms': round(elapsed * 1000)})
 
 def start_nginx_if_available():
     """Simple nginx starter"""
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Archive Job
+"Done" listesinde uzun süre kalan görevleri arşive taşır.
+
+Tasks that have been in Done for more than ARCHIVE_DONE_AFTER_DAYS get archived_at set and
+drop out of board payloads; they stay available at /api/boards/<id>/archive.
+
+Usage:
+    python management/archive_tasks.py                          # one pass (e.g. from cron)
+    python management/archive_tasks.py --days 7
+    python management/archive_tasks.py --loop --interval 3600   # keep running
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from prometheus_client import start_http_server
+
+from api import app, db, archive_done_tasks
+
+
+def archive_once(args):
+    with app.app_context():
+        started = time.perf_counter()
+        archived = archive_done_tasks(older_than_days=args.days, batch_size=args.batch_size)
+        db.session.remove()
+    if archived or args.verbose:
+        print(f"📦 Archived {archived} done tasks in {time.perf_counter() - started:.2f}s")
+    return archived
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive tasks that have been in Done for a while")
+    parser.add_argument("--days", type=float, default=None,
+                        help="archive tasks in Done for longer than this (default: ARCHIVE_DONE_AFTER_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="tasks flagged per transaction")
+    parser.add_argument("--loop", action="store_true", help="keep running instead of a single pass")
+    parser.add_argument("--interval", type=float, default=3600, help="seconds between passes with --loop")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this port")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+
+    archive_once(args)
+    while args.loop:
+        time.sleep(args.interval)
+        archive_once(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Online Database Backup
+Çalışan veritabanının (ve shard dosyalarının) tutarlı yedeğini alır, doğrular ve geri yükler.
+
+Backups use the SQLite online backup API. In rollback-journal mode the copy takes --pages
+pages per step and sleeps --sleep seconds between steps, so writers only wait for one short
+step at a time instead of the whole copy. A write by another connection makes SQLite start the
+copy over; after --max-restarts restarts the rest is copied in one step, which always finishes.
+WAL databases are copied in one step: there the copy is a read snapshot that never blocks writers.
+
+Every run writes a backup set directory <dest>/<UTC timestamp>/ holding one (gzip) file per
+database plus manifest.json with the SHA-256 of every uncompressed copy. The set directory
+only gets its final name once everything is written and checked.
+
+Usage:
+    python management/backup_db.py backup [--dest instance/backups] [--keep 7] [--no-compress] [--verify]
+    python management/backup_db.py backup --loop --interval 3600 --metrics-port 9102
+    python management/backup_db.py verify instance/backups/20250101T000000Z
+    python management/backup_db.py restore instance/backups/20250101T000000Z --to /srv/kanban-restored
+Restore only writes fresh files: stop the app and point DATABASE_URL / SHARD_DIR at them (or move them in place).
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timezone
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server, write_to_textfile
+
+from api import app, basedir, database_files
+
+DEFAULT_DEST = os.path.join(basedir, "instance", "backups")
+CHUNK_SIZE = 1024 * 1024
+SET_NAME_FORMAT = "%Y%m%dT%H%M%SZ"
+
+# Own registry: a backup process only exports its own samples
+registry = CollectorRegistry()
+BACKUP_DURATION = Histogram('kanban_backup_duration_seconds', 'Time to copy, check and store one database',
+                            ['database'], registry=registry,
+                            buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600, float('inf')))
+BACKUP_BYTES = Gauge('kanban_backup_bytes', 'Size of the newest backup file as stored', ['database'], registry=registry)
+BACKUP_RESTARTS = Counter('kanban_backup_restarts_total', 'Backup copies restarted because the source was written to',
+                          ['database'], registry=registry)
+BACKUP_FAILURES = Counter('kanban_backup_failures_total', 'Backup runs that did not produce a set', registry=registry)
+BACKUP_LAST_SUCCESS = Gauge('kanban_backup_last_success_timestamp_seconds', 'Unix time of the newest complete set',
+                            registry=registry)
+
+
+class TooManyRestarts(Exception):
+    pass
+
+
+def databases():
+    """(label, live path, path inside a backup set/restore directory) of the main database and every shard"""
+    with app.app_context():
+        files = database_files()
+    return [(label, path, os.path.join("shards" if label != "main" else "", os.path.basename(path)))
+            for label, path in files]
+
+
+def copy_database(source_path, target_path, label, pages, sleep, max_restarts):
+    """Online copy of one database; returns how many times SQLite restarted it"""
+    source = sqlite3.connect(source_path, timeout=60)
+    target = sqlite3.connect(target_path)
+    if pages is None:
+        pages = -1 if source.execute("PRAGMA journal_mode").fetchone()[0] == "wal" else 1024
+    restarts = 0
+    remaining_before = None
+
+    def progress(status, remaining, total):
+        nonlocal restarts, remaining_before
+        # The copy starts over when another connection writes to the source
+        if remaining_before is not None and remaining > remaining_before:
+            restarts += 1
+            BACKUP_RESTARTS.labels(label).inc()
+            if restarts > max_restarts:
+                raise TooManyRestarts()
+        remaining_before = remaining
+
+    try:
+        try:
+            source.backup(target, pages=pages, progress=progress, sleep=sleep)
+        except TooManyRestarts:
+            # One step holds the read lock for the whole copy, but nothing can restart it
+            source.backup(target, pages=-1)
+        result = target.execute("PRAGMA quick_check").fetchone()[0]
+        if result != "ok":
+            raise RuntimeError(f"{label}: copy failed quick_check: {result}")
+    finally:
+        source.close()
+        target.close()
+    return restarts
+
+
+def store(raw_path, final_path, compress):
+    """Move the raw copy to final_path (gzipped or not); returns the SHA-256 of the raw copy"""
+    digest = hashlib.sha256()
+    opener = (lambda path: gzip.open(path, "wb", compresslevel=6)) if compress else (lambda path: open(path, "wb"))
+    with open(raw_path, "rb") as source, opener(final_path) as target:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            target.write(chunk)
+    os.remove(raw_path)
+    return digest.hexdigest()
+
+
+def backup(dest=DEFAULT_DEST, pages=None, sleep=0.005, compress=True, max_restarts=3, keep=None,
+           verify_after=False, verbose=True):
+    """Write one backup set; returns its directory"""
+    started = time.time()
+    name = datetime.fromtimestamp(started, timezone.utc).strftime(SET_NAME_FORMAT)
+    partial = os.path.join(dest, name + ".partial")
+    os.makedirs(os.path.join(partial, "shards"), exist_ok=True)
+    manifest = {"created_at": datetime.fromtimestamp(started, timezone.utc).isoformat(), "files": {}}
+    try:
+        for label, path, relative in databases():
+            step_started = time.perf_counter()
+            stored = relative + (".gz" if compress else "")
+            raw_path = os.path.join(partial, relative + ".tmp")
+            restarts = copy_database(path, raw_path, label, pages, sleep, max_restarts)
+            raw_bytes = os.path.getsize(raw_path)
+            sha256 = store(raw_path, os.path.join(partial, stored), compress)
+            stored_bytes = os.path.getsize(os.path.join(partial, stored))
+            elapsed = time.perf_counter() - step_started
+            manifest["files"][stored] = {"database": label, "restore_as": relative, "sha256": sha256,
+                                         "bytes": raw_bytes, "stored_bytes": stored_bytes,
+                                         "restarts": restarts, "seconds": round(elapsed, 3)}
+            BACKUP_DURATION.labels(label).observe(elapsed)
+            BACKUP_BYTES.labels(label).set(stored_bytes)
+            if verbose:
+                print(f"  {label}: {raw_bytes / 1024 / 1024:.1f} MiB -> {stored} "
+                      f"({stored_bytes / 1024 / 1024:.1f} MiB) in {elapsed:.2f}s, {restarts} restarts")
+
+        with open(os.path.join(partial, "manifest.json"), "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2, sort_keys=True)
+        if verify_after and not verify(partial, verbose=verbose):
+            raise RuntimeError("backup set failed verification")
+        final = os.path.join(dest, name)
+        os.replace(partial, final)
+    except BaseException:
+        BACKUP_FAILURES.inc()
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+    BACKUP_LAST_SUCCESS.set(started)
+    if keep:
+        prune(dest, keep)
+    return final
+
+
+def backup_sets(dest):
+    """Complete sets, oldest first (set names sort by time)"""
+    if not os.path.isdir(dest):
+        return []
+    return sorted(os.path.join(dest, name) for name in os.listdir(dest)
+                  if os.path.exists(os.path.join(dest, name, "manifest.json")) and not name.endswith(".partial"))
+
+
+def prune(dest, keep):
+    for path in backup_sets(dest)[:-keep]:
+        shutil.rmtree(path)
+
+
+def extract(set_dir, stored, entry, target_path):
+    """Unpack one file of a set to target_path and check it; returns an error message or None"""
+    source = os.path.join(set_dir, stored)
+    opener = gzip.open if stored.endswith(".gz") else open
+    digest = hashlib.sha256()
+    try:
+        with opener(source, "rb") as handle, open(target_path, "wb") as target:
+            for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                target.write(chunk)
+            target.flush()
+            os.fsync(target.fileno())
+    except (OSError, EOFError, zlib.error) as error:
+        return f"unreadable ({error})"
+    if digest.hexdigest() != entry["sha256"]:
+        return "checksum mismatch"
+    conn = sqlite3.connect(target_path)
+    try:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    except sqlite3.DatabaseError as error:
+        result = str(error)
+    finally:
+        conn.close()
+    return None if result == "ok" else f"integrity_check: {result}"
+
+
+def load_manifest(set_dir):
+    with open(os.path.join(set_dir, "manifest.json"), encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def verify(set_dir, verbose=True):
+    """Checksum and integrity check of every file in a set, unpacked to a scratch file"""
+    ok = True
+    for stored, entry in load_manifest(set_dir)["files"].items():
+        with tempfile.TemporaryDirectory() as scratch:
+            error = extract(set_dir, stored, entry, os.path.join(scratch, "check.db"))
+        if verbose:
+            print(f"  {stored}: {error or 'ok'}")
+        ok = ok and error is None
+    return ok
+
+
+def restore(set_dir, target_dir, force=False, verbose=True):
+    """Unpack a set into target_dir as fresh files; nothing is written unless every file checks out"""
+    files = load_manifest(set_dir)["files"]
+    targets = {stored: os.path.join(target_dir, entry["restore_as"]) for stored, entry in files.items()}
+    existing = [path for path in targets.values() if os.path.exists(path)]
+    if existing and not force:
+        raise SystemExit(f"Refusing to overwrite {', '.join(existing)} (use --force)")
+
+    for stored, entry in files.items():
+        os.makedirs(os.path.dirname(targets[stored]), exist_ok=True)
+        error = extract(set_dir, stored, entry, targets[stored] + ".restore")
+        if error:
+            for path in targets.values():
+                if os.path.exists(path + ".restore"):
+                    os.remove(path + ".restore")
+            raise SystemExit(f"{stored}: {error}, nothing restored")
+    for stored, path in targets.items():
+        os.replace(path + ".restore", path)
+        if verbose:
+            print(f"  {stored} -> {path}")
+    return list(targets.values())
+
+
+def backup_once(args):
+    started = time.perf_counter()
+    try:
+        set_dir = backup(dest=args.dest, pages=args.pages, sleep=args.sleep, compress=not args.no_compress,
+                         max_restarts=args.max_restarts, keep=args.keep, verify_after=args.verify)
+        print(f"💾 Backup set {set_dir} written in {time.perf_counter() - started:.2f}s")
+    except Exception as error:
+        if not args.loop:
+            raise
+        print(f"❌ Backup failed: {error}")
+    finally:
+        if args.metrics_textfile:
+            write_to_textfile(args.metrics_textfile, registry)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online backup, verification and restore of the SQLite databases")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backup_parser = commands.add_parser("backup", help="write a new backup set")
+    backup_parser.add_argument("--dest", default=DEFAULT_DEST, help="directory holding the backup sets")
+    backup_parser.add_argument("--pages", type=int, default=None,
+                               help="pages copied per step, -1: all at once (default: 1024, WAL databases -1)")
+    backup_parser.add_argument("--sleep", type=float, default=0.005, help="seconds writers get between steps")
+    backup_parser.add_argument("--max-restarts", type=int, default=3,
+                               help="restarts tolerated before copying the rest in one step")
+    backup_parser.add_argument("--no-compress", action="store_true", help="store plain .db files instead of gzip")
+    backup_parser.add_argument("--verify", action="store_true", help="verify the set before publishing it")
+    backup_parser.add_argument("--keep", type=int, default=7, help="complete sets to keep (0: keep all)")
+    backup_parser.add_argument("--loop", action="store_true", help="keep running instead of a single backup")
+    backup_parser.add_argument("--interval", type=float, default=3600, help="seconds between backups with --loop")
+    backup_parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this port")
+    backup_parser.add_argument("--metrics-textfile", default=None,
+                               help="write metrics to this file after each run (node_exporter textfile collector)")
+
+    verify_parser = commands.add_parser("verify", help="check the checksums and integrity of a set")
+    verify_parser.add_argument("set_dir")
+
+    restore_parser = commands.add_parser("restore", help="unpack a set into fresh database files")
+    restore_parser.add_argument("set_dir")
+    restore_parser.add_argument("--to", required=True, dest="target_dir", help="directory for the restored files")
+    restore_parser.add_argument("--force", action="store_true", help="overwrite files that already exist there")
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        if not verify(args.set_dir):
+            sys.exit(1)
+        print("✅ Backup set verified")
+    elif args.command == "restore":
+        restore(args.set_dir, args.target_dir, force=args.force)
+        print("✅ Restore complete")
+    else:
+        if args.metrics_port:
+            start_http_server(args.metrics_port, registry=registry)
+        backup_once(args)
+        while args.loop:
+            time.sleep(args.interval)
+            backup_once(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Online Backup Benchmark
+Yedek alınırken yazma gecikmesinin (p50/p99/max) nasıl etkilendiğini ölçer.
+
+A writer thread moves random tasks (UPDATE + COMMIT) at --write-rate per second while
+backup_db.copy_database copies the database with each --pages setting. -1 copies
+everything in one step and holds the read lock for the whole copy, so writers stall for
+its full duration. Smaller steps keep each stall short, but every write makes SQLite restart
+the copy, and after --max-restarts restarts the copy falls back to a single step.
+With --wal the database is switched to WAL first, where a single step never blocks the writer.
+
+Usage:
+    python management/benchmark_backup.py --users 500 --pages=-1,1024,128
+    python management/benchmark_backup.py --no-seed --wal --pages=-1
+    python management/benchmark_backup.py --users 20000 --description-words 80-120   # multi-GB file
+Runs against a scratch database (DATABASE_URL, default: <tmp>/kanban_backup_bench.db), never the real one.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "kanban_backup_bench.db"))
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from api import app, db
+import backup_db
+import seed_db
+
+
+class Writer(threading.Thread):
+    """Moves random tasks at a fixed rate and records every commit's latency"""
+
+    def __init__(self, path, rate, max_task_id):
+        super().__init__(daemon=True)
+        self.conn = sqlite3.connect(path, timeout=120, check_same_thread=False)
+        self.interval = 1.0 / rate
+        self.max_task_id = max_task_id
+        self.latencies = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        rng = random.Random(1)
+        next_write = time.perf_counter()
+        while not self.stopped.is_set():
+            started = time.perf_counter()
+            self.conn.execute("UPDATE task_model SET position = position + 1 WHERE id = ?",
+                              (rng.randint(1, self.max_task_id),))
+            self.conn.commit()
+            self.latencies.append(time.perf_counter() - started)
+            next_write += self.interval
+            self.stopped.wait(max(0.0, next_write - time.perf_counter()))
+        self.conn.close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def measure(path, args, max_task_id, pages):
+    """Write latencies while one backup runs (pages=None: no backup, just the baseline window)"""
+    writer = Writer(path, args.write_rate, max_task_id)
+    writer.start()
+    started = time.perf_counter()
+    restarts = 0
+    if pages is None:
+        time.sleep(args.baseline_seconds)
+    else:
+        with tempfile.TemporaryDirectory() as scratch:
+            restarts = backup_db.copy_database(path, os.path.join(scratch, "copy.db"), "bench", pages,
+                                               args.sleep, args.max_restarts)
+    elapsed = time.perf_counter() - started
+    writer.stopped.set()
+    writer.join()
+    return elapsed, restarts, writer.latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure write latency during an online backup")
+    parser.add_argument("--users", type=int, default=500, help="seeded users (2 boards x 5 lists each)")
+    parser.add_argument("--tasks", default="20", help="tasks per list (N or MIN-MAX)")
+    parser.add_argument("--description-words", default="10-40", help="description size, grows the file")
+    parser.add_argument("--pages", default="-1,1024,128", help="comma separated pages per step to compare")
+    parser.add_argument("--sleep", type=float, default=0.005, help="seconds between backup steps")
+    parser.add_argument("--max-restarts", type=int, default=3)
+    parser.add_argument("--write-rate", type=float, default=100, help="task updates per second during the run")
+    parser.add_argument("--baseline-seconds", type=float, default=5)
+    parser.add_argument("--no-seed", action="store_true", help="reuse the scratch database from the last run")
+    parser.add_argument("--wal", action="store_true", help="switch the scratch database to WAL before measuring")
+    args = parser.parse_args()
+
+    if not args.no_seed:
+        seed_db.seed_database(seed_db.build_parser().parse_args([
+            '--reset', '--fixed-clock', '--users', str(args.users), '--boards', '2', '--lists', '5',
+            '--tasks', args.tasks, '--description-words', args.description_words,
+        ]))
+    with app.app_context():
+        path = db.engine.url.database
+        max_task_id = db.session.execute(db.text("SELECT max(id) FROM task_model")).scalar() or 1
+        db.session.remove()
+        db.engine.dispose()
+    conn = sqlite3.connect(path)
+    journal_mode = conn.execute(f"PRAGMA journal_mode={'WAL' if args.wal else 'DELETE'}").fetchone()[0]
+    conn.close()
+    print(f"Database: {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MiB, journal_mode={journal_mode})")
+
+    results = [("none", *measure(path, args, max_task_id, None))]
+    for pages in [int(value) for value in args.pages.split(',')]:
+        results.append((str(pages), *measure(path, args, max_task_id, pages)))
+
+    print()
+    print(f"{'pages':>7} {'backup s':>9} {'restarts':>9} {'writes':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>9}")
+    for pages, elapsed, restarts, latencies in results:
+        print(f"{pages:>7} {elapsed if pages != 'none' else 0:>9.2f} {restarts:>9} {len(latencies):>7} "
+              f"{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f} "
+              f"{max(latencies, default=0) * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
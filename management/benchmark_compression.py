@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Response Compression Benchmark
+Büyük pano yanıtlarında kablodaki bayt ve istek başına CPU maliyetini ölçer.
+
+For each board size and each available encoding (identity, gzip, br, zstd) it reports the
+bytes on the wire and the CPU time per GET /api/boards/<id>, once with the snapshot cache
+off (serialize + compress every time) and once with it warm (precompressed bytes as-is).
+
+Usage:
+    python management/benchmark_compression.py --sizes 100,1000,5000 --requests 50
+Runs against a scratch database (DATABASE_URL, default: <tmp>/kanban_bench.db), never the real one.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "kanban_bench.db"))
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+import api
+from api import app, BoardModel, COMPRESSORS
+import seed_db
+
+
+def seed_board(tasks):
+    args = seed_db.build_parser().parse_args([
+        '--reset', '--fixed-clock', '--users', '1', '--boards', '1', '--lists', '5',
+        '--tasks', str(tasks // 5), '--description-words', '5-30',
+    ])
+    seed_db.seed_database(args)
+
+
+def measure(client, board_id, encoding, requests):
+    headers = {'Accept-Encoding': encoding} if encoding != 'identity' else {}
+    response = client.get(f'/api/boards/{board_id}', headers=headers)  # warm-up / fill the cache
+    started = time.process_time()
+    for _ in range(requests):
+        response = client.get(f'/api/boards/{board_id}', headers=headers)
+    return len(response.data), (time.process_time() - started) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure response size and CPU per encoding")
+    parser.add_argument("--sizes", default="100,1000,5000", help="comma separated task counts")
+    parser.add_argument("--requests", type=int, default=50, help="requests per measurement")
+    args = parser.parse_args()
+
+    # Let every board's tasks into the payload so the sizes are comparable
+    app.config["TASKS_PAGE_SIZE"] = 10 ** 6
+    encodings = ['identity'] + [name for name in app.config["COMPRESS_ALGORITHMS"] if name in COMPRESSORS]
+    cache = api.MemorySnapshotCache(1024 * 1024 * 1024)
+
+    results = []
+    for size in [int(value) for value in args.sizes.split(',')]:
+        seed_board(size)
+        with app.app_context():
+            board = BoardModel.query.first()
+            board_id, user_id = board.id, board.user_id
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user_id'] = user_id
+        for encoding in encodings:
+            app.config["COMPRESS_ALGORITHMS"] = [encoding]
+            api.board_cache = None
+            wire, cold_cpu = measure(client, board_id, encoding, args.requests)
+            api.board_cache = cache
+            _, warm_cpu = measure(client, board_id, encoding, args.requests)
+            results.append((size, encoding, wire, cold_cpu, warm_cpu))
+        cache.clear()
+
+    print()
+    print(f"{'tasks':>6} {'encoding':>9} {'wire KiB':>9} {'uncached ms':>12} {'cached ms':>10}")
+    for size, encoding, wire, cold_cpu, warm_cpu in results:
+        print(f"{size:>6} {encoding:>9} {wire / 1024:>9.1f} {cold_cpu * 1000:>12.2f} {warm_cpu * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
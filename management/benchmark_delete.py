@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Board Delete Benchmark
+Bir panoyu (5 liste, N görev) silmenin Python tarafındaki maliyetini ölçer.
+
+With ON DELETE CASCADE + passive_deletes the ORM issues a single DELETE for the board and
+never loads its lists or tasks, so statements / loaded objects / peak memory stay flat
+while only SQLite's own cascade time grows with N.
+
+Usage:
+    python management/benchmark_delete.py --sizes 1000,10000,100000
+Runs against a scratch database (DATABASE_URL, default: <tmp>/kanban_bench.db), never the real one.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "kanban_bench.db"))
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from sqlalchemy import event
+
+from api import app, db, BoardModel, TaskModel
+import seed_db
+
+
+def seed_board(tasks):
+    args = seed_db.build_parser().parse_args([
+        '--reset', '--fixed-clock', '--users', '1', '--boards', '1', '--lists', '5',
+        '--tasks', str(tasks // 5), '--description-words', '10',
+    ])
+    seed_db.seed_database(args)
+
+
+def measure_delete():
+    stats = {'statements': 0, 'loaded': 0}
+
+    def count_statement(*_):
+        stats['statements'] += 1
+
+    def count_load(*_):
+        stats['loaded'] += 1
+
+    with app.app_context():
+        board = BoardModel.query.first()
+        event.listen(db.engine, 'after_cursor_execute', count_statement)
+        event.listen(db.Model, 'load', count_load, propagate=True)
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            db.session.delete(board)
+            db.session.commit()
+        finally:
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            event.remove(db.engine, 'after_cursor_execute', count_statement)
+            event.remove(db.Model, 'load', count_load)
+        remaining = TaskModel.query.count()
+        db.session.remove()
+    return elapsed, stats['statements'], stats['loaded'], peak, remaining
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure board deletion cost")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated task counts")
+    args = parser.parse_args()
+
+    results = []
+    for size in [int(value) for value in args.sizes.split(',')]:
+        seed_board(size)
+        results.append((size, *measure_delete()))
+
+    print()
+    print(f"{'tasks':>8} {'delete ms':>10} {'statements':>11} {'ORM loads':>10} {'peak KiB':>9} {'left':>5}")
+    for size, elapsed, statements, loaded, peak, remaining in results:
+        print(f"{size:>8} {elapsed * 1000:>10.1f} {statements:>11} {loaded:>10} {peak / 1024:>9.1f} {remaining:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Static Asset Build
+Sayfa script/style dosyalarını küçültür, içerik hash'li isimlerle static/dist'e yazar.
+
+Every .js/.css file under static/src (the scripts and styles pulled out of the templates)
+plus static/css/styles.css is minified into static/dist/<name>.<hash>.<ext> with a source
+map next to it. static/dist/manifest.json maps source paths to the built files; templates
+resolve them with asset_url() and Flask serves dist/ with immutable cache headers.
+
+The minifier only drops comments, indentation and blank lines. Line breaks are kept, so
+automatic semicolon insertion is unaffected and every output line maps to one source line.
+
+Usage:
+    python management/build_assets.py            # build (keeps older bundles for open pages)
+    python management/build_assets.py --clean    # also delete bundles no longer in the manifest
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(parent_dir, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+SOURCES = ["src", "css/styles.css"]
+
+# A "/" after one of these (or at the start) opens a regex literal, otherwise it divides
+REGEX_PREFIX_CHARS = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_PREFIX_WORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void",
+                      "throw", "yield", "await", "instanceof"}
+VLQ_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+class Minifier:
+    """Single pass lexer that copies code, strings, templates and regexes and skips comments"""
+
+    def __init__(self, source, js):
+        self.src = source
+        self.js = js
+        self.lines = []    # (text, source line, source column)
+        self.line = []
+        self.line_origin = None
+        self.row = 0
+        self.col = 0
+        self.in_literal = False  # inside a multi-line string/template: keep the text exactly
+        self.last = ""           # last significant code character, for regex detection
+        self.last_word = ""
+
+    def emit(self, text):
+        if self.line_origin is None:
+            if not self.in_literal and not text.strip():
+                return
+            self.line_origin = (self.row, self.col)
+        self.line.append(text)
+
+    def newline(self):
+        text = "".join(self.line)
+        if not self.in_literal:
+            text = text.rstrip()
+        if text or self.in_literal:
+            self.lines.append((text, *(self.line_origin or (self.row, 0))))
+        self.line, self.line_origin = [], None
+        self.row += 1
+        self.col = 0
+
+    def advance(self, text):
+        """Copy text (which may span lines) to the output"""
+        for char in text:
+            if char == "\n":
+                self.newline()
+            else:
+                self.emit(char)
+                self.col += 1
+
+    def skip(self, text):
+        """Drop text but keep its line breaks"""
+        for char in text:
+            if char == "\n":
+                self.newline()
+            else:
+                self.col += 1
+
+    def run(self):
+        src, i = self.src, 0
+        # Each entry is the open "{" count of a ${ ... } inside a template literal
+        template_depth = []
+        while i < len(src):
+            char = src[i]
+            pair = src[i:i + 2]
+            if pair == "/*":
+                end = src.find("*/", i + 2)
+                end = len(src) if end < 0 else end + 2
+                self.skip(src[i:end])
+                i = end
+            elif self.js and pair == "//":
+                end = src.find("\n", i)
+                end = len(src) if end < 0 else end
+                self.skip(src[i:end])
+                i = end
+            elif char in "'\"":
+                end = self.string_end(i, char)
+                self.in_literal = True  # a backslash-newline continues the string
+                self.advance(src[i:end])
+                self.in_literal = False
+                self.last, self.last_word = char, ""
+                i = end
+            elif self.js and char == "`":
+                i = self.template(i + 1, template_depth)
+            elif self.js and char == "}" and template_depth and template_depth[-1] == 0:
+                template_depth.pop()
+                i = self.template(i + 1, template_depth, resume=True)
+            elif self.js and char == "/" and (self.last in REGEX_PREFIX_CHARS or not self.last
+                                              or self.last_word in REGEX_PREFIX_WORDS):
+                end = self.regex_end(i)
+                self.advance(src[i:end])
+                self.last, self.last_word = "/", ""
+                i = end
+            else:
+                if self.js and template_depth:
+                    if char == "{":
+                        template_depth[-1] += 1
+                    elif char == "}":
+                        template_depth[-1] -= 1
+                if char == "\n":
+                    self.newline()
+                else:
+                    self.emit(char)
+                    self.col += 1
+                if not char.isspace():
+                    if char.isalnum() or char in "_$":
+                        self.last_word = self.last_word + char if self.last.isalnum() or self.last in "_$" else char
+                    else:
+                        self.last_word = ""
+                    self.last = char
+                i += 1
+        if self.line:
+            self.newline()
+        return self.lines
+
+    def string_end(self, start, quote):
+        i = start + 1
+        while i < len(self.src) and self.src[i] != quote and self.src[i] != "\n":
+            i += 2 if self.src[i] == "\\" else 1
+        return i + 1
+
+    def regex_end(self, start):
+        i, in_class = start + 1, False
+        while i < len(self.src) and self.src[i] != "\n":
+            char = self.src[i]
+            if char == "\\":
+                i += 2
+                continue
+            if char == "[":
+                in_class = True
+            elif char == "]":
+                in_class = False
+            elif char == "/" and not in_class:
+                i += 1
+                break
+            i += 1
+        while i < len(self.src) and (self.src[i].isalpha()):
+            i += 1
+        return i
+
+    def template(self, i, template_depth, resume=False):
+        """Copy a template literal up to its closing backtick or the next ${"""
+        src = self.src
+        self.advance("}" if resume else "`")
+        self.in_literal = True
+        while i < len(src):
+            if src[i] == "\\":
+                self.advance(src[i:i + 2])
+                i += 2
+            elif src[i] == "`":
+                self.in_literal = False
+                self.advance("`")
+                self.last = "`"
+                return i + 1
+            elif src[i:i + 2] == "${":
+                self.in_literal = False
+                self.advance("${")
+                template_depth.append(0)
+                self.last = "{"
+                return i + 2
+            else:
+                self.advance(src[i])
+                i += 1
+        self.in_literal = False
+        return i
+
+
+def vlq(value):
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    encoded = ""
+    while True:
+        digit = value & 31
+        value >>= 5
+        encoded += VLQ_CHARS[digit | (32 if value else 0)]
+        if not value:
+            return encoded
+
+
+def source_map(lines, output_name, source_path):
+    """Source map v3 with one segment per line: generated column 0 -> first kept source column"""
+    segments, previous_row, previous_col = [], 0, 0
+    for _, row, col in lines:
+        segments.append(vlq(0) + vlq(0) + vlq(row - previous_row) + vlq(col - previous_col))
+        previous_row, previous_col = row, col
+    return {
+        "version": 3,
+        "file": output_name,
+        "sources": [os.path.relpath(source_path, DIST_DIR).replace(os.sep, "/")],
+        "names": [],
+        "mappings": ";".join(segments),
+    }
+
+
+def build_file(source_path):
+    """Minify one file into dist; returns the dist-relative output name"""
+    with open(source_path, encoding="utf-8") as handle:
+        source = handle.read()
+    stem, ext = os.path.splitext(os.path.basename(source_path))
+    lines = Minifier(source, js=ext == ".js").run()
+    body = "\n".join(text for text, _, _ in lines) + "\n"
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:10]
+    output_name = f"{stem}.{digest}{ext}"
+    map_comment = (f"//# sourceMappingURL={output_name}.map" if ext == ".js"
+                   else f"/*# sourceMappingURL={output_name}.map */")
+
+    with open(os.path.join(DIST_DIR, output_name), "w", encoding="utf-8") as handle:
+        handle.write(body + map_comment + "\n")
+    with open(os.path.join(DIST_DIR, output_name + ".map"), "w", encoding="utf-8") as handle:
+        json.dump(source_map(lines, output_name, source_path), handle)
+    return output_name, len(source.encode("utf-8")), len(body.encode("utf-8"))
+
+
+def collect_sources():
+    for entry in SOURCES:
+        path = os.path.join(STATIC_DIR, entry)
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith((".js", ".css")):
+                    yield f"{entry}/{name}", os.path.join(path, name)
+        elif os.path.exists(path):
+            yield entry, path
+
+
+def build(clean=False, verbose=True):
+    os.makedirs(DIST_DIR, exist_ok=True)
+    manifest = {}
+    for key, path in collect_sources():
+        output_name, before, after = build_file(path)
+        manifest[key] = f"dist/{output_name}"
+        if verbose:
+            print(f"  {key} -> dist/{output_name} ({before / 1024:.1f} KiB -> {after / 1024:.1f} KiB)")
+
+    # Written last and atomically: pages never see a manifest pointing at missing files
+    manifest_path = os.path.join(DIST_DIR, "manifest.json")
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    if clean:
+        keep = {os.path.basename(name) for name in manifest.values()}
+        keep |= {name + ".map" for name in keep} | {"manifest.json"}
+        for name in os.listdir(DIST_DIR):
+            if name not in keep:
+                os.remove(os.path.join(DIST_DIR, name))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build fingerprinted, minified static bundles")
+    parser.add_argument("--clean", action="store_true", help="remove bundles that are no longer referenced")
+    args = parser.parse_args()
+    manifest = build(clean=args.clean)
+    print(f"✅ Built {len(manifest)} assets into static/dist")
+
+
+if __name__ == "__main__":
+    main()
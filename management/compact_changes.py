@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Change Log Compaction
+Pano değişiklik günlüğünden eskimiş ve süresi dolmuş kayıtları siler.
+
+Entries superseded by a newer entry for the same board/list/task are always removed.
+Entries older than CHANGELOG_RETENTION_HOURS are removed too and the board's
+changelog_floor moves past them, so GET /api/boards/<id>/changes answers 410 (resync)
+to clients still holding an older cursor.
+
+Usage:
+    python management/compact_changes.py                          # one pass (e.g. from cron)
+    python management/compact_changes.py --retention-hours 24
+    python management/compact_changes.py --loop --interval 3600   # keep running
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from prometheus_client import start_http_server
+
+from api import app, db, compact_changes
+
+
+def compact_once(args):
+    with app.app_context():
+        started = time.perf_counter()
+        removed = compact_changes(retention_hours=args.retention_hours)
+        db.session.remove()
+    if any(removed.values()) or args.verbose:
+        print(f"🧹 Removed {removed['superseded']} superseded and {removed['expired']} expired "
+              f"change log rows in {time.perf_counter() - started:.2f}s")
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact the board change log")
+    parser.add_argument("--retention-hours", type=float, default=None,
+                        help="drop entries older than this (default: CHANGELOG_RETENTION_HOURS)")
+    parser.add_argument("--loop", action="store_true", help="keep running instead of a single pass")
+    parser.add_argument("--interval", type=float, default=3600, help="seconds between passes with --loop")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this port")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+
+    compact_once(args)
+    while args.loop:
+        time.sleep(args.interval)
+        compact_once(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Database Maintenance
+Veritabanı bakımını yapar: artımlı vacuum, ANALYZE, bütünlük kontrolü ve tablo istatistikleri.
+
+Runs on the main database and every shard file, one short statement at a time, so writers
+only ever wait for a single step:
+  stats    rows, tombstones and bytes (table + indexes) per table, plus free pages
+  check    PRAGMA quick_check, one table at a time
+  analyze  ANALYZE one table at a time under PRAGMA analysis_limit, then PRAGMA optimize
+  vacuum   PRAGMA incremental_vacuum in --vacuum-pages passes until the free list is empty
+           or --vacuum-seconds is used up, pausing --pause seconds between passes
+
+Incremental vacuum needs auto_vacuum=INCREMENTAL. New databases get it from api.py; older
+files need one full rewrite with --enable-auto-vacuum, which locks the file while it runs.
+
+Usage:
+    python management/maintain_db.py                          # all steps, human readable
+    python management/maintain_db.py --json --steps stats,check
+    python management/maintain_db.py --loop --interval 86400 --vacuum-seconds 5
+    python management/maintain_db.py --enable-auto-vacuum     # one-off, during a quiet period
+Exits with status 1 when a quick_check finds a problem.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from api import app, database_files
+
+STEPS = ("stats", "check", "analyze", "vacuum")
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+def connect(path):
+    # Autocommit: every statement is its own short transaction
+    return sqlite3.connect(path, timeout=30, isolation_level=None)
+
+
+def pragma(conn, name):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def user_tables(conn):
+    return [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_schema WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+
+
+def table_stats(conn):
+    """Row counts with one aggregate query per table, bytes per table and its indexes from dbstat"""
+    tables = {}
+    for table in user_tables(conn):
+        columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+        # count(column) skips NULLs, so tombstones and archived rows come with the same scan
+        extra = [column for column in ("deleted_at", "archived_at") if column in columns]
+        counts = conn.execute(
+            f'SELECT count(*){"".join(f", count({column})" for column in extra)} FROM "{table}"').fetchone()
+        tables[table] = {"rows": counts[0], **{column.replace("_at", ""): value
+                                               for column, value in zip(extra, counts[1:])}}
+    try:
+        objects = conn.execute("SELECT name, tbl_name, type FROM sqlite_schema WHERE tbl_name IN "
+                               f"({', '.join('?' * len(tables))})", list(tables)).fetchall()
+        for name, table, kind in objects:
+            size = conn.execute("SELECT sum(pgsize) FROM dbstat WHERE name = ? AND aggregate = TRUE",
+                                (name,)).fetchone()[0] or 0
+            entry = tables[table]
+            entry["bytes"] = entry.get("bytes", 0) + size
+            if kind == "index":
+                entry["index_bytes"] = entry.get("index_bytes", 0) + size
+    except sqlite3.OperationalError:
+        pass  # SQLite built without the dbstat table: row counts only
+    return tables
+
+
+def quick_check(conn):
+    """Problems found, checking one table (and its indexes) per statement"""
+    problems = []
+    for table in user_tables(conn):
+        problems += [row[0] for row in conn.execute(f'PRAGMA quick_check("{table}")') if row[0] != "ok"]
+    return problems
+
+
+def analyze(conn, analysis_limit):
+    conn.execute(f"PRAGMA analysis_limit={int(analysis_limit)}")
+    tables = user_tables(conn)
+    for table in tables:
+        conn.execute(f'ANALYZE "{table}"')
+    conn.execute("PRAGMA optimize")
+    return tables
+
+
+def incremental_vacuum(conn, pages, budget_seconds, pause):
+    """Release free pages to the OS in small passes; returns pages freed and time spent"""
+    started = time.perf_counter()
+    before = pragma(conn, "freelist_count")
+    passes = 0
+    while pragma(conn, "freelist_count") and time.perf_counter() - started < budget_seconds:
+        # Each row returned is one freed page, so the statement has to be stepped to the end
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        passes += 1
+        time.sleep(pause)
+    after = pragma(conn, "freelist_count")
+    return {"pages_freed": before - after, "passes": passes, "freelist_after": after,
+            "seconds": round(time.perf_counter() - started, 3)}
+
+
+def maintain(label, path, steps=STEPS, vacuum_pages=256, vacuum_seconds=2.0, pause=0.05, analysis_limit=1000):
+    """Run the selected steps on one database file; returns its report"""
+    conn = connect(path)
+    try:
+        report = {
+            "database": label,
+            "path": path,
+            "file_bytes": os.path.getsize(path),
+            "page_size": pragma(conn, "page_size"),
+            "page_count": pragma(conn, "page_count"),
+            "freelist_count": pragma(conn, "freelist_count"),
+            "auto_vacuum": AUTO_VACUUM_MODES.get(pragma(conn, "auto_vacuum"), "unknown"),
+        }
+        if "stats" in steps:
+            report["tables"] = table_stats(conn)
+        if "check" in steps:
+            report["quick_check"] = quick_check(conn) or "ok"
+        if "analyze" in steps:
+            report["analyzed"] = analyze(conn, analysis_limit)
+        if "vacuum" in steps:
+            if report["auto_vacuum"] == "incremental":
+                report["vacuum"] = incremental_vacuum(conn, vacuum_pages, vacuum_seconds, pause)
+            else:
+                report["vacuum"] = {"skipped": "auto_vacuum is not incremental (see --enable-auto-vacuum)"}
+    finally:
+        conn.close()
+    return report
+
+
+def enable_auto_vacuum(path):
+    """Switch a file to auto_vacuum=INCREMENTAL; needs a full VACUUM, which holds the write lock throughout"""
+    conn = connect(path)
+    try:
+        if pragma(conn, "auto_vacuum") != 2:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+        return AUTO_VACUUM_MODES[pragma(conn, "auto_vacuum")]
+    finally:
+        conn.close()
+
+
+def print_report(report):
+    print(f"🗄️  {report['database']}: {report['file_bytes'] / 1024 / 1024:.1f} MiB, "
+          f"{report['freelist_count']} free of {report['page_count']} pages, auto_vacuum={report['auto_vacuum']}")
+    for table, stats in report.get("tables", {}).items():
+        details = ', '.join(f"{key}={value}" for key, value in stats.items() if key not in ("rows", "bytes"))
+        print(f"  {table:<28} {stats['rows']:>10} rows {stats.get('bytes', 0) / 1024:>10.0f} KiB  {details}")
+    if "quick_check" in report:
+        problems = report["quick_check"]
+        print(f"  quick_check: {problems if problems == 'ok' else f'{len(problems)} problems, first: {problems[0]}'}")
+    if "analyzed" in report:
+        print(f"  analyzed {len(report['analyzed'])} tables")
+    if "vacuum" in report:
+        vacuum = report["vacuum"]
+        if "skipped" in vacuum:
+            print(f"  vacuum skipped: {vacuum['skipped']}")
+        else:
+            print(f"  vacuum: {vacuum['pages_freed']} pages freed in {vacuum['passes']} passes "
+                  f"({vacuum['seconds']:.2f}s), {vacuum['freelist_after']} still free")
+
+
+def run_once(args):
+    with app.app_context():
+        files = database_files()
+    if args.enable_auto_vacuum:
+        for label, path in files:
+            print(f"  {label}: auto_vacuum={enable_auto_vacuum(path)}")
+        return True
+    reports = [maintain(label, path, steps=args.steps, vacuum_pages=args.vacuum_pages,
+                        vacuum_seconds=args.vacuum_seconds, pause=args.pause, analysis_limit=args.analysis_limit)
+               for label, path in files]
+    if args.json:
+        print(json.dumps({"ts": time.time(), "databases": reports}, sort_keys=True))
+    else:
+        for report in reports:
+            print_report(report)
+    return all(report.get("quick_check", "ok") == "ok" for report in reports)
+
+
+def parse_steps(value):
+    steps = [step.strip() for step in value.split(",") if step.strip()]
+    unknown = set(steps) - set(STEPS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown steps: {', '.join(sorted(unknown))}")
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental vacuum, ANALYZE, quick_check and table statistics")
+    parser.add_argument("--steps", type=parse_steps, default=list(STEPS), help=f"comma separated: {','.join(STEPS)}")
+    parser.add_argument("--vacuum-pages", type=int, default=256, help="pages released per incremental_vacuum pass")
+    parser.add_argument("--vacuum-seconds", type=float, default=2.0, help="time budget for vacuuming each database")
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds writers get between vacuum passes")
+    parser.add_argument("--analysis-limit", type=int, default=1000, help="rows ANALYZE samples per index")
+    parser.add_argument("--enable-auto-vacuum", action="store_true",
+                        help="switch every database to auto_vacuum=INCREMENTAL (full VACUUM, locks each file)")
+    parser.add_argument("--json", action="store_true", help="print one JSON document per run")
+    parser.add_argument("--loop", action="store_true", help="keep running instead of a single pass")
+    parser.add_argument("--interval", type=float, default=86400, help="seconds between passes with --loop")
+    args = parser.parse_args()
+
+    healthy = run_once(args)
+    while args.loop:
+        time.sleep(args.interval)
+        healthy = run_once(args)
+    if not healthy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
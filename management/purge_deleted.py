@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Purge Worker
+Silinmiş (deleted_at dolu) pano/liste/görev/kullanıcı kayıtlarını kalıcı olarak temizler.
+
+Deletes happen in small batches, each in its own transaction, so the SQLite write lock is
+only held for one batch at a time. Rows stay restorable for PURGE_GRACE_SECONDS first.
+
+Usage:
+    python management/purge_deleted.py                       # one pass
+    python management/purge_deleted.py --loop --interval 60  # keep running
+    python management/purge_deleted.py --loop --metrics-port 9101
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from prometheus_client import start_http_server
+
+from api import app, db, purge_tombstones
+
+
+def purge_once(args):
+    with app.app_context():
+        started = time.perf_counter()
+        purged = purge_tombstones(batch_size=args.batch_size, grace_seconds=args.grace)
+        db.session.remove()
+    elapsed = time.perf_counter() - started
+    total = sum(purged.values())
+    if total or args.verbose:
+        details = ', '.join(f"{table}={count}" for table, count in purged.items())
+        print(f"🧹 Purged {total} rows in {elapsed:.2f}s ({details})")
+    return purged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove tombstoned rows in small batches")
+    parser.add_argument("--batch-size", type=int, default=500, help="rows deleted per transaction")
+    parser.add_argument("--grace", type=int, default=None,
+                        help="seconds a tombstone stays restorable (default: PURGE_GRACE_SECONDS)")
+    parser.add_argument("--loop", action="store_true", help="keep running instead of a single pass")
+    parser.add_argument("--interval", type=float, default=60, help="seconds between passes with --loop")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this port")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+
+    purge_once(args)
+    while args.loop:
+        time.sleep(args.interval)
+        purge_once(args)
+
+
+if __name__ == "__main__":
+    main()
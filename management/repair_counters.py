@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Counter Repair
+Liste ve pano sayaç kolonlarını görev tablosundan yeniden hesaplar.
+
+task_count / low_count / medium_count / high_count on lists and list_count / task_count on
+boards are kept up to date by the API. Run this after bulk imports, manual SQL edits or a
+restore from backup to bring them back in line.
+
+Usage:
+    python management/repair_counters.py
+    python management/repair_counters.py --board 12 --board 13
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from api import app, repair_counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute list and board counter columns")
+    parser.add_argument("--board", type=int, action="append", dest="boards",
+                        help="only repair this board (repeatable, default: all boards)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        started = time.perf_counter()
+        fixed = repair_counters(board_ids=args.boards)
+    print(f"✅ Counters repaired in {time.perf_counter() - started:.2f}s: "
+          f"{fixed['lists']} lists, {fixed['boards']} boards were off")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Due-Date Reminder Scheduler
+Teslim tarihi yaklaşan ve geciken görevler için hatırlatma gönderir.
+
+Keeps a min-heap of the next reminder times, loaded from ix_task_model_due (--heap-size per
+stage and database, so loading never scans every dated task), and sleeps until the earliest
+one. When it fires, the databases with due entries get one claim_reminders batch each, sent
+through the REMINDER_SINK (log, smtp or none). A full batch puts its database straight back
+on the heap, so a backlog drains one bounded batch per tick. The heap is reloaded every
+--refresh-seconds (and as soon as it runs dry) to pick up tasks created or edited since.
+
+Claims lease each task, so several schedulers can run side by side without sending a
+reminder twice; a reminder claimed by a scheduler that dies goes out after the lease.
+
+Usage:
+    python management/run_scheduler.py                    # runs until stopped
+    REMINDER_SINK=smtp python management/run_scheduler.py --metrics-port 9104
+    python management/run_scheduler.py --once             # send everything due now and exit
+"""
+
+import argparse
+import heapq
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from prometheus_client import start_http_server
+
+from api import (app, db, dispatch_reminders, each_shard, make_reminder_sink, next_reminder_times, reminder_log,
+                 shard_scope)
+
+
+class Scheduler:
+    def __init__(self, sink, heap_size=1000, refresh_seconds=30.0, batch_size=None):
+        self.sink = sink
+        self.heap_size = heap_size
+        self.refresh_seconds = refresh_seconds
+        self.batch_size = batch_size or app.config["REMINDER_BATCH_SIZE"]
+        self.heap = []  # (fire time, shard key, task id); shard key -1 is the main database
+        self.partial = False  # some database had more upcoming reminders than the heap holds
+        self.stopping = threading.Event()
+        self.claimed = 0
+
+    def dispatch(self, shard, now=None):
+        """One batch for one database; True when it was full (more may be due)"""
+        with app.app_context():
+            try:
+                with shard_scope(shard):
+                    claimed = dispatch_reminders(self.sink, self.batch_size, now=now)
+            finally:
+                db.session.remove()
+        self.claimed += claimed
+        return claimed >= self.batch_size
+
+    def refresh(self, now=None):
+        """Send one batch of what is due in every database, then reload the heap with the next reminder times"""
+        now = now or datetime.utcnow()
+        heap, partial = [], False
+        with app.app_context():
+            shards = each_shard()
+        for shard in shards:
+            key = -1 if shard is None else shard
+            if self.dispatch(shard, now):
+                heap.append((now, key, 0))  # full batch: continue on the next tick
+            with app.app_context():
+                try:
+                    with shard_scope(shard):
+                        upcoming = next_reminder_times(self.heap_size)
+                finally:
+                    db.session.remove()
+            partial = partial or len(upcoming) >= self.heap_size
+            heap += [(fire_at, key, task_id) for fire_at, task_id in upcoming]
+        heapq.heapify(heap)
+        self.heap, self.partial = heap, partial
+
+    def tick(self, now=None):
+        """Dispatch the databases whose earliest heap entries have come due"""
+        now = now or datetime.utcnow()
+        due = set()
+        while self.heap and self.heap[0][0] <= now:
+            due.add(heapq.heappop(self.heap)[1])
+        for key in sorted(due):
+            if self.dispatch(None if key == -1 else key, now):
+                heapq.heappush(self.heap, (now, key, 0))  # full batch: continue on the next tick
+
+    def run(self, once=False):
+        self.refresh()
+        if once:
+            while self.heap and self.heap[0][0] <= datetime.utcnow() and not self.stopping.is_set():
+                self.tick()
+            return self.claimed
+        next_refresh = time.monotonic() + self.refresh_seconds
+        while not self.stopping.is_set():
+            try:
+                if time.monotonic() >= next_refresh or (not self.heap and self.partial):
+                    self.refresh()
+                    next_refresh = time.monotonic() + self.refresh_seconds
+                else:
+                    self.tick()
+            except Exception:
+                reminder_log.exception("Scheduler tick failed")
+            wait = next_refresh - time.monotonic()
+            if self.heap:
+                wait = min(wait, (self.heap[0][0] - datetime.utcnow()).total_seconds())
+            self.stopping.wait(max(0.0, wait))
+        return self.claimed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send due-date reminders for tasks")
+    parser.add_argument("--heap-size", type=int, default=1000,
+                        help="upcoming reminders kept in memory per stage and database")
+    parser.add_argument("--refresh-seconds", type=float, default=30.0,
+                        help="how often the heap is reloaded (latency for newly dated tasks)")
+    parser.add_argument("--batch-size", type=int, default=None, help="reminders claimed per batch "
+                                                                    "(default: REMINDER_BATCH_SIZE)")
+    parser.add_argument("--once", action="store_true", help="send the reminders due now and exit")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this port")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    scheduler = Scheduler(make_reminder_sink(), heap_size=args.heap_size, refresh_seconds=args.refresh_seconds,
+                          batch_size=args.batch_size)
+
+    def stop(signum, frame):
+        print("⏹️  Stopping scheduler")
+        scheduler.stopping.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"⏰ Scheduler running with sink {app.config['REMINDER_SINK']}")
+    claimed = scheduler.run(once=args.once)
+    print(f"✅ Handled {claimed} reminders")
+
+
+if __name__ == "__main__":
+    main()
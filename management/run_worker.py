@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Background Job Worker
+Arka plan işlerini (ör. pano dışa aktarma) kuyruktan alıp çalıştırır.
+
+Polls the job_model table, leases one job at a time per thread (claim_job) and runs it
+(run_job). A heartbeat thread keeps the leases of running jobs alive; jobs of a worker
+that dies are claimed again once their lease runs out. Failed jobs are retried with
+exponential backoff up to JOB_MAX_ATTEMPTS. Claims are atomic, so any number of worker
+processes can run against the same database. Finished jobs older than JOB_RETENTION_HOURS
+are purged every --purge-interval seconds.
+
+SIGTERM / SIGINT stop claiming new jobs and wait for the running ones to finish.
+
+Usage:
+    python management/run_worker.py                        # 2 threads, runs until stopped
+    python management/run_worker.py --threads 4 --metrics-port 9103
+    python management/run_worker.py --once                 # drain the runnable jobs and exit
+"""
+
+import argparse
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from prometheus_client import start_http_server
+
+from api import app, db, claim_job, extend_job_leases, job_log, purge_jobs, run_job
+
+
+class Worker:
+    def __init__(self, threads=2, poll_interval=1.0, lease_seconds=None, purge_interval=3600):
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds or app.config["JOB_LEASE_SECONDS"]
+        self.purge_interval = purge_interval
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self.running = {}  # job id -> worker name, read by the heartbeat
+        self.lock = threading.Lock()
+        self.processed = 0
+
+    def work_once(self, worker):
+        """Claim and run one job; False when nothing was runnable"""
+        with app.app_context():
+            try:
+                job = claim_job(worker, self.lease_seconds)
+                if job is None:
+                    return False
+                with self.lock:
+                    self.running[job.id] = worker
+                try:
+                    run_job(job, worker)
+                finally:
+                    with self.lock:
+                        self.running.pop(job.id, None)
+                        self.processed += 1
+                return True
+            finally:
+                db.session.remove()
+
+    def loop(self, number, once):
+        worker = f"{self.name}:{number}"
+        while not self.stopping.is_set():
+            try:
+                busy = self.work_once(worker)
+            except Exception:
+                job_log.exception("Worker iteration failed", extra={'worker': worker})
+                busy = False
+            if not busy:
+                if once:
+                    return
+                self.stopping.wait(self.poll_interval)
+
+    def heartbeat(self):
+        while not self.stopping.wait(self.lease_seconds / 3):
+            with self.lock:
+                running = dict(self.running)
+            try:
+                with app.app_context():
+                    extend_job_leases(running, self.lease_seconds)
+                    db.session.remove()
+            except Exception:
+                job_log.exception("Lease heartbeat failed", extra={'worker': self.name})
+
+    def purge(self):
+        with app.app_context():
+            removed = purge_jobs()
+            db.session.remove()
+        if removed:
+            print(f"🧹 Purged {removed} finished jobs")
+
+    def run(self, once=False):
+        self.purge()
+        threading.Thread(target=self.heartbeat, daemon=True).start()
+        workers = [threading.Thread(target=self.loop, args=(number, once)) for number in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        last_purge = time.monotonic()
+        while any(thread.is_alive() for thread in workers):
+            for thread in workers:
+                thread.join(timeout=1.0)
+            if not once and time.monotonic() - last_purge >= self.purge_interval:
+                self.purge()
+                last_purge = time.monotonic()
+        self.stopping.set()
+        return self.processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run background jobs from the job queue")
+    parser.add_argument("--threads", type=int, default=2, help="jobs run concurrently by this process")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds an idle thread waits between polls")
+    parser.add_argument("--lease-seconds", type=float, default=None,
+                        help="lease per claim, renewed by the heartbeat (default: JOB_LEASE_SECONDS)")
+    parser.add_argument("--purge-interval", type=float, default=3600, help="seconds between purges of finished jobs")
+    parser.add_argument("--once", action="store_true", help="exit when no job is runnable")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this port")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    worker = Worker(threads=args.threads, poll_interval=args.poll_interval, lease_seconds=args.lease_seconds,
+                    purge_interval=args.purge_interval)
+
+    def stop(signum, frame):
+        print("⏹️  Stopping: finishing running jobs")
+        worker.stopping.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"👷 Worker {worker.name} running {args.threads} threads")
+    processed = worker.run(once=args.once)
+    print(f"✅ Processed {processed} jobs")
+
+
+if __name__ == "__main__":
+    main()
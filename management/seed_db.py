@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dataset Seeder
+Production boyutunda (kullanıcı -> pano -> liste -> görev) sahte veri üretir.
+
+Usage:
+    python management/seed_db.py --users 1000 --boards 1-3 --lists 5 --tasks 10-200
+    DATABASE_URL=sqlite:////tmp/bench.db python management/seed_db.py --users 50000 --tasks 40
+
+Counts accept a fixed value ("5") or an inclusive uniform range ("1-3").
+The same --seed always produces the same rows, so benchmark runs are comparable.
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from werkzeug.security import generate_password_hash
+
+from api import app, db, UserModel, BoardModel, ListModel, TaskModel, repair_counters
+
+DEFAULT_LISTS = ['Backlog', 'To Do', 'In Progress', 'Testing', 'Done']
+WORDS = (
+    "fix add update refactor review deploy test write design migrate api board "
+    "list task user login cache index query page mobile layout theme docs bug "
+    "release client server report export import search filter sync alert"
+).split()
+
+# Seed users are throwaway accounts; a single pbkdf2 round keeps 100k users cheap
+SEED_HASH_METHOD = "pbkdf2:sha256:1"
+
+
+def parse_range(value):
+    """'5' -> (5, 5), '1-3' -> (1, 3)"""
+    low, _, high = value.partition('-')
+    low = int(low)
+    high = int(high) if high else low
+    if low < 0 or high < low:
+        raise argparse.ArgumentTypeError(f"invalid range: {value}")
+    return low, high
+
+
+def parse_weights(value):
+    """'low=1,medium=2,high=1' -> (['low', 'medium', 'high'], [1.0, 2.0, 1.0])"""
+    names, weights = [], []
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        names.append(name.strip())
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+def next_id(model):
+    return (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+
+
+# Column order of the tuples produced by Seeder.run
+COLUMNS = {
+    UserModel.__tablename__: ("id", "name", "email", "name_hash"),
+    BoardModel.__tablename__: ("id", "title", "description", "created_at", "user_id"),
+    ListModel.__tablename__: ("id", "title", "position", "board_id"),
+    TaskModel.__tablename__: ("id", "title", "description", "position", "created_at",
+                              "due_date", "priority", "list_id"),
+}
+TEXT_POOL_SIZE = 4096
+
+
+def sql_datetime(value):
+    """Same text layout SQLAlchemy's sqlite DateTime type stores"""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+class Seeder:
+    """Generates rows table by table and flushes them with chunked executemany inserts"""
+
+    def __init__(self, conn, args):
+        self.conn = conn
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = datetime(2025, 1, 1) if args.fixed_clock else datetime.utcnow()
+        self.priorities, self.priority_weights = parse_weights(args.priorities)
+        self.pending = {}
+        self.counts = {}
+        # Drawing words per row dominates generation time, so rows pick from pre-built pools
+        self.titles = [self.text((2, 8)).capitalize() for _ in range(TEXT_POOL_SIZE)]
+        self.descriptions = [self.text(args.description_words) or None for _ in range(TEXT_POOL_SIZE)]
+
+    def add(self, table, row):
+        rows = self.pending.setdefault(table, [])
+        rows.append(row)
+        if len(rows) >= self.args.chunk_size:
+            self.flush()
+
+    def flush(self):
+        # pending is filled parents-first, so flushing in key order never inserts an orphan
+        for name in self.pending:
+            rows = self.pending[name]
+            if rows:
+                # Rows are plain tuples in COLUMNS order, handed straight to the DBAPI executemany
+                columns = COLUMNS[name]
+                sql = f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+                self.conn.exec_driver_sql(sql, rows)
+                self.counts[name] = self.counts.get(name, 0) + len(rows)
+                rows.clear()
+
+    def text(self, size_range):
+        return ' '.join(self.rng.choices(WORDS, k=self.rng.randint(*size_range)))
+
+    def run(self, ids):
+        args, rng = self.args, self.rng
+        user_id, board_id, list_id, task_id = ids
+
+        pool = TEXT_POOL_SIZE - 1
+        users, boards, lists, tasks = (UserModel.__tablename__, BoardModel.__tablename__,
+                                       ListModel.__tablename__, TaskModel.__tablename__)
+
+        for n in range(args.users):
+            name = f"{args.prefix}{user_id}"
+            self.add(users, (user_id, name, f"{name}@example.com",
+                             generate_password_hash(name, method=SEED_HASH_METHOD)))
+
+            for _ in range(rng.randint(*args.boards)):
+                created = sql_datetime(self.now - timedelta(minutes=rng.randint(0, args.history_days * 1440)))
+                self.add(boards, (board_id, self.text((1, 4)).title(),
+                                  self.descriptions[rng.randint(0, pool)], created, user_id))
+
+                for position in range(1, rng.randint(*args.lists) + 1):
+                    title = DEFAULT_LISTS[position - 1] if position <= len(DEFAULT_LISTS) else f"List {position}"
+                    self.add(lists, (list_id, title, position, board_id))
+
+                    task_count = rng.randint(*args.tasks)
+                    priorities = rng.choices(self.priorities, self.priority_weights, k=task_count)
+                    for task_position in range(1, task_count + 1):
+                        due_date = None
+                        if rng.random() < args.due_ratio:
+                            due_date = sql_datetime(
+                                self.now + timedelta(hours=rng.randint(-args.due_days * 24, args.due_days * 24)))
+                        self.add(tasks, (task_id, self.titles[rng.randint(0, pool)],
+                                         self.descriptions[rng.randint(0, pool)], task_position, created,
+                                         due_date, priorities[task_position - 1], list_id))
+                        task_id += 1
+                    list_id += 1
+                board_id += 1
+            user_id += 1
+
+            if args.verbose and (n + 1) % 1000 == 0:
+                print(f"  ... {n + 1}/{args.users} users generated")
+
+        self.flush()
+        return self.counts
+
+
+def seed_database(args):
+    with app.app_context():
+        if args.reset:
+            db.drop_all()
+            print("Old tables dropped")
+        db.create_all()
+
+        ids = (next_id(UserModel), next_id(BoardModel), next_id(ListModel), next_id(TaskModel))
+        db.session.remove()
+
+        engine = db.engine
+        started = time.perf_counter()
+        with engine.connect() as conn:
+            if engine.dialect.name == 'sqlite':
+                # Pragmas are per connection; the journal mode cannot change inside a transaction
+                conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+                conn.exec_driver_sql("PRAGMA journal_mode=MEMORY")
+                conn.exec_driver_sql("PRAGMA cache_size=-262144")
+                conn.exec_driver_sql("PRAGMA temp_store=MEMORY")
+                conn.commit()
+            # Everything goes in as one transaction
+            with conn.begin():
+                counts = Seeder(conn, args).run(ids)
+            if engine.dialect.name == 'sqlite':
+                conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+                conn.exec_driver_sql("PRAGMA synchronous=FULL")
+                conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+                conn.commit()
+        # Raw inserts leave the counter-cache columns at 0; one grouped pass fills them
+        repair_counters()
+        elapsed = time.perf_counter() - started
+
+        print(f"✅ Seed complete in {elapsed:.1f}s (seed={args.seed})")
+        for table, count in counts.items():
+            print(f"  {table}: {count} rows")
+        return counts
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate a large synthetic kanban dataset")
+    parser.add_argument("--users", type=int, default=100, help="number of users to create")
+    parser.add_argument("--boards", type=parse_range, default=(1, 3), help="boards per user (N or MIN-MAX)")
+    parser.add_argument("--lists", type=parse_range, default=(5, 5), help="lists per board (N or MIN-MAX)")
+    parser.add_argument("--tasks", type=parse_range, default=(0, 40), help="tasks per list (N or MIN-MAX)")
+    parser.add_argument("--priorities", default="low=1,medium=2,high=1", help="priority weights")
+    parser.add_argument("--due-ratio", type=float, default=0.3, help="share of tasks with a due date")
+    parser.add_argument("--due-days", type=int, default=30, help="due dates fall within +/- this many days")
+    parser.add_argument("--history-days", type=int, default=365, help="spread of created_at timestamps")
+    parser.add_argument("--description-words", type=parse_range, default=(0, 30),
+                        help="description size in words (N or MIN-MAX)")
+    parser.add_argument("--prefix", default="seeduser", help="user name prefix (name is also the password)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for reproducible datasets")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="rows per executemany batch")
+    parser.add_argument("--fixed-clock", action="store_true", help="anchor dates to 2025-01-01 instead of now")
+    parser.add_argument("--reset", action="store_true", help="drop all tables before seeding")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    return parser
+
+
+if __name__ == "__main__":
+    seed_database(build_parser().parse_args())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Shard Migration
+Kullanıcıların pano/liste/görev verilerini shard dosyalarına taşır ve yeniden dengeler.
+
+A user's boards, lists and tasks live in the shard named by their UserModel.shard row
+(NULL = the main database). `migrate` moves every user whose shard differs from their hash
+bucket under the current SHARD_COUNT, so the same command first splits an existing database
+and later rebalances after SHARD_COUNT changes; --to-main moves everyone back.
+
+Each user is moved while their source database is write-locked: the rows are copied into
+the target (with new ids; the change log is not copied), the directory row is switched and
+the source rows are deleted. Ids are per shard, so open pages of a moved user reload their
+boards. Rows left behind by an interrupted run are removed at the start of the next one.
+
+Usage:
+    SHARD_COUNT=8 python management/shard_db.py status
+    SHARD_COUNT=8 python management/shard_db.py migrate [--user ID] [--dry-run]
+    python management/shard_db.py migrate --to-main
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path to import api module
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from sqlalchemy import func, insert, select
+
+from api import app, db, UserModel, BoardModel, ListModel, TaskModel, each_shard, shard_engine, shard_for, shard_path
+
+USERS, BOARDS, LISTS, TASKS = (UserModel.__table__, BoardModel.__table__,
+                               ListModel.__table__, TaskModel.__table__)
+
+
+def engine_for(shard):
+    return db.engine if shard is None else shard_engine(shard)
+
+
+def location(shard):
+    return "main" if shard is None else f"shard {shard}"
+
+
+def directory():
+    """(user id, email, shard) of every user, tombstoned ones included"""
+    with db.engine.connect() as main:
+        return main.execute(select(USERS.c.id, USERS.c.email, USERS.c.shard).order_by(USERS.c.id)).all()
+
+
+def copy_user(source, target, user_id):
+    """Copy one user's boards, lists and tasks (live, deleted and archived) under new ids"""
+    board_rows = source.execute(select(BOARDS).where(BOARDS.c.user_id == user_id)).mappings().all()
+    board_ids = {}
+    for row in board_rows:
+        # Change log seqs belong to the source file; the board starts a fresh log in the target
+        values = {key: value for key, value in row.items() if key != 'id'}
+        values['changelog_floor'] = 0
+        board_ids[row['id']] = target.execute(insert(BOARDS).values(values).returning(BOARDS.c.id)).scalar_one()
+
+    list_ids = {}
+    if board_ids:
+        for row in source.execute(select(LISTS).where(LISTS.c.board_id.in_(list(board_ids)))).mappings():
+            values = {key: value for key, value in row.items() if key != 'id'}
+            values['board_id'] = board_ids[row['board_id']]
+            list_ids[row['id']] = target.execute(insert(LISTS).values(values).returning(LISTS.c.id)).scalar_one()
+
+    task_rows = []
+    if list_ids:
+        for row in source.execute(select(TASKS).where(TASKS.c.list_id.in_(list(list_ids)))).mappings():
+            values = {key: value for key, value in row.items() if key != 'id'}
+            values['list_id'] = list_ids[row['list_id']]
+            task_rows.append(values)
+        if task_rows:
+            target.execute(insert(TASKS), task_rows)
+    return {'board_model': len(board_ids), 'list_model': len(list_ids), 'task_model': len(task_rows)}
+
+
+def move_user(user_id, source_shard, target_shard):
+    with engine_for(source_shard).connect() as source, engine_for(target_shard).connect() as target:
+        # Writers of the source database wait until the user is gone from it
+        source.exec_driver_sql("BEGIN IMMEDIATE")
+        copied = copy_user(source, target, user_id)
+        target.commit()
+
+        set_shard = USERS.update().where(USERS.c.id == user_id).values(shard=target_shard)
+        if source_shard is None:
+            # The directory lives in the locked main database: the same commit switches it and deletes the rows
+            source.execute(set_shard)
+        else:
+            with db.engine.begin() as main:
+                main.execute(set_shard)
+        # Lists, tasks and change log entries go with ON DELETE CASCADE
+        source.execute(BOARDS.delete().where(BOARDS.c.user_id == user_id))
+        source.commit()
+    return copied
+
+
+def sweep(placement, dry_run=False):
+    """Delete boards a database holds for users the directory places elsewhere; returns boards removed"""
+    removed = 0
+    for shard in each_shard():
+        with engine_for(shard).begin() as conn:
+            owners = conn.execute(select(BOARDS.c.user_id).distinct()).scalars().all()
+            strays = [user_id for user_id in owners if placement.get(user_id, -1) != shard]
+            if not strays:
+                continue
+            if dry_run:
+                removed += conn.execute(
+                    select(func.count()).select_from(BOARDS).where(BOARDS.c.user_id.in_(strays))).scalar()
+            else:
+                removed += conn.execute(BOARDS.delete().where(BOARDS.c.user_id.in_(strays))).rowcount
+    return removed
+
+
+def migrate(to_main=False, user_ids=None, dry_run=False, verbose=True):
+    """Move users whose shard differs from their target; returns counts of moved users and swept boards"""
+    if not to_main and not app.config["SHARD_COUNT"]:
+        raise SystemExit("SHARD_COUNT is 0: set it to the number of shards, or pass --to-main")
+    with app.app_context():
+        users = directory()
+        swept = sweep({user_id: shard for user_id, _, shard in users}, dry_run)
+        moved = 0
+        for user_id, email, shard in users:
+            target = None if to_main else shard_for(email)
+            if shard == target or (user_ids and user_id not in user_ids):
+                continue
+            moved += 1
+            if dry_run:
+                if verbose:
+                    print(f"  user {user_id}: {location(shard)} -> {location(target)} (dry run)")
+                continue
+            copied = move_user(user_id, shard, target)
+            if verbose:
+                print(f"  user {user_id}: {location(shard)} -> {location(target)} "
+                      f"({copied['board_model']} boards, {copied['list_model']} lists, {copied['task_model']} tasks)")
+    return {'moved': moved, 'swept': swept}
+
+
+def status():
+    with app.app_context():
+        users = directory()
+        for shard in each_shard():
+            with engine_for(shard).connect() as conn:
+                boards = conn.execute(select(func.count()).select_from(BOARDS)).scalar()
+                tasks = conn.execute(select(func.count()).select_from(TASKS)).scalar()
+            path = db.engine.url.database if shard is None else shard_path(shard)
+            size = os.path.getsize(path) if path and os.path.exists(path) else 0
+            placed = sum(1 for _, _, user_shard in users if user_shard == shard)
+            print(f"  {location(shard):>10}: {placed} users, {boards} boards, {tasks} tasks, {size / 1024 / 1024:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move users' board data between the main database and shards")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="users, boards and file size per database")
+    migrate_parser = commands.add_parser("migrate", help="move users to their shard (also rebalances)")
+    migrate_parser.add_argument("--user", type=int, action="append", dest="users",
+                                help="only move this user (repeatable, default: every misplaced user)")
+    migrate_parser.add_argument("--to-main", action="store_true", help="move everyone back to the main database")
+    migrate_parser.add_argument("--dry-run", action="store_true", help="only report what would move")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        status()
+        return
+    started = time.perf_counter()
+    result = migrate(to_main=args.to_main, user_ids=args.users, dry_run=args.dry_run)
+    verb = "Would move" if args.dry_run else "Moved"
+    print(f"✅ {verb} {result['moved']} users in {time.perf_counter() - started:.2f}s "
+          f"({result['swept']} leftover boards {'found' if args.dry_run else 'removed'})")
+
+
+if __name__ == "__main__":
+    main()
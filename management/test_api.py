@@ -1,12 +1,16 @@
 import pytest
 import json
+import logging
 import os
 import tempfile
 import sys
+import time
+from datetime import datetime, timedelta
 
 # Add parent directory to path to import from api.py
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import api
 from api import app, db, UserModel
 
 @pytest.fixture
@@ -15,6 +19,12 @@ def client():
     app.config['TESTING'] = True
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     app.config['WTF_CSRF_ENABLED'] = False
+    # Suites create far more data than a real client would; TestRateLimit sets its own limits
+    app.config['RATE_LIMIT_AUTH'] = app.config['RATE_LIMIT_WRITE'] = '100000/60'
+    if api.rate_limiter is not None:
+        api.rate_limiter.reset()
+    if api.idempotency_store is not None:
+        api.idempotency_store.clear()
     
     with app.test_client() as client:
         with app.app_context():
@@ -22,6 +32,30 @@ def client():
             yield client
             db.session.remove()
             db.drop_all()
+    if api.board_cache is not None:
+        api.board_cache.clear()
+
+@pytest.fixture
+def auth_client(client, sample_user_data):
+    """Test client with a logged-in user"""
+    user = UserModel(email=sample_user_data['email'])
+    user.set_name_as_password(sample_user_data['name'])
+    db.session.add(user)
+    db.session.commit()
+    with client.session_transaction() as sess:
+        sess['user_id'] = user.id
+    client.user_id = user.id
+    return client
+
+def create_board(client, lists=('Backlog', 'To Do', 'Done'), tasks_per_list=2):
+    """Create a board with lists and tasks through the API, returns the board id"""
+    board = client.post('/api/boards/', json={'title': 'Board', 'user_id': 0}).get_json()
+    for position, title in enumerate(lists, start=1):
+        list_item = client.post('/api/lists/', json={'title': title, 'position': position,
+                                                      'board_id': board['id']}).get_json()
+        for n in range(tasks_per_list):
+            client.post('/api/tasks/', json={'title': f'{title} task {n}', 'list_id': list_item['id']})
+    return board['id']
 
 @pytest.fixture
 def sample_user_data():
@@ -179,4 +213,1095 @@ class TestWebRoutes:
     def test_unsuccess_page(self, client):
         """Test unsuccess page"""
         response = client.get('/unsuccess')
-        assert response.status_code == 200
\ No newline at end of file
+        assert response.status_code == 200
+
+
+class TestSeedDb:
+    """Test cases for the synthetic dataset seeder"""
+
+    def seed(self, *argv):
+        import seed_db
+        args = seed_db.build_parser().parse_args(['--fixed-clock', *argv])
+        return seed_db.seed_database(args)
+
+    def test_seed_counts(self, client):
+        """Test seeding the requested number of rows"""
+        counts = self.seed('--users', '3', '--boards', '2', '--lists', '5', '--tasks', '4')
+        assert counts['user_model'] == 3
+        assert counts['board_model'] == 6
+        assert counts['list_model'] == 30
+        assert counts['task_model'] == 120
+
+        response = client.post('/api/login',
+                               data=json.dumps({'email': 'seeduser1@example.com', 'name': 'seeduser1'}),
+                               content_type='application/json')
+        assert response.status_code == 200
+
+    def test_seed_is_deterministic(self, client):
+        """Test that the same seed produces the same dataset"""
+        from api import TaskModel
+        self.seed('--users', '2', '--tasks', '0-10', '--seed', '7', '--reset')
+        first = [(t.title, t.priority, t.due_date) for t in TaskModel.query.order_by(TaskModel.id)]
+        self.seed('--users', '2', '--tasks', '0-10', '--seed', '7', '--reset')
+        second = [(t.title, t.priority, t.due_date) for t in TaskModel.query.order_by(TaskModel.id)]
+        assert first and first == second
+
+
+class TestSqlInstrumentation:
+    """Test cases for per-request SQL instrumentation"""
+
+    def test_server_timing_header(self, client, sample_user_data, monkeypatch):
+        """Test that query count and timings are reported when enabled"""
+        monkeypatch.setitem(app.config, 'SQL_INSTRUMENTATION', True)
+        client.post('/api/users/', data=json.dumps(sample_user_data), content_type='application/json')
+        response = client.get('/api/users/')
+        timing = response.headers.get('Server-Timing')
+        assert timing is not None
+        assert 'desc="1 queries"' in timing
+        for metric in ('db;dur=', 'serialize;dur=', 'handler;dur=', 'total;dur='):
+            assert metric in timing
+
+    def test_board_list_query_count_is_flat(self, auth_client, monkeypatch):
+        """Test that listing boards takes the same number of queries for one board or several"""
+        monkeypatch.setitem(app.config, 'SQL_INSTRUMENTATION', True)
+
+        def queries():
+            timing = auth_client.get('/api/boards/').headers['Server-Timing']
+            return timing.split('desc="', 1)[1].split(' ', 1)[0]
+
+        create_board(auth_client)
+        one = queries()
+        create_board(auth_client)
+        create_board(auth_client)
+        assert queries() == one
+
+    def test_failed_statements_leave_no_state(self, client, monkeypatch):
+        """Test that statements which raise do not leave timing state on the pooled connection"""
+        monkeypatch.setitem(app.config, 'SQL_INSTRUMENTATION', True)
+        api.install_sql_listeners(db.engine)
+        with db.engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    conn.exec_driver_sql("SELECT * FROM no_such_table")
+            assert conn.exec_driver_sql("SELECT 1").scalar() == 1
+            assert 'query_started' not in conn.info
+
+    def test_server_timing_disabled(self, client, monkeypatch):
+        """Test that no header is added when instrumentation is off"""
+        monkeypatch.setitem(app.config, 'SQL_INSTRUMENTATION', False)
+        response = client.get('/api/users/')
+        assert 'Server-Timing' not in response.headers
+
+
+class TestMetrics:
+    """Test cases for the Prometheus /metrics endpoint"""
+
+    def test_metrics_exposed(self, client, sample_user_data):
+        """Test that request, hash and commit metrics are scrapeable"""
+        client.post('/api/users/', data=json.dumps(sample_user_data), content_type='application/json')
+        client.get('/this-page-does-not-exist')
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        body = response.data.decode()
+        assert 'kanban_http_requests_total{endpoint="users",method="POST",status="201"}' in body
+        assert 'kanban_http_request_duration_seconds_bucket{endpoint="users"' in body
+        assert 'kanban_password_hash_duration_seconds_count{operation="hash"}' in body
+        assert 'kanban_db_commit_duration_seconds_count' in body
+        assert 'kanban_handler_errors_total{handler="not_found"}' in body
+        assert 'kanban_db_pool_checked_out' in body
+
+
+class TestSlowLog:
+    """Test cases for the slow query / slow request log"""
+
+    def test_slow_query_logged_with_plan(self, client, sample_user_data, monkeypatch, tmp_path):
+        """Test that slow statements are written with redacted params and a query plan"""
+        from api import slow_log
+        log_file = tmp_path / 'slow.log'
+        monkeypatch.setitem(app.config, 'SLOW_LOG_FILE', str(log_file))
+        monkeypatch.setattr(slow_log, 'handler', None)
+        monkeypatch.setitem(app.config, 'SLOW_QUERY_MS', 0.000001)
+        monkeypatch.setitem(app.config, 'SLOW_REQUEST_MS', 0.000001)
+
+        client.post('/api/users/', data=json.dumps(sample_user_data), content_type='application/json')
+        client.post('/api/login', data=json.dumps(sample_user_data), content_type='application/json')
+        slow_log.queue.join()
+        slow_log.logger.removeHandler(slow_log.handler)
+        slow_log.handler.close()
+        records = [json.loads(line) for line in log_file.read_text().splitlines()]
+
+        queries = [r for r in records if r['type'] == 'slow_query' and r['endpoint'] == 'login']
+        assert queries and queries[0]['sql'].startswith('SELECT')
+        assert 'USING INDEX' in queries[0]['plan'][0]
+        assert sample_user_data['email'] not in json.dumps(records)
+        assert any(r['type'] == 'slow_request' and r['endpoint'] == 'login' for r in records)
+
+    def test_worker_survives_failures(self, client, monkeypatch, tmp_path):
+        """Test that a failed pool checkout or log write does not stop the slow-log thread"""
+        from api import slow_log
+
+        class BrokenEngine:
+            class dialect:
+                name = 'sqlite'
+
+            def raw_connection(self):
+                raise TimeoutError("QueuePool limit reached")
+
+        assert api.explain_query_plan(BrokenEngine(), "SELECT 1", ()).startswith('unavailable')
+        log_file = tmp_path / 'slow.log'
+        monkeypatch.setitem(app.config, 'SLOW_LOG_FILE', str(tmp_path / 'unused.log'))
+        monkeypatch.setattr(slow_log, 'handler', None)
+        slow_log.start()
+        handler = logging.FileHandler(log_file)
+        slow_log.logger.addHandler(handler)
+        monkeypatch.setattr(api, 'explain_query_plan', lambda *args: 1 / 0)
+        slow_log._put({"type": "slow_query", "_explain": (None, "SELECT 1", ())})
+        slow_log._put({"type": "slow_request"})
+        slow_log.queue.join()
+        for attached in (handler, slow_log.handler):
+            if attached is not None:
+                slow_log.logger.removeHandler(attached)
+                attached.close()
+        assert slow_log.thread.is_alive()
+        assert [json.loads(line)['type'] for line in log_file.read_text().splitlines()] == ['slow_request']
+
+
+class TestCascadeDelete:
+    """Test cases for database-level ON DELETE CASCADE"""
+
+    def test_board_purge_cascades_without_loading_children(self, auth_client):
+        """Test that purging a deleted board removes its lists and tasks in the database"""
+        from api import ListModel, TaskModel, purge_tombstones
+        from sqlalchemy import event
+        board_id = create_board(auth_client, tasks_per_list=3)
+        assert TaskModel.query.count() == 9
+        db.session.remove()
+
+        loaded = []
+        listener = lambda target, context: loaded.append(target)
+        event.listen(db.Model, 'load', listener, propagate=True)
+        try:
+            response = auth_client.delete(f'/api/boards/{board_id}')
+            purged = purge_tombstones(batch_size=2, grace_seconds=0)
+        finally:
+            event.remove(db.Model, 'load', listener)
+        assert response.status_code == 204
+        assert purged == {'task_model': 9, 'list_model': 3, 'board_model': 1, 'user_model': 0}
+        assert not [obj for obj in loaded if isinstance(obj, (ListModel, TaskModel))]
+        assert ListModel.query.execution_options(include_deleted=True).count() == 0
+        assert TaskModel.query.execution_options(include_deleted=True).count() == 0
+
+    def test_user_delete_cascades(self, auth_client):
+        """Test that deleting a user removes the whole board tree"""
+        from api import BoardModel, TaskModel, purge_tombstones
+        create_board(auth_client)
+        response = auth_client.delete(f'/api/users/{auth_client.user_id}')
+        assert response.status_code == 204
+        assert BoardModel.query.count() == 0
+        assert auth_client.get(f'/api/users/{auth_client.user_id}').status_code == 404
+
+        purge_tombstones(grace_seconds=0)
+        assert BoardModel.query.execution_options(include_deleted=True).count() == 0
+        assert TaskModel.query.execution_options(include_deleted=True).count() == 0
+
+
+class TestSoftDelete:
+    """Test cases for tombstone deletes, restore and the purge worker"""
+
+    def test_deleted_task_hidden_and_restorable(self, auth_client):
+        """Test that a deleted task disappears from the board until restored"""
+        board_id = create_board(auth_client, lists=('To Do',), tasks_per_list=2)
+        task_id = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['tasks'][0]['id']
+
+        assert auth_client.delete(f'/api/tasks/{task_id}').status_code == 204
+        tasks = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['tasks']
+        assert task_id not in [task['id'] for task in tasks]
+        assert auth_client.patch(f'/api/tasks/{task_id}', json={'title': 'x'}).status_code == 404
+
+        response = auth_client.post(f'/api/tasks/{task_id}/restore')
+        assert response.status_code == 200
+        tasks = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['tasks']
+        assert task_id in [task['id'] for task in tasks]
+
+    def test_board_delete_and_restore(self, auth_client):
+        """Test that a deleted board is excluded from listings and can be restored"""
+        board_id = create_board(auth_client)
+        auth_client.delete(f'/api/boards/{board_id}')
+        assert auth_client.get('/api/boards/').get_json() == []
+        assert auth_client.get(f'/api/boards/{board_id}').status_code == 404
+
+        response = auth_client.post(f'/api/boards/{board_id}/restore')
+        assert response.status_code == 200
+        assert len(response.get_json()['lists']) == 3
+
+    def test_deleted_user_email_stays_reserved(self, auth_client, sample_user_data):
+        """Test that re-registering a deleted account's email is refused with a proper message"""
+        auth_client.delete(f'/api/users/{auth_client.user_id}')
+        form = {'name': 'someone else', 'email': sample_user_data['email']}
+        response = auth_client.post('/register', data=form)
+        assert response.status_code == 302 and response.headers['Location'].endswith('/unsuccess')
+        with auth_client.session_transaction() as sess:
+            assert 'was deleted' in sess['_flashes'][0][1]
+
+        response = auth_client.post('/api/signup', json=form)
+        assert response.status_code == 400 and 'deleted account' in response.get_json()['message']
+        assert auth_client.post('/api/users/', json=form).status_code == 400
+
+    def test_purge_respects_grace_period(self, auth_client):
+        """Test that tombstones inside the grace window are kept"""
+        from api import purge_tombstones
+        board_id = create_board(auth_client)
+        auth_client.delete(f'/api/boards/{board_id}')
+        assert sum(purge_tombstones(grace_seconds=3600).values()) == 0
+        assert auth_client.post(f'/api/boards/{board_id}/restore').status_code == 200
+
+
+class TestArchive:
+    """Test cases for the Done-task archive tier"""
+
+    def test_archived_tasks_leave_board_payload(self, auth_client):
+        """Test that archived Done tasks are only served by the archive endpoint"""
+        from api import archive_done_tasks
+        board_id = create_board(auth_client, lists=('To Do', 'Done'), tasks_per_list=2)
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        todo, done = board['lists']
+
+        assert archive_done_tasks(older_than_days=1) == 0
+        assert archive_done_tasks(older_than_days=0) == 2
+
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        assert board['lists'][1]['tasks'] == []
+        assert len(board['lists'][0]['tasks']) == 2
+
+        archive = auth_client.get(f'/api/boards/{board_id}/archive?per_page=1').get_json()
+        assert archive['total'] == 2 and archive['pages'] == 2
+        assert archive['tasks'][0]['archived_at'] is not None
+
+        # Moving an archived task out of Done makes it hot again
+        task_id = archive['tasks'][0]['id']
+        auth_client.patch(f'/api/tasks/{task_id}', json={'list_id': todo['id']})
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        assert task_id in [task['id'] for task in board['lists'][0]['tasks']]
+
+
+class TestTaskPages:
+    """Test cases for per-list task pagination"""
+
+    def test_board_carries_first_page_and_cursor(self, auth_client, monkeypatch):
+        """Test that board payloads are capped per list and the rest pages in order"""
+        monkeypatch.setitem(app.config, 'TASKS_PAGE_SIZE', 2)
+        board_id = create_board(auth_client, lists=('Backlog', 'Done'), tasks_per_list=5)
+        backlog, done = auth_client.get(f'/api/boards/{board_id}').get_json()['lists']
+        assert [len(backlog['tasks']), backlog['task_count']] == [2, 5]
+        assert done['task_count'] == 5
+
+        auth_client.delete(f"/api/tasks/{backlog['tasks'][0]['id']}")
+        backlog = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]
+        assert backlog['task_count'] == 4
+
+        titles = [task['title'] for task in backlog['tasks']]
+        cursor = backlog['next_cursor']
+        while cursor:
+            page = auth_client.get(f"/api/lists/{backlog['id']}/tasks?after={cursor}").get_json()
+            titles += [task['title'] for task in page['tasks']]
+            cursor = page['next_cursor']
+        assert titles == [f'Backlog task {n}' for n in range(1, 5)]
+
+    def test_invalid_cursor(self, auth_client):
+        """Test that a malformed cursor is rejected"""
+        board_id = create_board(auth_client, lists=('Backlog',), tasks_per_list=1)
+        list_id = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['id']
+        assert auth_client.get(f'/api/lists/{list_id}/tasks?after=oops').status_code == 400
+
+
+def counters(client, board_id):
+    """Board payload plus (total, low, medium, high) task counters per list"""
+    board = client.get(f'/api/boards/{board_id}').get_json()
+    return board, [(item['task_count'], item['low_count'], item['medium_count'], item['high_count'])
+                   for item in board['lists']]
+
+
+class TestCounters:
+    """Test cases for the list/board counter-cache columns"""
+
+    def test_counters_follow_task_changes(self, auth_client):
+        """Test that create, move, priority change, delete, restore and archive keep counters exact"""
+        from api import archive_done_tasks
+        board_id = create_board(auth_client, lists=('To Do', 'Done'), tasks_per_list=2)
+        board, lists = counters(auth_client, board_id)
+        assert (board['list_count'], board['task_count']) == (2, 4)
+        assert lists == [(2, 0, 2, 0), (2, 0, 2, 0)]
+
+        todo, done = board['lists']
+        task_id = todo['tasks'][0]['id']
+        auth_client.patch(f'/api/tasks/{task_id}', json={'list_id': done['id'], 'priority': 'high'})
+        assert counters(auth_client, board_id)[1] == [(1, 0, 1, 0), (3, 0, 2, 1)]
+
+        auth_client.delete(f'/api/tasks/{task_id}')
+        board, lists = counters(auth_client, board_id)
+        assert board['task_count'] == 3 and lists[1] == (2, 0, 2, 0)
+        auth_client.post(f'/api/tasks/{task_id}/restore')
+        assert counters(auth_client, board_id)[1][1] == (3, 0, 2, 1)
+
+        archive_done_tasks(older_than_days=0)
+        board, lists = counters(auth_client, board_id)
+        assert board['task_count'] == 1 and lists[1] == (0, 0, 0, 0)
+
+    def test_list_delete_and_repair(self, auth_client):
+        """Test that list deletes adjust the board and repair_counters fixes drift"""
+        from api import repair_counters, ListModel
+        board_id = create_board(auth_client, lists=('To Do', 'Extra'), tasks_per_list=3)
+        extra_id = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][1]['id']
+        auth_client.delete(f'/api/lists/{extra_id}')
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        assert (board['list_count'], board['task_count']) == (1, 3)
+
+        assert repair_counters() == {'lists': 0, 'boards': 0}
+        ListModel.query.update({'task_count': 99, 'high_count': 5})
+        db.session.commit()
+        assert repair_counters() == {'lists': 2, 'boards': 0}
+        assert counters(auth_client, board_id)[1] == [(3, 0, 3, 0)]
+
+        auth_client.post(f'/api/lists/{extra_id}/restore')
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        assert (board['list_count'], board['task_count']) == (2, 6)
+
+
+class TestBoardSnapshotCache:
+    """Test cases for the serialized board snapshot cache"""
+
+    def lookups(self, result):
+        from prometheus_client import REGISTRY
+        return REGISTRY.get_sample_value('kanban_board_cache_lookups_total', {'result': result}) or 0
+
+    def test_hit_until_revision_moves(self, auth_client, monkeypatch):
+        """Test that repeated reads are hits and any task change invalidates the snapshot"""
+        monkeypatch.setattr(api, 'board_cache', api.MemorySnapshotCache(1024 * 1024))
+        board_id = create_board(auth_client, lists=('To Do',), tasks_per_list=1)
+        first = auth_client.get(f'/api/boards/{board_id}')
+        hits = self.lookups('hit')
+        assert auth_client.get(f'/api/boards/{board_id}').data == first.data
+        assert self.lookups('hit') == hits + 1
+
+        task_id = first.get_json()['lists'][0]['tasks'][0]['id']
+        auth_client.patch(f'/api/tasks/{task_id}', json={'title': 'Renamed'})
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        assert board['lists'][0]['tasks'][0]['title'] == 'Renamed'
+        assert self.lookups('hit') == hits + 1
+
+    def test_memory_lru_by_bytes(self):
+        """Test that the memory backend evicts least recently used boards over its budget"""
+        cache = api.MemorySnapshotCache(10)
+        cache.put(1, 'a', b'12345')
+        cache.put(2, 'a', b'12345')
+        assert cache.get(1, 'a') == b'12345'
+        cache.put(3, 'a', b'123')
+        assert cache.get(2, 'a') is None and cache.get(1, 'a') and cache.get(3, 'a')
+        assert cache.get(1, 'b') is None and cache.size == 8
+
+    def test_sqlite_backend_shared(self, tmp_path):
+        """Test that two sqlite cache instances on one file share and evict entries"""
+        path = str(tmp_path / 'cache.db')
+        writer, reader = api.SqliteSnapshotCache(10, path), api.SqliteSnapshotCache(10, path)
+        writer.put(1, 'a', b'12345')
+        assert reader.get(1, 'a') == b'12345'
+        reader.put(2, 'a', b'123456')
+        assert writer.get(1, 'a') is None and writer.get(2, 'a') == b'123456'
+
+
+class TestCompression:
+    """Test cases for Accept-Encoding negotiation and precompressed snapshots"""
+
+    def test_board_gzip_precompressed(self, auth_client, monkeypatch):
+        """Test that large boards are gzipped once per revision and served from the cache"""
+        import gzip
+        monkeypatch.setattr(api, 'board_cache', api.MemorySnapshotCache(1024 * 1024))
+        monkeypatch.setitem(app.config, 'COMPRESS_ALGORITHMS', ['gzip'])
+        board_id = create_board(auth_client, lists=('To Do', 'Done'), tasks_per_list=20)
+        plain = auth_client.get(f'/api/boards/{board_id}')
+        assert 'Content-Encoding' not in plain.headers
+
+        first = auth_client.get(f'/api/boards/{board_id}', headers={'Accept-Encoding': 'gzip, deflate'})
+        second = auth_client.get(f'/api/boards/{board_id}', headers={'Accept-Encoding': 'gzip'})
+        assert first.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in first.headers['Vary']
+        assert gzip.decompress(first.data) == plain.data
+        assert second.data == first.data and len(first.data) < len(plain.data)
+        assert api.board_cache.entries[f'{board_id}:gzip'][1] == first.data
+
+    def test_small_responses_stay_identity(self, client, monkeypatch):
+        """Test that bodies under COMPRESS_MIN_SIZE are not compressed"""
+        monkeypatch.setitem(app.config, 'COMPRESS_MIN_SIZE', 10 ** 6)
+        response = client.get('/api/users/', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+        monkeypatch.setitem(app.config, 'COMPRESS_MIN_SIZE', 0)
+        response = client.get('/api/users/', headers={'Accept-Encoding': 'gzip;q=0'})
+        assert 'Content-Encoding' not in response.headers
+
+
+class TestKanbanBootstrap:
+    """Test cases for the board embedded in the /kanban page"""
+
+    def test_board_embedded_and_escaped(self, auth_client):
+        """Test that the first board is inlined as JSON that cannot break out of its script tag"""
+        board_id = create_board(auth_client, lists=('To Do',), tasks_per_list=0)
+        list_id = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['id']
+        auth_client.post('/api/tasks/', json={'title': '</script><b>&', 'list_id': list_id})
+
+        html = auth_client.get('/kanban').get_data(as_text=True)
+        start = html.index('<script id="initialBoard" type="application/json">')
+        payload = html[start:].split('>', 1)[1].split('</script>', 1)[0]
+        board = json.loads(payload)
+        assert board['id'] == board_id
+        assert board['lists'][0]['tasks'][0]['title'] == '</script><b>&'
+        assert board == auth_client.get(f'/api/boards/{board_id}').get_json()
+
+    def test_no_board_falls_back_to_api(self, auth_client):
+        """Test that users without boards get the page without embedded state"""
+        assert 'id="initialBoard"' not in auth_client.get('/kanban').get_data(as_text=True)
+
+    def test_deleted_user_is_signed_out(self, auth_client):
+        """Test that a session whose user was deleted is sent back to sign in"""
+        assert auth_client.delete(f'/api/users/{auth_client.user_id}').status_code == 204
+        response = auth_client.get('/kanban')
+        assert response.status_code == 302 and response.headers['Location'].endswith('/signin')
+        with auth_client.session_transaction() as sess:
+            assert 'user_id' not in sess
+
+
+class TestStaticAssets:
+    """Test cases for fingerprinted static bundles"""
+
+    def test_asset_url_and_cache_headers(self, client, monkeypatch, tmp_path):
+        """Test that pages link built bundles when a manifest exists and dist/ is cached immutably"""
+        monkeypatch.setattr(api, 'ASSET_MANIFEST', str(tmp_path / 'manifest.json'))
+        with app.test_request_context():
+            assert api.asset_url('src/kanban.js') == '/static/src/kanban.js'
+        (tmp_path / 'manifest.json').write_text(json.dumps({'src/kanban.js': 'dist/kanban.0123456789.js'}))
+        with app.test_request_context():
+            assert api.asset_url('src/kanban.js') == '/static/dist/kanban.0123456789.js'
+
+        assert 'immutable' not in client.get('/static/src/homepage.js').headers.get('Cache-Control', '')
+        dist = os.path.join(app.static_folder, 'dist')
+        os.makedirs(dist, exist_ok=True)
+        bundle = os.path.join(dist, 'test.0000000000.js')
+        with open(bundle, 'w') as handle:
+            handle.write('var x = 1;\n')
+        try:
+            cache_control = client.get('/static/dist/test.0000000000.js').headers['Cache-Control']
+        finally:
+            os.remove(bundle)
+        assert 'immutable' in cache_control and 'max-age=31536000' in cache_control
+
+    def test_minifier_keeps_literals(self):
+        """Test that comments go while strings, templates and regexes survive untouched"""
+        from build_assets import Minifier
+        source = "const a = '// x'; // gone\n/* gone */ const r = /\\/*/g;\nconst t = `  keep\n  ${a} // kept`;\n"
+        lines = [text for text, _, _ in Minifier(source, js=True).run()]
+        assert lines == ["const a = '// x';", "const r = /\\/*/g;", "const t = `  keep", "  ${a} // kept`;"]
+
+
+class TestRenderedPages:
+    """Test cases for pages rendered once and served from memory"""
+
+    def test_homepage_etag(self, client):
+        """Test that the homepage carries an ETag and revalidates to 304"""
+        first = client.get('/')
+        assert first.status_code == 200 and first.headers['Cache-Control'] == 'public, max-age=300'
+        again = client.get('/', headers={'If-None-Match': first.headers['ETag']})
+        assert again.status_code == 304
+
+    def test_compressed_etag_is_distinct(self, client):
+        """Test that a compressed page gets its own ETag and still revalidates to 304"""
+        plain = client.get('/')
+        compressed = client.get('/', headers={'Accept-Encoding': 'gzip'})
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert compressed.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+        again = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': compressed.headers['ETag']})
+        assert again.status_code == 304 and again.headers['ETag'] == compressed.headers['ETag']
+
+    def test_404_variants(self, auth_client):
+        """Test that the cached 404 page still follows the login state and shows matched endpoints"""
+        logged_in = auth_client.get('/missing-page')
+        assert logged_in.status_code == 404 and b'/kanban' in logged_in.data
+        with auth_client.session_transaction() as sess:
+            sess.clear()
+        anonymous = auth_client.get('/missing-page')
+        assert anonymous.status_code == 404 and anonymous.data != logged_in.data
+        assert b'test_404' in auth_client.get('/test-404').data
+
+
+class TestRateLimit:
+    """Test cases for the token-bucket rate limiter"""
+
+    def test_login_limited_per_ip(self, client, monkeypatch):
+        """Test that repeated logins get 429 with Retry-After while other clients still pass"""
+        monkeypatch.setitem(app.config, 'RATE_LIMIT_AUTH', '3/60')
+        payload = {'email': 'nobody@example.com', 'name': 'wrong'}
+        statuses = [client.post('/api/login', json=payload).status_code for _ in range(3)]
+        assert 429 not in statuses
+        limited = client.post('/api/login', json=payload)
+        assert limited.status_code == 429 and int(limited.headers['Retry-After']) >= 1
+        other = client.post('/api/login', json=payload, environ_base={'REMOTE_ADDR': '10.0.0.2'})
+        assert other.status_code != 429
+
+    def test_writes_limited_per_user(self, auth_client, monkeypatch):
+        """Test that API writes share one bucket per user while reads are not limited"""
+        monkeypatch.setitem(app.config, 'RATE_LIMIT_WRITE', '2/60')
+        for _ in range(2):
+            assert auth_client.post('/api/boards/', json={'title': 'Board', 'user_id': 0}).status_code == 201
+        response = auth_client.post('/api/boards/', json={'title': 'Board', 'user_id': 0})
+        assert response.status_code == 429 and response.get_json()['error'] == 'Too many requests'
+        assert auth_client.get('/api/boards/').status_code == 200
+
+    def test_memory_eviction_keeps_drained_buckets(self, monkeypatch):
+        """Test that a full memory limiter evicts the idlest bucket instead of refilling everyone"""
+        limiter = api.MemoryRateLimiter()
+        monkeypatch.setattr(limiter, 'MAX_BUCKETS', 3)
+        limiter.take('idle', 1, 0.001)
+        limiter.take('victim', 1, 0.001)
+        assert limiter.take('victim', 1, 0.001) > 0
+        for key in ('flood-1', 'flood-2'):
+            limiter.take(key, 1, 0.001)
+        assert list(limiter.buckets) == ['victim', 'flood-1', 'flood-2']
+        assert limiter.take('victim', 1, 0.001) > 0
+
+    def test_sqlite_backend(self, tmp_path):
+        """Test that the shared SQLite buckets refill over time"""
+        limiter = api.SqliteRateLimiter(str(tmp_path / 'rate_limit.db'))
+        assert limiter.take('k', 2, 1000) == 0 and limiter.take('k', 2, 1000) == 0
+        assert 0 < limiter.take('k', 2, 0.5) <= 2
+        time.sleep(0.01)
+        assert limiter.take('k', 2, 1000) == 0
+
+
+class TestLogging:
+    """Test cases for the structured, queue-based application log"""
+
+    def drain(self, records):
+        entries = []
+        while not records.empty():
+            entries.append(json.loads(api.JsonFormatter().format(records.get_nowait())))
+        return entries
+
+    def test_request_id_echoed(self, client):
+        """Test that a proxy request id is reused and a missing one is generated"""
+        assert client.get('/', headers={'X-Request-ID': 'abc-123'}).headers['X-Request-ID'] == 'abc-123'
+        generated = client.get('/', headers={'X-Request-ID': 'bad id;drop'}).headers['X-Request-ID']
+        assert generated != 'bad id;drop' and len(generated) == 32
+
+    def test_signin_log_redacted(self, client, monkeypatch):
+        """Test that sign-in records are JSON with a request id and never carry the credential"""
+        import queue
+        records = queue.Queue()
+        monkeypatch.setattr(api.log_handler, 'queue', records)
+        client.post('/signin', data={'email': 'alice@example.com', 'password': 'SecretName'},
+                    headers={'X-Request-ID': 'req-1'})
+        entries = self.drain(records)
+        assert entries and entries[0]['reason'] == 'unknown_email'
+        assert entries[0]['request_id'] == 'req-1' and entries[0]['email'] == 'a***@example.com'
+        assert 'SecretName' not in json.dumps(entries) and 'alice@' not in json.dumps(entries)
+
+    def test_full_queue_drops(self, monkeypatch):
+        """Test that logging never blocks when the writer falls behind"""
+        import queue
+        monkeypatch.setattr(api.log_handler, 'queue', queue.Queue(maxsize=1))
+        for _ in range(3):
+            api.log.warning("flood", extra={'password': 'x'})
+        assert api.log_handler.queue.qsize() == 1
+        assert self.drain(api.log_handler.queue)[0]['password'] == '<redacted>'
+
+
+class TestReorder:
+    """Test cases for the bulk reorder endpoints"""
+
+    def task_ids(self, client, list_id):
+        return [task['id'] for task in client.get(f'/api/lists/{list_id}/tasks').get_json()['tasks']]
+
+    def test_task_order(self, auth_client):
+        """Test that a full order is applied and a partial one keeps the rest after it"""
+        board_id = create_board(auth_client, lists=('Backlog',), tasks_per_list=4)
+        list_id = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['id']
+        ids = self.task_ids(auth_client, list_id)
+        assert auth_client.put(f'/api/lists/{list_id}/order', json={'task_ids': ids[::-1]}).status_code == 200
+        assert self.task_ids(auth_client, list_id) == ids[::-1]
+        auth_client.put(f'/api/lists/{list_id}/order', json={'task_ids': [ids[1]]})
+        assert self.task_ids(auth_client, list_id) == [ids[1], ids[3], ids[2], ids[0]]
+        positions = [task['position'] for task in auth_client.get(f'/api/lists/{list_id}/tasks').get_json()['tasks']]
+        assert positions == [1, 2, 3, 4]
+
+    def test_order_invalidates_snapshot(self, auth_client):
+        """Test that a reorder gives the board a new revision, so cached payloads refresh"""
+        board_id = create_board(auth_client, lists=('Backlog', 'Done'))
+        lists = auth_client.get(f'/api/boards/{board_id}').get_json()['lists']
+        order = [lists[1]['id'], lists[0]['id']]
+        assert auth_client.put(f'/api/boards/{board_id}/order', json={'list_ids': order}).status_code == 200
+        assert [item['id'] for item in auth_client.get(f'/api/boards/{board_id}').get_json()['lists']] == order
+
+    def test_order_rejects_foreign_ids(self, auth_client):
+        """Test that ids from another list, duplicates and other users' lists are refused"""
+        board_id = create_board(auth_client, lists=('Backlog', 'Done'))
+        lists = auth_client.get(f'/api/boards/{board_id}').get_json()['lists']
+        other_task = lists[1]['tasks'][0]['id']
+        own_task = lists[0]['tasks'][0]['id']
+        url = f"/api/lists/{lists[0]['id']}/order"
+        assert auth_client.put(url, json={'task_ids': [other_task]}).status_code == 400
+        assert auth_client.put(url, json={'task_ids': [own_task, own_task]}).status_code == 400
+        with auth_client.session_transaction() as sess:
+            sess['user_id'] = auth_client.user_id + 1
+        assert auth_client.put(url, json={'task_ids': [own_task]}).status_code in (401, 404)
+
+
+class TestChanges:
+    """Test cases for the board change log and delta sync"""
+
+    def test_delta_after_cursor(self, auth_client):
+        """Test that only entities changed after the cursor come back, once each, with current state"""
+        board_id = create_board(auth_client, lists=('Backlog', 'Done'), tasks_per_list=1)
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        cursor = board['change_cursor']
+        assert auth_client.get(f'/api/boards/{board_id}/changes?since={cursor}').get_json()['changes'] == []
+
+        task_id = board['lists'][0]['tasks'][0]['id']
+        auth_client.patch(f'/api/tasks/{task_id}', json={'title': 'First'})
+        auth_client.patch(f'/api/tasks/{task_id}', json={'title': 'Second'})
+        delta = auth_client.get(f'/api/boards/{board_id}/changes?since={cursor}').get_json()
+        tasks = [change for change in delta['changes'] if change['entity'] == 'task']
+        assert tasks == [{'entity': 'task', 'id': task_id, 'op': 'upsert',
+                          'data': dict(tasks[0]['data'], title='Second')}]
+        assert delta['cursor'] > cursor and not delta['has_more']
+
+    def test_delete_and_move(self, auth_client):
+        """Test that deleted and moved-away tasks arrive as deletes, list counters as list upserts"""
+        board_id = create_board(auth_client, lists=('Backlog',), tasks_per_list=2)
+        other_board = create_board(auth_client, lists=('Backlog',), tasks_per_list=0)
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        cursor = board['change_cursor']
+        first, second = [task['id'] for task in board['lists'][0]['tasks']]
+        other_list = auth_client.get(f'/api/boards/{other_board}').get_json()['lists'][0]['id']
+        auth_client.delete(f'/api/tasks/{first}')
+        auth_client.patch(f'/api/tasks/{second}', json={'list_id': other_list})
+
+        changes = auth_client.get(f'/api/boards/{board_id}/changes?since={cursor}').get_json()['changes']
+        ops = {(change['entity'], change['id']): change for change in changes}
+        assert ops[('task', first)]['op'] == ops[('task', second)]['op'] == 'delete'
+        assert ops[('list', board['lists'][0]['id'])]['data']['task_count'] == 0
+        assert ops[('board', board_id)]['data']['task_count'] == 0
+        moved = auth_client.get(f'/api/boards/{other_board}/changes?since=0').get_json()['changes']
+        assert {'entity': 'task', 'id': second, 'op': 'upsert'}.items() <= [
+            change for change in moved if change['entity'] == 'task'][0].items()
+
+    def test_compaction_forces_resync(self, auth_client):
+        """Test that compaction keeps the newest entry per entity and old cursors get 410"""
+        board_id = create_board(auth_client, lists=('Backlog',), tasks_per_list=1)
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        before = board['change_cursor']
+        task_id = board['lists'][0]['tasks'][0]['id']
+        auth_client.patch(f'/api/tasks/{task_id}', json={'title': 'Again'})
+        removed = api.compact_changes()
+        assert removed['superseded'] > 0 and removed['expired'] == 0
+        assert len(auth_client.get(f'/api/boards/{board_id}/changes?since=0').get_json()['changes']) == 3
+
+        api.compact_changes(retention_hours=-1)
+        response = auth_client.get(f'/api/boards/{board_id}/changes?since={before}')
+        assert response.status_code == 410 and response.get_json()['resync'] is True
+        latest = auth_client.get(f'/api/boards/{board_id}').get_json()['change_cursor']
+        assert auth_client.get(f'/api/boards/{board_id}/changes?since={latest}').status_code == 200
+
+
+class TestOptimisticConcurrency:
+    """Test cases for version columns, If-Match and 409 conflicts"""
+
+    def first_task(self, client, board_id):
+        return client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['tasks'][0]
+
+    def test_if_match_accepts_compressed_etag(self, auth_client):
+        """Test that the ETag of a compressed response is usable as If-Match"""
+        board_id = create_board(auth_client, lists=('Backlog',), tasks_per_list=1)
+        task = self.first_task(auth_client, board_id)
+        url = f"/api/tasks/{task['id']}"
+        updated = auth_client.patch(url, json={'description': 'x' * 4096}, headers={'Accept-Encoding': 'gzip'})
+        assert updated.headers['ETag'] == f'"{task["version"] + 1}-gzip"'
+        response = auth_client.patch(url, json={'title': 'Next'}, headers={'If-Match': updated.headers['ETag']})
+        assert response.status_code == 200
+
+    def test_if_match(self, auth_client):
+        """Test that a current If-Match succeeds with a new ETag and a stale one gets 409 with the state"""
+        board_id = create_board(auth_client, lists=('Backlog',), tasks_per_list=1)
+        task = self.first_task(auth_client, board_id)
+        url = f"/api/tasks/{task['id']}"
+        updated = auth_client.patch(url, json={'title': 'Mine'}, headers={'If-Match': f'"{task["version"]}"'})
+        assert updated.status_code == 200 and updated.headers['ETag'] == f'"{task["version"] + 1}"'
+
+        stale = auth_client.patch(url, json={'title': 'Theirs'}, headers={'If-Match': f'"{task["version"]}"'})
+        assert stale.status_code == 409
+        assert stale.get_json()['current']['title'] == 'Mine'
+        assert auth_client.delete(url, headers={'If-Match': f'"{task["version"]}"'}).status_code == 409
+
+    def patch_with_concurrent_write(self, client):
+        """PATCH a task while another writer bumps its version between our read and our UPDATE"""
+        from sqlalchemy import event, update
+        from sqlalchemy.orm import Session
+        board_id = create_board(client, lists=('Backlog',), tasks_per_list=1)
+        task = self.first_task(client, board_id)
+
+        def other_writer(session, flush_context, instances):
+            session.connection().execute(
+                update(api.TaskModel.__table__).where(api.TaskModel.__table__.c.id == task['id'])
+                .values(title='Other tab', version=api.TaskModel.__table__.c.version + 1))
+
+        event.listen(Session, 'before_flush', other_writer)
+        try:
+            return task, client.patch(f"/api/tasks/{task['id']}", json={'title': 'This tab'})
+        finally:
+            event.remove(Session, 'before_flush', other_writer)
+
+    def test_concurrent_write_conflicts(self, auth_client):
+        """Test that a write landing between our read and our UPDATE fails the compare-and-swap"""
+        task, response = self.patch_with_concurrent_write(auth_client)
+        assert response.status_code == 409
+        assert response.get_json()['current']['version'] == task['version']
+
+    def test_concurrent_write_conflicts_in_production(self, auth_client, monkeypatch):
+        """Test that the lost compare-and-swap is a 409 when exceptions do not propagate"""
+        monkeypatch.setitem(app.config, 'TESTING', False)
+        monkeypatch.setitem(app.config, 'PROPAGATE_EXCEPTIONS', False)
+        task, response = self.patch_with_concurrent_write(auth_client)
+        assert response.status_code == 409
+        assert response.get_json()['current']['version'] == task['version']
+
+    def test_reorder_bumps_versions(self, auth_client):
+        """Test that a reorder returns the new versions and a move based on the old order gets 409"""
+        board_id = create_board(auth_client, lists=('Backlog',), tasks_per_list=2)
+        board = auth_client.get(f'/api/boards/{board_id}').get_json()
+        first, second = board['lists'][0]['tasks']
+        response = auth_client.put(f"/api/lists/{board['lists'][0]['id']}/order",
+                                   json={'task_ids': [second['id'], first['id']]})
+        versions = response.get_json()['versions']
+        assert versions == {str(first['id']): first['version'] + 1, str(second['id']): second['version'] + 1}
+
+        stale = auth_client.patch(f"/api/tasks/{first['id']}", json={'position': 1},
+                                  headers={'If-Match': f'"{first["version"]}"'})
+        assert stale.status_code == 409 and stale.get_json()['current']['position'] == 2
+        current = auth_client.patch(f"/api/tasks/{first['id']}", json={'position': 1},
+                                    headers={'If-Match': f'"{versions[str(first["id"])]}"'})
+        assert current.status_code == 200
+
+
+class TestIdempotency:
+    """Test cases for Idempotency-Key replay on POST endpoints"""
+
+    def test_retry_replays(self, auth_client):
+        """Test that a retried POST returns the first response and creates nothing new"""
+        board_id = create_board(auth_client, lists=('Backlog',), tasks_per_list=0)
+        list_id = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['id']
+        payload = {'title': 'Once', 'list_id': list_id}
+        headers = {'Idempotency-Key': 'retry-1'}
+        first = auth_client.post('/api/tasks/', json=payload, headers=headers)
+        second = auth_client.post('/api/tasks/', json=payload, headers=headers)
+        assert first.status_code == second.status_code == 201
+        assert second.get_json() == first.get_json() and second.headers['Idempotent-Replayed'] == 'true'
+        assert auth_client.get(f'/api/lists/{list_id}/tasks').get_json()['tasks'][0]['id'] == first.get_json()['id']
+        assert len(auth_client.get(f'/api/lists/{list_id}/tasks').get_json()['tasks']) == 1
+
+        changed = auth_client.post('/api/tasks/', json=dict(payload, title='Other'), headers=headers)
+        assert changed.status_code == 422
+
+    def test_failed_request_releases_key(self, auth_client):
+        """Test that a rejected POST does not pin its key"""
+        headers = {'Idempotency-Key': 'retry-2'}
+        assert auth_client.post('/api/lists/', json={'title': 'L', 'board_id': 999}, headers=headers).status_code == 404
+        board_id = create_board(auth_client, lists=(), tasks_per_list=0)
+        assert auth_client.post('/api/lists/', json={'title': 'L', 'board_id': board_id},
+                                headers={'Idempotency-Key': 'retry-2-fixed'}).status_code == 201
+
+    def test_in_flight_duplicate_coalesces(self, tmp_path):
+        """Test that a duplicate waits for the in-flight request in both stores"""
+        import threading
+        for store in (api.MemoryIdempotencyStore(), api.SqliteIdempotencyStore(str(tmp_path / 'idempotency.db'))):
+            assert store.claim('k', 'f')[0] == 'claimed'
+            state, busy = store.claim('k', 'f')
+            assert state == 'busy' and store.claim('k', 'other')[0] == 'mismatch'
+            threading.Timer(0.05, store.complete, ('k', (201, '{"id": 1}'), 60)).start()
+            while state == 'busy':
+                store.wait(busy, 1)
+                state, busy = store.claim('k', 'f')
+            assert (state, busy) == ('done', (201, '{"id": 1}'))
+
+
+class TestSharding:
+    """Test cases for per-user shard routing and the shard migration tool"""
+
+    @pytest.fixture
+    def shards(self, client, tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, 'SHARD_COUNT', 2)
+        monkeypatch.setitem(app.config, 'SHARD_DIR', str(tmp_path))
+        monkeypatch.setattr(api, 'shard_engines', {})
+        yield tmp_path
+        for engine in api.shard_engines.values():
+            engine.dispose()
+
+    def login(self, client, email):
+        user = UserModel.query.filter_by(email=email).first()
+        if user is None:
+            user = UserModel(email=email)
+            user.set_name_as_password(email.split('@')[0])
+            db.session.add(user)
+            db.session.commit()
+        with client.session_transaction() as sess:
+            sess['user_id'] = user.id
+        return user
+
+    def count(self, engine, table):
+        with engine.connect() as conn:
+            return conn.exec_driver_sql(f"SELECT count(*) FROM {table}").scalar()
+
+    def test_board_data_lives_in_user_shard(self, client, shards):
+        """Test that new users are placed by hash and their writes go to their own shard file"""
+        emails = {}
+        for n in range(20):
+            emails.setdefault(api.shard_for(f'user{n}@example.com'), f'user{n}@example.com')
+        first = self.login(client, emails[0])
+        assert first.shard == 0
+        board_id = create_board(client, lists=('To Do', 'Done'), tasks_per_list=2)
+
+        second = self.login(client, emails[1])
+        assert second.shard == 1
+        # Ids are per shard: the second user's first board reuses the id without seeing the first one's
+        assert create_board(client, lists=('Backlog',), tasks_per_list=1) == board_id
+        assert len(client.get(f'/api/boards/{board_id}').get_json()['lists']) == 1
+
+        assert (shards / 'shard_000.db').exists() and (shards / 'shard_001.db').exists()
+        assert self.count(api.shard_engine(0), 'task_model') == 4
+        assert self.count(api.shard_engine(1), 'task_model') == 1
+        assert self.count(db.engine, 'board_model') == 0
+        self.login(client, emails[0])
+        assert len(client.get(f'/api/boards/{board_id}').get_json()['lists']) == 2
+
+    def test_migrate_and_back(self, auth_client, monkeypatch, tmp_path):
+        """Test moving an existing user's boards into their shard and back to the main database"""
+        import shard_db
+        board_id = create_board(auth_client)
+        auth_client.patch(f'/api/boards/{board_id}', json={'title': 'Moved'})
+        before = auth_client.get('/api/boards/').get_json()
+
+        monkeypatch.setitem(app.config, 'SHARD_COUNT', 2)
+        monkeypatch.setitem(app.config, 'SHARD_DIR', str(tmp_path))
+        monkeypatch.setattr(api, 'shard_engines', {})
+        assert shard_db.migrate(dry_run=True, verbose=False) == {'moved': 1, 'swept': 0}
+        assert shard_db.migrate(verbose=False) == {'moved': 1, 'swept': 0}
+        assert shard_db.migrate(verbose=False) == {'moved': 0, 'swept': 0}
+        db.session.remove()
+
+        user = db.session.get(UserModel, auth_client.user_id)
+        assert user.shard == api.shard_for(user.email)
+        assert self.count(db.engine, 'board_model') == 0
+        assert self.count(api.shard_engine(user.shard), 'task_model') == 6
+
+        def strip_ids(boards):
+            return [(board['title'], board['version'],
+                     [(item['title'], [task['title'] for task in item['tasks']]) for item in board['lists']])
+                    for board in boards]
+        assert strip_ids(auth_client.get('/api/boards/').get_json()) == strip_ids(before)
+
+        assert shard_db.migrate(to_main=True, verbose=False)['moved'] == 1
+        db.session.remove()
+        assert db.session.get(UserModel, auth_client.user_id).shard is None
+        assert strip_ids(auth_client.get('/api/boards/').get_json()) == strip_ids(before)
+        for engine in api.shard_engines.values():
+            engine.dispose()
+
+
+class TestBackup:
+    """Test cases for the online backup tool"""
+
+    def test_backup_verify_restore(self, auth_client, tmp_path):
+        """Test that a backup set round-trips and that a damaged set is rejected"""
+        import backup_db
+        import sqlite3
+        create_board(auth_client)
+        set_dir = backup_db.backup(dest=str(tmp_path / 'backups'), pages=1, sleep=0, verbose=False)
+        assert os.path.basename(set_dir) in os.listdir(tmp_path / 'backups')
+        assert backup_db.verify(set_dir, verbose=False)
+
+        restored = backup_db.restore(set_dir, str(tmp_path / 'restored'), verbose=False)
+        conn = sqlite3.connect(restored[0])
+        assert conn.execute("SELECT count(*) FROM task_model").fetchone()[0] == 6
+        conn.close()
+        with pytest.raises(SystemExit):
+            backup_db.restore(set_dir, str(tmp_path / 'restored'), verbose=False)
+
+        stored = os.path.join(set_dir, next(iter(backup_db.load_manifest(set_dir)['files'])))
+        with open(stored, 'r+b') as handle:
+            handle.seek(20)
+            handle.write(b'\0' * 8)
+        assert not backup_db.verify(set_dir, verbose=False)
+
+    def test_keep_prunes_old_sets(self, client, tmp_path):
+        """Test that only the newest sets are kept"""
+        import backup_db
+        dest = tmp_path / 'backups'
+        for name in ('20240101T000000Z', '20240102T000000Z'):
+            (dest / name).mkdir(parents=True)
+            (dest / name / 'manifest.json').write_text('{"files": {}}')
+        newest = backup_db.backup(dest=str(dest), keep=2, verbose=False)
+        assert backup_db.backup_sets(str(dest)) == [str(dest / '20240102T000000Z'), newest]
+
+
+class TestMaintenance:
+    """Test cases for the database maintenance tool"""
+
+    def test_stats_and_check(self, auth_client):
+        """Test per-table statistics and quick_check on the live database"""
+        import maintain_db
+        create_board(auth_client)
+        report = maintain_db.maintain('main', db.engine.url.database, steps=('stats', 'check', 'analyze'))
+        assert report['tables']['task_model']['rows'] == 6
+        assert report['tables']['task_model']['archived'] == 0
+        assert report['tables']['list_model']['bytes'] >= report['tables']['list_model']['index_bytes'] > 0
+        assert report['quick_check'] == 'ok'
+        assert 'task_model' in report['analyzed'] and 'vacuum' not in report
+
+    def test_incremental_vacuum_releases_pages(self, tmp_path):
+        """Test enabling auto_vacuum on an old file and vacuuming it in budgeted passes"""
+        import maintain_db
+        import sqlite3
+        path = str(tmp_path / 'old.db')
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA auto_vacuum=NONE")
+        conn.execute("CREATE TABLE blob (data BLOB)")
+        conn.executemany("INSERT INTO blob VALUES (?)", [(b'x' * 4000,) for _ in range(200)])
+        conn.commit()
+        assert maintain_db.maintain('old', path, steps=('vacuum',))['vacuum'].get('skipped')
+
+        assert maintain_db.enable_auto_vacuum(path) == 'incremental'
+        conn.execute("DELETE FROM blob")
+        conn.commit()
+        conn.close()
+        report = maintain_db.maintain('old', path, steps=('vacuum',), vacuum_pages=50, pause=0)
+        assert report['freelist_count'] >= 200
+        assert report['vacuum']['freelist_after'] == 0 and report['vacuum']['passes'] > 1
+
+
+class TestJobs:
+    """Test cases for the background job queue and worker"""
+
+    def run_worker(self):
+        import run_worker
+        return run_worker.Worker(threads=1, poll_interval=0).run(once=True)
+
+    def test_export_runs_in_background(self, auth_client):
+        """Test that an export returns 202 and its result appears once a worker ran it"""
+        board_id = create_board(auth_client)
+        response = auth_client.post(f'/api/boards/{board_id}/export')
+        assert response.status_code == 202
+        job = response.get_json()
+        assert response.headers['Location'] == f"/api/jobs/{job['id']}" and job['status'] == 'queued'
+        assert auth_client.get(f"/api/jobs/{job['id']}/result").status_code == 409
+
+        assert self.run_worker() == 1
+        job = auth_client.get(f"/api/jobs/{job['id']}").get_json()
+        assert job['status'] == 'done' and job['attempts'] == 1
+        result = auth_client.get(job['result_url']).get_json()
+        assert [len(list_item['tasks']) for list_item in result['lists']] == [2, 2, 2]
+        assert [item['id'] for item in auth_client.get('/api/jobs/').get_json()] == [job['id']]
+
+    def test_retry_with_backoff_then_fail(self, auth_client, monkeypatch):
+        """Test that a failing job is requeued with backoff and fails after max_attempts"""
+        calls = []
+
+        def flaky(**payload):
+            calls.append(payload)
+            raise RuntimeError("dependency down")
+
+        monkeypatch.setitem(api.JOB_HANDLERS, 'flaky', flaky)
+        monkeypatch.setitem(app.config, 'JOB_BACKOFF_SECONDS', 0)
+        job = api.enqueue_job('flaky', {'n': 1}, user_id=auth_client.user_id, max_attempts=3)
+        db.session.commit()
+
+        self.run_worker()
+        job = auth_client.get(f'/api/jobs/{job.id}').get_json()
+        assert len(calls) == 3 and job['status'] == 'failed' and job['attempts'] == 3
+        assert 'dependency down' in job['error']
+
+    def test_expired_lease_is_reclaimed(self, auth_client):
+        """Test that a job of a dead worker runs again and the stale worker cannot finish it"""
+        board_id = create_board(auth_client)
+        job_id = auth_client.post(f'/api/boards/{board_id}/export').get_json()['id']
+        stale = api.claim_job('dead-worker', lease_seconds=0.01)
+        assert stale.id == job_id and api.claim_job('other') is None
+        time.sleep(0.02)
+
+        fresh = api.claim_job('live-worker')
+        assert fresh.id == job_id and fresh.attempts == 2
+        assert api.run_job(stale, 'dead-worker') == 'lost'
+        assert auth_client.get(f'/api/jobs/{job_id}').get_json()['status'] == 'running'
+        assert api.run_job(fresh, 'live-worker') == 'done'
+        assert auth_client.get(f'/api/jobs/{job_id}').get_json()['status'] == 'done'
+
+
+class TestReminders:
+    """Test cases for due dates and the reminder scheduler"""
+
+    class CollectingSink:
+        def __init__(self):
+            self.reminders = []
+
+        def send(self, reminders):
+            self.reminders += reminders
+            return len(reminders)
+
+    def dated_task(self, client, list_id, title, due):
+        return client.post('/api/tasks/', json={'title': title, 'list_id': list_id,
+                                                'due_date': due.isoformat() + 'Z'}).get_json()
+
+    def test_due_date_is_exposed(self, auth_client):
+        """Test that due_date can be set, returned and cleared"""
+        board_id = create_board(auth_client, lists=('To Do',), tasks_per_list=0)
+        list_id = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['id']
+        task = self.dated_task(auth_client, list_id, 'Dated', datetime(2030, 1, 2, 9, 30))
+        assert task['due_date'] == 'Wed, 02 Jan 2030 09:30:00 -0000'
+
+        response = auth_client.patch(f"/api/tasks/{task['id']}", json={'due_date': task['due_date']})
+        assert response.get_json()['due_date'] == task['due_date']
+        assert auth_client.patch(f"/api/tasks/{task['id']}", json={'due_date': 'soon'}).status_code == 400
+        assert auth_client.patch(f"/api/tasks/{task['id']}", json={'due_date': None}).get_json()['due_date'] is None
+
+    def test_scheduler_sends_upcoming_then_overdue(self, auth_client):
+        """Test that each reminder goes out once and an edited due date owes its reminders again"""
+        import run_scheduler
+        board_id = create_board(auth_client, lists=('To Do',), tasks_per_list=0)
+        list_id = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['id']
+        now = datetime.utcnow()
+        soon = self.dated_task(auth_client, list_id, 'Soon', now + timedelta(minutes=10))
+        late = self.dated_task(auth_client, list_id, 'Late', now - timedelta(minutes=10))
+        self.dated_task(auth_client, list_id, 'Later', now + timedelta(days=3))
+
+        sink = self.CollectingSink()
+        scheduler = run_scheduler.Scheduler(sink, heap_size=10)
+        scheduler.run(once=True)
+        assert sorted((r.title, r.kind) for r in sink.reminders) == [('Late', 'overdue'), ('Soon', 'upcoming')]
+        assert sink.reminders[0].email == 'test@example.com'
+        assert scheduler.heap[0][2] == soon['id'] and len(scheduler.heap) == 2  # next: Soon overdue, Later upcoming
+
+        scheduler.tick(now + timedelta(minutes=11))
+        assert [(r.title, r.kind) for r in sink.reminders[2:]] == [('Soon', 'overdue')]
+        scheduler.run(once=True)
+        assert len(sink.reminders) == 3
+
+        auth_client.patch(f"/api/tasks/{late['id']}", json={'due_date': (now + timedelta(minutes=5)).isoformat()})
+        scheduler.run(once=True)
+        assert [(r.title, r.kind) for r in sink.reminders[3:]] == [('Late', 'upcoming')]
+
+    def test_claims_are_leased(self, auth_client):
+        """Test that a claimed reminder is skipped by other schedulers until its lease runs out"""
+        board_id = create_board(auth_client, lists=('To Do',), tasks_per_list=0)
+        list_id = auth_client.get(f'/api/boards/{board_id}').get_json()['lists'][0]['id']
+        task = self.dated_task(auth_client, list_id, 'Due', datetime.utcnow() - timedelta(minutes=1))
+
+        assert [row.id for row in api.claim_reminders(lease_seconds=0.05)] == [task['id']]
+        assert api.claim_reminders() == []
+        time.sleep(0.06)
+        sink = self.CollectingSink()
+        assert api.dispatch_reminders(sink) == 1 and sink.reminders[0].kind == 'overdue'
+        assert api.dispatch_reminders(sink) == 0
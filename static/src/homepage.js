@@ -0,0 +1,46 @@
+// Theme Management - Login Style
+function initializeTheme() {
+    const savedTheme = localStorage.getItem('theme') || 'light';
+    document.documentElement.setAttribute('data-theme', savedTheme);
+}
+
+function toggleTheme() {
+    const currentTheme = document.documentElement.getAttribute('data-theme') || 'light';
+    const newTheme = currentTheme === 'light' ? 'dark' : 'light';
+
+    document.documentElement.setAttribute('data-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+
+    // Add smooth transition
+    document.body.style.transition = 'all 0.4s cubic-bezier(0.4, 0, 0.2, 1)';
+    setTimeout(() => {
+        document.body.style.transition = '';
+    }, 400);
+
+    // Add ripple effect to toggle
+    const toggle = document.querySelector('.theme-toggle');
+    const ripple = document.createElement('div');
+    ripple.classList.add('ripple');
+    toggle.appendChild(ripple);
+
+    setTimeout(() => {
+        ripple.remove();
+    }, 600);
+}
+
+// Initialize theme on page load
+initializeTheme();
+
+// Smooth scroll for anchor links
+document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    anchor.addEventListener('click', function (e) {
+        e.preventDefault();
+        const target = document.querySelector(this.getAttribute('href'));
+        if (target) {
+            target.scrollIntoView({
+                behavior: 'smooth',
+                block: 'start'
+            });
+        }
+    });
+});
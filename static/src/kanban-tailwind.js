@@ -0,0 +1,62 @@
+tailwind.config = {
+    darkMode: ['class', '[data-theme="dark"]'],
+    theme: {
+        extend: {
+            colors: {
+                ice: {
+                    50: '#f0f9ff',
+                    100: '#e0f2fe', 
+                    200: '#bae6fd',
+                    300: '#7dd3fc',
+                    400: '#38bdf8',
+                    500: '#0ea5e9',
+                    600: '#0284c7',
+                    700: '#0369a1',
+                    800: '#075985',
+                    900: '#0c4a6e'
+                },
+                'dark-ice': {
+                    50: '#1e293b',
+                    100: '#334155',
+                    200: '#475569',
+                    300: '#64748b',
+                    400: '#94a3b8',
+                    500: '#cbd5e1',
+                    600: '#e2e8f0',
+                    700: '#f1f5f9',
+                    800: '#f8fafc',
+                    900: '#ffffff'
+                }
+            },
+            animation: {
+                'float': 'float 6s ease-in-out infinite',
+                'slide-in': 'slideIn 0.3s ease-out',
+                'bounce-soft': 'bounceSoft 2s infinite',
+                'shimmer': 'shimmer 2s linear infinite',
+                'fade-out': 'fadeOut 0.3s ease-out',
+            },
+            keyframes: {
+                float: {
+                    '0%, 100%': { transform: 'translateY(0px)' },
+                    '50%': { transform: 'translateY(-10px)' }
+                },
+                slideIn: {
+                    '0%': { transform: 'translateX(-100%)', opacity: '0' },
+                    '100%': { transform: 'translateX(0)', opacity: '1' }
+                },
+                bounceSoft: {
+                    '0%, 100%': { transform: 'translateY(0)' },
+                    '50%': { transform: 'translateY(-5px)' }
+                },
+                shimmer: {
+                    '0%': { backgroundPosition: '-200% 0' },
+                    '100%': { backgroundPosition: '200% 0' }
+                },
+                fadeOut: {
+                    '0%': { opacity: '1' },
+                    '100%': { opacity: '0' }
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,1033 @@
+let currentBoardId = null;
+let boardCursor = null;  // change log position of the rendered board
+let currentTaskListId = null;
+let sortableInstances = [];
+
+// Theme Management
+function initializeTheme() {
+    // Get saved theme from localStorage or default to light
+    const savedTheme = localStorage.getItem('kanban-theme') || 'light';
+    document.documentElement.setAttribute('data-theme', savedTheme);
+
+    console.log('🎨 Theme initialized:', savedTheme);
+}
+
+function toggleTheme() {
+    const currentTheme = document.documentElement.getAttribute('data-theme') || 'light';
+    const newTheme = currentTheme === 'light' ? 'dark' : 'light';
+
+    document.documentElement.setAttribute('data-theme', newTheme);
+    localStorage.setItem('kanban-theme', newTheme);
+
+    console.log('🎨 Theme switched to:', newTheme);
+
+    // Add a smooth transition effect
+    document.body.style.transition = 'all 0.4s cubic-bezier(0.4, 0, 0.2, 1)';
+    setTimeout(() => {
+        document.body.style.transition = '';
+    }, 400);
+}
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    // Initialize theme first
+    initializeTheme();
+
+    // Test if SortableJS loaded
+    console.log('🔍 SortableJS loaded:', typeof Sortable !== 'undefined');
+    console.log('🔍 Sortable object:', Sortable);
+
+    // Boot from the embedded board; only users without a board go through the API
+    const initialBoard = document.getElementById('initialBoard');
+    if (initialBoard) {
+        const board = JSON.parse(initialBoard.textContent);
+        currentBoardId = board.id;
+        renderBoard(board);
+    } else {
+        loadBoards();
+    }
+});
+
+// Load boards and initialize
+async function loadBoards() {
+    try {
+        const response = await fetch('/api/boards/');
+        if (response.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (response.ok) {
+            const boards = await response.json();
+            if (boards.length > 0) {
+                currentBoardId = boards[0].id;
+                await loadBoard();
+            } else {
+                await createDefaultBoard();
+            }
+        } else {
+            console.error('Failed to load boards');
+            showEmptyState();
+        }
+    } catch (error) {
+        console.error('Error loading boards:', error);
+        showEmptyState();
+    }
+}
+
+// Load current board
+async function loadBoard() {
+    if (!currentBoardId) return;
+
+    try {
+        const response = await fetch(`/api/boards/${currentBoardId}`);
+        if (response.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (response.ok) {
+            const board = await response.json();
+            renderBoard(board);
+        } else {
+            console.error('Failed to load board');
+            showEmptyState();
+        }
+    } catch (error) {
+        console.error('Error loading board:', error);
+        showEmptyState();
+    }
+}
+
+// Create default board with 5 lists
+async function createDefaultBoard() {
+    try {
+        // Create board first
+        const boardResponse = await fetch('/api/boards/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                title: 'My Kanban Board',
+                description: 'Main project board',
+                user_id: 1 // Will be overridden by backend
+            })
+        });
+
+        if (boardResponse.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (boardResponse.ok) {
+            const board = await boardResponse.json();
+            currentBoardId = board.id;
+
+            // Create default lists
+            const defaultLists = [
+                { title: 'Backlog', position: 1 },
+                { title: 'To Do', position: 2 },
+                { title: 'In Progress', position: 3 },
+                { title: 'Testing', position: 4 },
+                { title: 'Done', position: 5 }
+            ];
+
+            for (const listData of defaultLists) {
+                await fetch('/api/lists/', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({
+                        title: listData.title,
+                        position: listData.position,
+                        board_id: currentBoardId
+                    })
+                });
+            }
+
+            await loadBoard();
+        } else {
+            console.error('Failed to create default board');
+            showEmptyState();
+        }
+    } catch (error) {
+        console.error('Error creating default board:', error);
+        showEmptyState();
+    }
+}
+
+// Render the board
+function renderBoard(board) {
+    const boardContainer = document.getElementById('kanbanBoard');
+    boardContainer.innerHTML = '';
+    boardCursor = board.change_cursor ?? null;
+
+    // Clear existing sortable instances
+    sortableInstances.forEach(instance => instance.destroy());
+    sortableInstances = [];
+
+    if (!board.lists || board.lists.length === 0) {
+        showEmptyState();
+        return;
+    }
+
+    // Sort lists by position
+    board.lists.sort((a, b) => (a.position || 0) - (b.position || 0));
+
+    board.lists.forEach(list => {
+        const listElement = createListElement(list);
+        boardContainer.appendChild(listElement);
+    });
+
+    // Make board horizontally sortable
+    createSortableBoard();
+}
+
+// Protected lists that cannot be deleted
+const PROTECTED_LISTS = ['Backlog', 'To Do', 'In Progress', 'Testing', 'Done'];
+
+// Create list element
+function createListElement(list) {
+    const listDiv = document.createElement('div');
+    listDiv.className = 'kanban-list list-container flex-shrink-0 w-80 h-fit animate-slide-in';
+    listDiv.dataset.listId = list.id;
+    listDiv.dataset.taskCount = list.task_count ?? (list.tasks || []).length;
+
+    const tasks = (list.tasks || []).sort((a, b) => (a.position || 0) - (b.position || 0));
+    const isProtected = PROTECTED_LISTS.includes(list.title);
+
+    listDiv.innerHTML = `
+        <div class="h-full max-h-[calc(100vh-180px)] transition-colors duration-300" style="overflow: visible; background: transparent; border: none;">
+            <!-- List Header -->
+            <div class="bg-gradient-to-r from-ice-100/80 to-blue-100/80 dark:from-slate-700/60 dark:to-blue-800/40 p-4 border-b border-white/30 dark:border-slate-600/50 transition-colors duration-300 rounded-t-2xl">
+                <div class="flex items-center justify-between">
+                    <div class="flex items-center space-x-3">
+                        <div class="w-3 h-3 rounded-full bg-gradient-to-r from-ice-400 to-blue-500 animate-bounce-soft"></div>
+                        <h3 class="text-lg font-bold text-ice-800 dark:text-slate-100">${list.title}</h3>
+                        <span class="text-xs font-semibold text-ice-600 dark:text-slate-300 bg-ice-200/60 dark:bg-slate-600/60 px-2 py-1 rounded-full">
+                            ${list.task_count ?? tasks.length}
+                        </span>
+                        ${isProtected ? `
+                            <span class="text-xs text-ice-500 dark:text-slate-400 bg-ice-100/50 dark:bg-slate-700/50 px-2 py-1 rounded-full border border-ice-200 dark:border-slate-600" title="Protected list - cannot be deleted">
+                                <i class="ri-shield-check-line"></i>
+                            </span>
+                        ` : ''}
+                    </div>
+                    <div class="flex items-center space-x-1">
+                        <button onclick="openAddTaskModal(${list.id})" 
+                                class="text-ice-600 dark:text-slate-300 hover:text-ice-800 dark:hover:text-slate-100 hover:bg-white/50 dark:hover:bg-slate-600/50 p-2 rounded-lg transition-all duration-200 transform hover:scale-110 group">
+                            <i class="ri-add-line text-xl group-hover:rotate-90 transition-transform duration-200"></i>
+                        </button>
+                        ${!isProtected ? `
+                            <button onclick="deleteList(${list.id}, '${list.title}')" 
+                                    class="text-slate-400 dark:text-slate-500 hover:text-red-500 dark:hover:text-red-400 hover:bg-red-50/50 dark:hover:bg-red-800/20 p-2 rounded-lg transition-all duration-200 transform hover:scale-110 group">
+                                <i class="ri-delete-bin-line text-lg group-hover:animate-pulse"></i>
+                            </button>
+                        ` : ''}
+                    </div>
+                </div>
+            </div>
+
+            <!-- Tasks Container -->
+            <div class="scrollable-area p-4 overflow-y-auto max-h-[calc(100vh-300px)] scrollbar-thin scrollbar-thumb-ice-300 rounded-b-2xl">
+                <div class="tasks-container space-y-3 min-h-[50px]" data-list-id="${list.id}" data-next-cursor="${list.next_cursor || ''}">
+                    ${tasks.map(task => createTaskElement(task, list.title)).join('')}
+                </div>
+
+                <!-- Quick Add Task -->
+                <div class="mt-4 pt-3 border-t border-white/20">
+                    <button onclick="openAddTaskModal(${list.id})" 
+                            class="w-full text-left text-ice-600 dark:text-slate-300 hover:text-ice-800 dark:hover:text-slate-100 hover:bg-white/30 dark:hover:bg-slate-600/30 p-3 rounded-xl border-2 border-dashed border-ice-300 dark:border-slate-500 hover:border-ice-400 dark:hover:border-slate-400 transition-all duration-200 group">
+                        <i class="ri-add-line mr-2 group-hover:rotate-90 transition-transform duration-200"></i>
+                        Add new task...
+                    </button>
+                </div>
+            </div>
+        </div>
+    `;
+
+    // Make tasks sortable
+    setTimeout(() => {
+        const tasksContainer = listDiv.querySelector('.tasks-container');
+        const scrollableArea = listDiv.querySelector('.scrollable-area');
+
+        console.log('🔍 Creating sortable for list:', list.title);
+        console.log('🔍 Tasks container:', tasksContainer);
+        console.log('🔍 Tasks in container:', tasksContainer.children.length);
+
+        // Add scroll event handling for task containers
+        scrollableArea.addEventListener('wheel', function(e) {
+            // Allow normal vertical scrolling within the task container
+            e.stopPropagation();
+        });
+
+        // Long lists arrive one page at a time; fetch the next page near the bottom
+        scrollableArea.addEventListener('scroll', function() {
+            if (scrollableArea.scrollTop + scrollableArea.clientHeight >= scrollableArea.scrollHeight - 200) {
+                loadMoreTasks(tasksContainer, list.title);
+            }
+        });
+
+        if (tasksContainer && typeof Sortable !== 'undefined') {
+            const sortable = Sortable.create(tasksContainer, {
+                group: 'tasks',
+                animation: 150,
+                ghostClass: 'sortable-ghost',
+                chosenClass: 'sortable-chosen',
+                dragClass: 'sortable-drag',
+                forceFallback: false,
+                fallbackTolerance: 3,
+                swapThreshold: 0.65,
+                // No filter here - we'll handle it in onMove
+                onStart: function(evt) {
+                    console.log('🎯 Drag started:', evt.item);
+
+                    // Check if trying to drag a done task
+                    if (evt.item.classList.contains('done-task')) {
+                        console.log('🚫 Cannot drag Done task');
+                        return false; // Cancel drag
+                    }
+
+                    evt.item.style.transform = 'scale(1.05)';
+                    evt.item.style.zIndex = '1000';
+                    evt.item.style.opacity = '0.9';
+                    document.body.style.cursor = 'grabbing';
+                },
+                onMove: function(evt) {
+                    console.log('🎯 Drag moving:', evt.dragged);
+
+                    // Check if trying to move FROM Done list (prevent exit)
+                    const fromListElement = evt.from.closest('.kanban-list');
+                    const fromListTitle = fromListElement.querySelector('h3').textContent.trim();
+
+                    if (fromListTitle === 'Done') {
+                        // Prevent moving tasks OUT of Done list
+                        console.log('🚫 Cannot move task FROM Done list');
+                        return false;
+                    }
+
+                    return true; // Allow move INTO Done list and between other lists
+                },
+                onEnd: function(evt) {
+                    console.log('🎯 Drag ended:', evt.item, 'from', evt.from, 'to', evt.to);
+                    evt.item.style.transform = 'scale(1)';
+                    evt.item.style.zIndex = '';
+                    evt.item.style.opacity = '';
+                    document.body.style.cursor = '';
+
+                    // Smooth transition back to normal
+                    evt.item.style.transition = 'all 0.2s cubic-bezier(0.4, 0, 0.2, 1)';
+                    setTimeout(() => {
+                        evt.item.style.transition = '';
+                    }, 200);
+
+                    handleTaskMove(evt.item, evt.from, evt.to, evt.newIndex);
+                }
+            });
+            sortableInstances.push(sortable);
+
+            // Add event listeners to prevent dragging done tasks
+            lockDoneTasks(tasksContainer.querySelectorAll('.done-task'));
+
+            console.log('✅ Sortable created successfully for:', list.title);
+        } else {
+            console.error('❌ Cannot create sortable - missing container or Sortable library');
+        }
+    }, 100);
+
+    return listDiv;
+}
+
+// Prevent dragging done tasks
+function lockDoneTasks(doneTasks) {
+    doneTasks.forEach(task => {
+        task.addEventListener('mousedown', function(e) {
+            console.log('🚫 Preventing drag on done task');
+            e.preventDefault();
+            e.stopPropagation();
+            return false;
+        });
+
+        task.addEventListener('dragstart', function(e) {
+            console.log('🚫 Preventing dragstart on done task');
+            e.preventDefault();
+            return false;
+        });
+    });
+}
+
+// Fetch the next page of a long list and append it
+async function loadMoreTasks(tasksContainer, listTitle) {
+    const cursor = tasksContainer.dataset.nextCursor;
+    if (!cursor || tasksContainer.dataset.loading) return;
+    tasksContainer.dataset.loading = '1';
+
+    try {
+        const response = await fetch(`/api/lists/${tasksContainer.dataset.listId}/tasks?after=${encodeURIComponent(cursor)}`);
+        if (response.ok) {
+            const page = await response.json();
+            const before = tasksContainer.children.length;
+            tasksContainer.insertAdjacentHTML('beforeend', page.tasks.map(task => createTaskElement(task, listTitle)).join(''));
+            lockDoneTasks(Array.from(tasksContainer.children).slice(before).filter(task => task.classList.contains('done-task')));
+            tasksContainer.dataset.nextCursor = page.next_cursor || '';
+            tasksContainer.dataset.paged = '1';
+        } else {
+            console.error('Failed to load more tasks');
+        }
+    } catch (error) {
+        console.error('Error loading more tasks:', error);
+    } finally {
+        delete tasksContainer.dataset.loading;
+    }
+}
+
+// Create task element
+function createTaskElement(task, listTitle = '') {
+    const priorityConfig = {
+        high: { color: 'from-red-400 to-red-600', icon: '🔴', bg: 'bg-red-50' },
+        medium: { color: 'from-yellow-400 to-yellow-600', icon: '🟡', bg: 'bg-yellow-50' },
+        low: { color: 'from-green-400 to-green-600', icon: '🟢', bg: 'bg-green-50' }
+    };
+
+    const priority = priorityConfig[task.priority] || priorityConfig.medium;
+    const isDone = listTitle === 'Done';
+
+    return `
+        <div class="task-card ${isDone ? 'done-task' : ''} bg-blue-50/90 dark:bg-blue-900/20 backdrop-blur-sm rounded-xl p-4 shadow-lg border border-blue-200/60 dark:border-blue-700/40 ${isDone ? 'cursor-not-allowed' : 'cursor-move'} group transition-colors duration-300 relative z-10" 
+             data-task-id="${task.id}" data-version="${task.version}">
+
+            <div class="flex items-start justify-between mb-3">
+                <div class="flex items-center space-x-2 flex-1">
+                    ${isDone ? `
+                        <div class="w-6 h-6 bg-gradient-to-r from-green-400 to-green-600 rounded-full flex items-center justify-center shadow-lg animate-pulse">
+                            <i class="ri-check-line text-white text-sm font-bold"></i>
+                        </div>
+                    ` : ''}
+                    <h4 class="text-sm font-bold text-blue-900 dark:text-blue-100 line-clamp-2 flex-1 ${isDone ? 'line-through opacity-75' : ''}">
+                        ${task.title}
+                    </h4>
+                </div>
+                <div class="opacity-0 group-hover:opacity-100 transition-opacity duration-200">
+                    <button class="text-blue-400 dark:text-blue-500 hover:text-red-500 dark:hover:text-red-400 p-1 rounded transition-colors" onclick="deleteTask(${task.id})">
+                        <i class="ri-delete-bin-line text-sm"></i>
+                    </button>
+                </div>
+            </div>
+
+            ${task.description ? `
+                <p class="text-xs text-blue-700 dark:text-blue-300 mb-3 line-clamp-2 bg-blue-100/60 dark:bg-blue-800/30 p-2 rounded-lg">
+                    ${task.description}
+                </p>
+            ` : ''}
+
+            <div class="flex items-center justify-between">
+                <span class="inline-flex items-center px-2 py-1 rounded-full text-xs font-bold bg-gradient-to-r ${priority.color} text-white shadow-sm">
+                    <span class="mr-1">${priority.icon}</span>
+                    ${task.priority.charAt(0).toUpperCase() + task.priority.slice(1)}
+                </span>
+
+                <div class="flex items-center space-x-2 text-xs text-blue-600 dark:text-blue-400">
+                    <i class="ri-time-line"></i>
+                    <span>${new Date(task.created_at || Date.now()).toLocaleDateString('tr-TR')}</span>
+                </div>
+            </div>
+
+            <!-- Drag Handle -->
+            <div class="absolute top-2 right-2 opacity-0 group-hover:opacity-100 transition-opacity duration-200">
+                <i class="ri-drag-move-2-line text-blue-400 dark:text-blue-500 text-sm"></i>
+            </div>
+        </div>
+    `;
+}
+
+// Create sortable board
+function createSortableBoard() {
+    const boardContainer = document.getElementById('kanbanBoard');
+    Sortable.create(boardContainer, {
+        animation: 200,
+        ghostClass: 'opacity-50',
+        dragClass: 'transform scale-105',
+        onEnd: function(evt) {
+            console.log('List moved:', evt.oldIndex, 'to', evt.newIndex);
+            if (evt.oldIndex !== evt.newIndex) {
+                saveListOrder(boardContainer);
+            }
+        }
+    });
+}
+
+// Send the full list order of the board in one request
+async function saveListOrder(boardContainer) {
+    const listIds = Array.from(boardContainer.querySelectorAll(':scope > .kanban-list[data-list-id]'))
+        .map(listElement => parseInt(listElement.dataset.listId));
+    try {
+        const response = await fetch(`/api/boards/${currentBoardId}/order`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ list_ids: listIds })
+        });
+        if (!response.ok) {
+            console.error('Failed to save list order');
+        }
+    } catch (error) {
+        console.error('Error saving list order:', error);
+    }
+}
+
+// Send the order of the loaded tasks of a list in one request; unloaded pages stay after them
+function saveTaskOrder(tasksContainer) {
+    const taskIds = Array.from(tasksContainer.querySelectorAll('[data-task-id]'))
+        .map(taskElement => parseInt(taskElement.dataset.taskId));
+    return fetch(`/api/lists/${tasksContainer.dataset.listId}/order`, {
+        method: 'PUT',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ task_ids: taskIds })
+    });
+}
+
+// Handle task movement
+async function handleTaskMove(taskElement, fromContainer, toContainer, newIndex) {
+    const taskId = taskElement.dataset.taskId;
+    const newListId = toContainer.dataset.listId;
+
+    // Check if task is moved to Done list
+    const toListElement = toContainer.closest('.kanban-list');
+    const toListTitle = toListElement.querySelector('h3').textContent.trim();
+    const isDoneMove = toListTitle === 'Done';
+
+    try {
+        let response = null;
+        if (fromContainer !== toContainer) {
+            // If-Match: if another tab moved or edited this card first, we get 409 instead of overwriting it
+            response = await fetch(`/api/tasks/${taskId}`, {
+                method: 'PATCH',
+                headers: { 'Content-Type': 'application/json', 'If-Match': `"${taskElement.dataset.version}"` },
+                body: JSON.stringify({ list_id: parseInt(newListId) })
+            });
+            if (response.status === 409) {
+                showErrorAlert('This card was changed in another window, showing the latest board.');
+                await loadBoard();
+                return;
+            }
+            if (response.ok) {
+                taskElement.dataset.version = (await response.json()).version;
+            }
+        }
+        // The whole target list is renumbered at once, so siblings never share a position
+        if (!response || response.ok) {
+            response = await saveTaskOrder(toContainer);
+        }
+
+        if (!response.ok) {
+            console.error('Failed to move task');
+            fromContainer.insertBefore(taskElement, fromContainer.children[newIndex]);
+            return;
+        }
+        // Renumbered cards got new versions; keep their If-Match current
+        const { versions } = await response.json();
+        for (const [id, version] of Object.entries(versions)) {
+            const card = toContainer.querySelector(`[data-task-id="${id}"]`);
+            if (card) {
+                card.dataset.version = version;
+            }
+        }
+        if (isDoneMove) {
+            // Celebrate task completion! 🎉
+            const taskTitle = taskElement.querySelector('h4').textContent.trim();
+            celebrateTaskCompletion(taskTitle);
+        }
+    } catch (error) {
+        console.error('Error moving task:', error);
+    }
+}
+
+// Celebrate task completion with fireworks! 🎉
+function celebrateTaskCompletion(taskTitle) {
+    // Show success alert with celebration message
+    showSuccessAlert(`🎉 Tebrikler! "${taskTitle}" görevini tamamladınız!`);
+
+    // Create fireworks animation
+    createFireworks();
+
+    console.log('🎉 Task completed celebration triggered!');
+}
+
+// Create fireworks animation
+function createFireworks() {
+    const colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#f9ca24', '#f0932b', '#eb4d4b', '#6c5ce7'];
+    const fireworksCount = 5;
+
+    for (let i = 0; i < fireworksCount; i++) {
+        setTimeout(() => {
+            createSingleFirework(colors[Math.floor(Math.random() * colors.length)]);
+        }, i * 200);
+    }
+}
+
+function createSingleFirework(color) {
+    const firework = document.createElement('div');
+    firework.className = 'firework';
+    firework.style.backgroundColor = color;
+    firework.style.boxShadow = `0 0 10px ${color}`;
+
+    // Random position
+    const x = Math.random() * window.innerWidth;
+    const y = window.innerHeight - 50;
+
+    firework.style.left = x + 'px';
+    firework.style.top = y + 'px';
+
+    document.body.appendChild(firework);
+
+    // Create particles
+    setTimeout(() => {
+        createFireworkParticles(x, y - 100, color);
+        firework.remove();
+    }, 500);
+}
+
+function createFireworkParticles(x, y, color) {
+    const particleCount = 12;
+
+    for (let i = 0; i < particleCount; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'firework-particle';
+        particle.style.backgroundColor = color;
+        particle.style.boxShadow = `0 0 6px ${color}`;
+
+        const angle = (i / particleCount) * Math.PI * 2;
+        const distance = 80 + Math.random() * 40;
+        const tx = Math.cos(angle) * distance;
+        const ty = Math.sin(angle) * distance;
+
+        particle.style.setProperty('--tx', tx + 'px');
+        particle.style.setProperty('--ty', ty + 'px');
+        particle.style.left = x + 'px';
+        particle.style.top = y + 'px';
+
+        document.body.appendChild(particle);
+
+        setTimeout(() => particle.remove(), 1200);
+    }
+}
+
+// Show empty state
+function showEmptyState() {
+    const boardContainer = document.getElementById('kanbanBoard');
+    boardContainer.innerHTML = `
+        <div class="flex items-center justify-center w-full h-full">
+            <div class="text-center max-w-md">
+                <div class="w-24 h-24 mx-auto mb-6 bg-gradient-to-r from-ice-200 to-blue-200 rounded-full flex items-center justify-center animate-float">
+                    <i class="ri-dashboard-3-line text-3xl text-ice-600"></i>
+                </div>
+                <h3 class="text-xl font-bold text-ice-700 mb-2">Let's Get Started! 🚀</h3>
+                <p class="text-ice-600 mb-6">Create your first list to start organizing your tasks and boost productivity!</p>
+                <button onclick="openAddListModal()" 
+                        class="inline-flex items-center px-6 py-3 bg-gradient-to-r from-ice-500 to-blue-600 text-white font-semibold rounded-xl shadow-lg hover:shadow-xl transform hover:scale-105 transition-all duration-200">
+                    <i class="ri-add-line mr-2"></i>
+                    Create First List
+                </button>
+            </div>
+        </div>
+    `;
+}
+
+// Modal functions
+function openAddListModal() {
+    document.getElementById('addListModal').classList.remove('hidden');
+    document.getElementById('addListModal').classList.add('flex');
+    document.getElementById('listTitle').focus();
+}
+
+function closeAddListModal() {
+    document.getElementById('addListModal').classList.add('hidden');
+    document.getElementById('addListModal').classList.remove('flex');
+    document.getElementById('addListForm').reset();
+}
+
+function openAddTaskModal(listId) {
+    currentTaskListId = listId;
+    document.getElementById('taskListId').value = listId;
+    document.getElementById('addTaskModal').classList.remove('hidden');
+    document.getElementById('addTaskModal').classList.add('flex');
+    document.getElementById('taskTitle').focus();
+}
+
+function closeAddTaskModal() {
+    document.getElementById('addTaskModal').classList.add('hidden');
+    document.getElementById('addTaskModal').classList.remove('flex');
+    document.getElementById('addTaskForm').reset();
+}
+
+// Delete task
+async function deleteTask(taskId) {
+    // Get task title for better UX
+    const taskElement = document.querySelector(`[data-task-id="${taskId}"]`);
+    const taskTitle = taskElement ? taskElement.querySelector('h4').textContent.trim() : 'this task';
+
+    showDeleteModal(
+        'Delete Task',
+        `Are you sure you want to delete "${taskTitle}"? This action cannot be undone.`,
+        async () => {
+            try {
+                const response = await fetch(`/api/tasks/${taskId}`, {
+                    method: 'DELETE'
+                });
+
+                if (response.ok) {
+                    showSuccessAlert('Task deleted successfully! 🗑️');
+                    await loadBoard();
+                } else {
+                    showErrorAlert('Failed to delete task. Please try again.');
+                }
+            } catch (error) {
+                console.error('Error deleting task:', error);
+                showErrorAlert('Error occurred while deleting task.');
+            }
+        }
+    );
+}
+
+// Delete list
+async function deleteList(listId, listTitle) {
+    // Double check if it's a protected list
+    if (PROTECTED_LISTS.includes(listTitle)) {
+        showErrorAlert(`Cannot delete "${listTitle}" - This is a protected system list.`);
+        return;
+    }
+
+    // Get tasks count for warning
+    const listElement = document.querySelector(`[data-list-id="${listId}"]`);
+    const tasksCount = listElement ? parseInt(listElement.dataset.taskCount || '0') : 0;
+
+    let modalTitle = 'Delete List';
+    let modalMessage = `Are you sure you want to delete the list "${listTitle}"?`;
+
+    if (tasksCount > 0) {
+        modalTitle = `⚠️ Delete List & ${tasksCount} Tasks`;
+        modalMessage = `Are you sure you want to delete the list "${listTitle}"?\n\nThis list contains ${tasksCount} task(s). All tasks will be permanently deleted and cannot be recovered!`;
+    }
+
+    showDeleteModal(
+        modalTitle,
+        modalMessage,
+        async () => {
+            try {
+                const response = await fetch(`/api/lists/${listId}`, {
+                    method: 'DELETE'
+                });
+
+                if (response.ok) {
+                    showSuccessAlert(`List "${listTitle}" deleted successfully! 🗑️`);
+                    await loadBoard();
+                } else {
+                    const error = await response.json();
+                    showErrorAlert(error.message || 'Failed to delete list. Please try again.');
+                }
+            } catch (error) {
+                console.error('Error deleting list:', error);
+                showErrorAlert('Error occurred while deleting list.');
+            }
+        }
+    );
+}
+
+// One Idempotency-Key per submission: double submits and retries of the same form replay the
+// first response instead of creating duplicates; editing the form starts a new submission
+function submissionKey(form) {
+    if (!form.dataset.idempotencyKey) {
+        form.dataset.idempotencyKey = crypto.randomUUID();
+    }
+    return form.dataset.idempotencyKey;
+}
+
+['addListForm', 'addTaskForm'].forEach(id => {
+    const form = document.getElementById(id);
+    form.addEventListener('input', () => delete form.dataset.idempotencyKey);
+});
+
+// Form submissions
+document.getElementById('addListForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    const formData = new FormData(e.target);
+
+    try {
+        const response = await fetch('/api/lists/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Idempotency-Key': submissionKey(e.target) },
+            body: JSON.stringify({
+                title: formData.get('title'),
+                board_id: currentBoardId
+            })
+        });
+
+        if (response.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (response.ok) {
+            delete e.target.dataset.idempotencyKey;
+            const newList = await response.json();
+            showSuccessAlert(`List "${newList.title}" created successfully! 📋`);
+            closeAddListModal();
+            await loadBoard();
+        } else {
+            showErrorAlert('Failed to create list. Please try again.');
+        }
+    } catch (error) {
+        console.error('Error creating list:', error);
+        showErrorAlert('Error occurred while creating list.');
+    }
+});
+
+document.getElementById('addTaskForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    const formData = new FormData(e.target);
+
+    try {
+        const response = await fetch('/api/tasks/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Idempotency-Key': submissionKey(e.target) },
+            body: JSON.stringify({
+                title: formData.get('title'),
+                description: formData.get('description'),
+                priority: formData.get('priority'),
+                list_id: parseInt(formData.get('list_id'))
+            })
+        });
+
+        if (response.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (response.ok) {
+            delete e.target.dataset.idempotencyKey;
+            const newTask = await response.json();
+            showSuccessAlert(`Task "${newTask.title}" created successfully! ✅`);
+            closeAddTaskModal();
+            await loadBoard();
+        } else {
+            showErrorAlert('Failed to create task. Please try again.');
+        }
+    } catch (error) {
+        console.error('Error creating task:', error);
+        showErrorAlert('Error occurred while creating task.');
+    }
+});
+
+// Alert functions
+function showSuccessAlert(message) {
+    document.getElementById('successMessage').textContent = message;
+    document.getElementById('successAlert').classList.remove('hidden');
+
+    // Auto hide after 3 seconds
+    setTimeout(() => {
+        hideAlert('successAlert');
+    }, 3000);
+}
+
+function showErrorAlert(message) {
+    document.getElementById('errorMessage').textContent = message;
+    document.getElementById('errorAlert').classList.remove('hidden');
+
+    // Auto hide after 5 seconds
+    setTimeout(() => {
+        hideAlert('errorAlert');
+    }, 5000);
+}
+
+function hideAlert(alertId) {
+    const alert = document.getElementById(alertId);
+    alert.classList.add('opacity-0');
+    setTimeout(() => {
+        alert.classList.add('hidden');
+        alert.classList.remove('opacity-0');
+    }, 300);
+}
+
+// Theme toggle functionality
+function toggleTheme() {
+    const currentTheme = document.documentElement.getAttribute('data-theme') || 'light';
+    const newTheme = currentTheme === 'light' ? 'dark' : 'light';
+
+    document.documentElement.setAttribute('data-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+
+    // Add smooth transition
+    document.body.style.transition = 'all 0.4s cubic-bezier(0.4, 0, 0.2, 1)';
+    setTimeout(() => {
+        document.body.style.transition = '';
+    }, 400);
+
+    // Add ripple effect to toggle
+    const toggle = document.querySelector('.theme-toggle');
+    if (toggle) {
+        const ripple = document.createElement('div');
+        ripple.classList.add('ripple');
+        toggle.appendChild(ripple);
+
+        setTimeout(() => {
+            ripple.remove();
+        }, 600);
+    }
+}
+
+// Initialize theme on page load
+function initializeTheme() {
+    const savedTheme = localStorage.getItem('theme') || 'light';
+    document.documentElement.setAttribute('data-theme', savedTheme);
+}
+
+// Initialize theme when page loads
+document.addEventListener('DOMContentLoaded', initializeTheme);
+
+// Scroll info functions
+function toggleScrollInfo() {
+    const scrollInfo = document.getElementById('scrollInfo');
+    if (scrollInfo.classList.contains('hidden')) {
+        scrollInfo.classList.remove('hidden');
+        // Auto hide after 8 seconds
+        setTimeout(() => {
+            hideScrollInfo();
+        }, 8000);
+    } else {
+        hideScrollInfo();
+    }
+}
+
+function hideScrollInfo() {
+    const scrollInfo = document.getElementById('scrollInfo');
+    scrollInfo.classList.add('opacity-0');
+    setTimeout(() => {
+        scrollInfo.classList.add('hidden');
+        scrollInfo.classList.remove('opacity-0');
+    }, 300);
+}
+
+// Delete modal functions
+let pendingDeleteAction = null;
+
+function showDeleteModal(title, message, confirmCallback) {
+    document.getElementById('deleteModalTitle').textContent = title;
+    document.getElementById('deleteModalMessage').textContent = message;
+    pendingDeleteAction = confirmCallback;
+
+    const modal = document.getElementById('deleteModal');
+    modal.classList.remove('hidden');
+    modal.classList.add('flex');
+}
+
+function hideDeleteModal() {
+    const modal = document.getElementById('deleteModal');
+    modal.classList.add('hidden');
+    modal.classList.remove('flex');
+    pendingDeleteAction = null;
+}
+
+// Confirm delete button handler
+document.addEventListener('DOMContentLoaded', function() {
+    document.getElementById('confirmDeleteBtn').addEventListener('click', function() {
+        if (pendingDeleteAction) {
+            pendingDeleteAction();
+            hideDeleteModal();
+        }
+    });
+});
+
+// Utility functions
+function logout() {
+    window.location.href = '/logout';
+}
+
+// Keyboard shortcuts
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        closeAddListModal();
+        closeAddTaskModal();
+    }
+
+    if (e.ctrlKey && e.key === 'n') {
+        e.preventDefault();
+        openAddListModal();
+    }
+});
+
+// Enhanced wheel scrolling - horizontal and vertical when not over task cards
+document.addEventListener('wheel', function(e) {
+    // Check if we're hovering over a task container, task card, or scrollable area
+    const target = e.target.closest('.tasks-container, .task-card, .scrollable-area, .modal');
+
+    // If we're not hovering over scrollable content, handle custom scroll
+    if (!target) {
+        const kanbanBoard = document.getElementById('kanbanBoard');
+        const kanbanContainer = document.getElementById('kanbanContainer');
+
+        if (kanbanBoard && kanbanContainer) {
+            e.preventDefault();
+
+            // Shift + wheel = vertical scroll
+            if (e.shiftKey) {
+                kanbanContainer.scrollTop += e.deltaY;
+            } 
+            // Ctrl + wheel = zoom (browser default, don't prevent)
+            else if (e.ctrlKey) {
+                // Let browser handle zoom
+                return;
+            }
+            // Regular wheel = horizontal scroll
+            else {
+                kanbanBoard.scrollLeft += e.deltaY;
+            }
+        }
+    }
+});
+
+// Ask the change log whether anything happened since the board was rendered; reload only if so
+async function refreshBoard() {
+    if (boardCursor === null) {
+        return loadBoard();
+    }
+    try {
+        const response = await fetch(`/api/boards/${currentBoardId}/changes?since=${boardCursor}&limit=1`);
+        if (response.ok) {
+            const delta = await response.json();
+            if (delta.changes.length === 0) {
+                return;
+            }
+        }
+        // Changed, or 410: the log was compacted past our cursor
+        await loadBoard();
+    } catch (error) {
+        console.error('Error checking board changes:', error);
+    }
+}
+
+function canRefresh() {
+    return currentBoardId && document.visibilityState === 'visible' && !document.querySelector('.tasks-container[data-paged]');
+}
+
+// Auto-refresh every 30 seconds (skipped while extra task pages are open, a reload would drop them)
+setInterval(() => {
+    if (canRefresh()) {
+        refreshBoard();
+    }
+}, 30000);
+
+// Catch up as soon as a backgrounded tab comes back
+document.addEventListener('visibilitychange', () => {
+    if (canRefresh()) {
+        refreshBoard();
+    }
+});
+
+// Loading animation
+function showLoading() {
+    document.getElementById('kanbanBoard').innerHTML = `
+        <div class="flex items-center justify-center w-full h-full">
+            <div class="text-center">
+                <div class="w-16 h-16 mx-auto mb-4 bg-gradient-to-r from-ice-300 to-blue-300 rounded-full animate-pulse"></div>
+                <p class="text-ice-600 font-medium">Loading your board...</p>
+            </div>
+        </div>
+    `;
+}
@@ -0,0 +1,44 @@
+tailwind.config = {
+    theme: {
+        extend: {
+            colors: {
+                ice: {
+                    50: '#f0f9ff',
+                    100: '#e0f2fe', 
+                    200: '#bae6fd',
+                    300: '#7dd3fc',
+                    400: '#38bdf8',
+                    500: '#0ea5e9',
+                    600: '#0284c7',
+                    700: '#0369a1',
+                    800: '#075985',
+                    900: '#0c4a6e'
+                }
+            },
+            animation: {
+                'float': 'float 6s ease-in-out infinite',
+                'slide-in': 'slideIn 0.3s ease-out',
+                'bounce-soft': 'bounceSoft 2s infinite',
+                'shimmer': 'shimmer 2s linear infinite',
+            },
+            keyframes: {
+                float: {
+                    '0%, 100%': { transform: 'translateY(0px)' },
+                    '50%': { transform: 'translateY(-10px)' }
+                },
+                slideIn: {
+                    '0%': { transform: 'translateX(-100%)', opacity: '0' },
+                    '100%': { transform: 'translateX(0)', opacity: '1' }
+                },
+                bounceSoft: {
+                    '0%, 100%': { transform: 'translateY(0)' },
+                    '50%': { transform: 'translateY(-5px)' }
+                },
+                shimmer: {
+                    '0%': { backgroundPosition: '-200% 0' },
+                    '100%': { backgroundPosition: '200% 0' }
+                }
+            }
+        }
+    }
+}
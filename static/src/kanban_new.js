@@ -0,0 +1,466 @@
+let currentBoardId = null;
+let currentTaskListId = null;
+let sortableInstances = [];
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    loadBoards();
+});
+
+// Load boards and initialize
+async function loadBoards() {
+    try {
+        const response = await fetch('/api/boards/');
+        if (response.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (response.ok) {
+            const boards = await response.json();
+            if (boards.length > 0) {
+                currentBoardId = boards[0].id;
+                await loadBoard();
+            } else {
+                await createDefaultBoard();
+            }
+        } else {
+            console.error('Failed to load boards');
+            showEmptyState();
+        }
+    } catch (error) {
+        console.error('Error loading boards:', error);
+        showEmptyState();
+    }
+}
+
+// Load current board
+async function loadBoard() {
+    if (!currentBoardId) return;
+
+    try {
+        const response = await fetch(`/api/boards/${currentBoardId}`);
+        if (response.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (response.ok) {
+            const board = await response.json();
+            renderBoard(board);
+        } else {
+            console.error('Failed to load board');
+            showEmptyState();
+        }
+    } catch (error) {
+        console.error('Error loading board:', error);
+        showEmptyState();
+    }
+}
+
+// Create default board with 5 lists
+async function createDefaultBoard() {
+    try {
+        // Create board first
+        const boardResponse = await fetch('/api/boards/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                title: 'My Kanban Board',
+                description: 'Main project board',
+                user_id: 1 // Will be overridden by backend
+            })
+        });
+
+        if (boardResponse.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (boardResponse.ok) {
+            const board = await boardResponse.json();
+            currentBoardId = board.id;
+
+            // Create default lists
+            const defaultLists = [
+                { title: 'Backlog', position: 1 },
+                { title: 'To Do', position: 2 },
+                { title: 'In Progress', position: 3 },
+                { title: 'Testing', position: 4 },
+                { title: 'Done', position: 5 }
+            ];
+
+            for (const listData of defaultLists) {
+                await fetch('/api/lists/', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({
+                        title: listData.title,
+                        position: listData.position,
+                        board_id: currentBoardId
+                    })
+                });
+            }
+
+            await loadBoard();
+        } else {
+            console.error('Failed to create default board');
+            showEmptyState();
+        }
+    } catch (error) {
+        console.error('Error creating default board:', error);
+        showEmptyState();
+    }
+}
+
+// Render the board
+function renderBoard(board) {
+    const boardContainer = document.getElementById('kanbanBoard');
+    boardContainer.innerHTML = '';
+
+    // Clear existing sortable instances
+    sortableInstances.forEach(instance => instance.destroy());
+    sortableInstances = [];
+
+    if (!board.lists || board.lists.length === 0) {
+        showEmptyState();
+        return;
+    }
+
+    // Sort lists by position
+    board.lists.sort((a, b) => (a.position || 0) - (b.position || 0));
+
+    board.lists.forEach(list => {
+        const listElement = createListElement(list);
+        boardContainer.appendChild(listElement);
+    });
+
+    // Make board horizontally sortable
+    createSortableBoard();
+}
+
+// Create list element
+function createListElement(list) {
+    const listDiv = document.createElement('div');
+    listDiv.className = 'kanban-list flex-shrink-0 w-80 h-fit animate-slide-in';
+    listDiv.dataset.listId = list.id;
+
+    const tasks = (list.tasks || []).sort((a, b) => (a.position || 0) - (b.position || 0));
+
+    listDiv.innerHTML = `
+        <div class="bg-white/30 backdrop-blur-xl rounded-2xl shadow-xl border border-white/40 overflow-hidden h-full max-h-[calc(100vh-180px)]">
+            <!-- List Header -->
+            <div class="bg-gradient-to-r from-ice-100/80 to-blue-100/80 p-4 border-b border-white/30">
+                <div class="flex items-center justify-between">
+                    <div class="flex items-center space-x-3">
+                        <div class="w-3 h-3 rounded-full bg-gradient-to-r from-ice-400 to-blue-500 animate-bounce-soft"></div>
+                        <h3 class="text-lg font-bold text-ice-800">${list.title}</h3>
+                        <span class="text-xs font-semibold text-ice-600 bg-ice-200/60 px-2 py-1 rounded-full">
+                            ${tasks.length}
+                        </span>
+                    </div>
+                    <button onclick="openAddTaskModal(${list.id})" 
+                            class="text-ice-600 hover:text-ice-800 hover:bg-white/50 p-2 rounded-lg transition-all duration-200 transform hover:scale-110 group">
+                        <i class="ri-add-line text-xl group-hover:rotate-90 transition-transform duration-200"></i>
+                    </button>
+                </div>
+            </div>
+
+            <!-- Tasks Container -->
+            <div class="p-4 overflow-y-auto max-h-[calc(100vh-300px)] scrollbar-thin scrollbar-thumb-ice-300">
+                <div class="tasks-container space-y-3 min-h-[50px]" data-list-id="${list.id}">
+                    ${tasks.map(task => createTaskElement(task)).join('')}
+                </div>
+
+                <!-- Quick Add Task -->
+                <div class="mt-4 pt-3 border-t border-white/20">
+                    <button onclick="openAddTaskModal(${list.id})" 
+                            class="w-full text-left text-ice-600 hover:text-ice-800 hover:bg-white/30 p-3 rounded-xl border-2 border-dashed border-ice-300 hover:border-ice-400 transition-all duration-200 group">
+                        <i class="ri-add-line mr-2 group-hover:rotate-90 transition-transform duration-200"></i>
+                        Add new task...
+                    </button>
+                </div>
+            </div>
+        </div>
+    `;
+
+    // Make tasks sortable
+    setTimeout(() => {
+        const tasksContainer = listDiv.querySelector('.tasks-container');
+        const sortable = Sortable.create(tasksContainer, {
+            group: 'tasks',
+            animation: 200,
+            ghostClass: 'sortable-ghost',
+            dragClass: 'transform rotate-2 scale-105',
+            onEnd: function(evt) {
+                handleTaskMove(evt.item, evt.from, evt.to, evt.newIndex);
+            }
+        });
+        sortableInstances.push(sortable);
+    }, 100);
+
+    return listDiv;
+}
+
+// Create task element
+function createTaskElement(task) {
+    const priorityConfig = {
+        high: { color: 'from-red-400 to-red-600', icon: '🔴', bg: 'bg-red-50' },
+        medium: { color: 'from-yellow-400 to-yellow-600', icon: '🟡', bg: 'bg-yellow-50' },
+        low: { color: 'from-green-400 to-green-600', icon: '🟢', bg: 'bg-green-50' }
+    };
+
+    const priority = priorityConfig[task.priority] || priorityConfig.medium;
+
+    return `
+        <div class="task-card bg-white/80 backdrop-blur-sm rounded-xl p-4 shadow-lg border border-white/40 cursor-grab active:cursor-grabbing transform transition-all duration-200 hover:scale-[1.02] hover:shadow-xl group ${priority.bg}/30" 
+             data-task-id="${task.id}" draggable="true">
+
+            <div class="flex items-start justify-between mb-3">
+                <h4 class="text-sm font-bold text-gray-800 line-clamp-2 flex-1 mr-2">
+                    ${task.title}
+                </h4>
+                <div class="opacity-0 group-hover:opacity-100 transition-opacity duration-200">
+                    <button class="text-gray-400 hover:text-red-500 p-1 rounded transition-colors" onclick="deleteTask(${task.id})">
+                        <i class="ri-delete-bin-line text-sm"></i>
+                    </button>
+                </div>
+            </div>
+
+            ${task.description ? `
+                <p class="text-xs text-gray-600 mb-3 line-clamp-2 bg-gray-50/50 p-2 rounded-lg">
+                    ${task.description}
+                </p>
+            ` : ''}
+
+            <div class="flex items-center justify-between">
+                <span class="inline-flex items-center px-2 py-1 rounded-full text-xs font-bold bg-gradient-to-r ${priority.color} text-white shadow-sm">
+                    <span class="mr-1">${priority.icon}</span>
+                    ${task.priority.charAt(0).toUpperCase() + task.priority.slice(1)}
+                </span>
+
+                <div class="flex items-center space-x-2 text-xs text-gray-500">
+                    <i class="ri-time-line"></i>
+                    <span>${new Date(task.created_at || Date.now()).toLocaleDateString()}</span>
+                </div>
+            </div>
+
+            <!-- Drag Handle -->
+            <div class="absolute top-2 right-2 opacity-0 group-hover:opacity-100 transition-opacity duration-200">
+                <i class="ri-drag-move-2-line text-gray-400 text-sm"></i>
+            </div>
+        </div>
+    `;
+}
+
+// Create sortable board
+function createSortableBoard() {
+    const boardContainer = document.getElementById('kanbanBoard');
+    Sortable.create(boardContainer, {
+        animation: 200,
+        ghostClass: 'opacity-50',
+        dragClass: 'transform scale-105',
+        onEnd: function(evt) {
+            console.log('List moved:', evt.oldIndex, 'to', evt.newIndex);
+        }
+    });
+}
+
+// Handle task movement
+async function handleTaskMove(taskElement, fromContainer, toContainer, newIndex) {
+    const taskId = taskElement.dataset.taskId;
+    const newListId = toContainer.dataset.listId;
+
+    try {
+        const response = await fetch(`/api/tasks/${taskId}`, {
+            method: 'PATCH',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                list_id: parseInt(newListId),
+                position: newIndex
+            })
+        });
+
+        if (!response.ok) {
+            console.error('Failed to move task');
+            fromContainer.insertBefore(taskElement, fromContainer.children[newIndex]);
+        }
+    } catch (error) {
+        console.error('Error moving task:', error);
+    }
+}
+
+// Show empty state
+function showEmptyState() {
+    const boardContainer = document.getElementById('kanbanBoard');
+    boardContainer.innerHTML = `
+        <div class="flex items-center justify-center w-full h-full">
+            <div class="text-center max-w-md">
+                <div class="w-24 h-24 mx-auto mb-6 bg-gradient-to-r from-ice-200 to-blue-200 rounded-full flex items-center justify-center animate-float">
+                    <i class="ri-dashboard-3-line text-3xl text-ice-600"></i>
+                </div>
+                <h3 class="text-xl font-bold text-ice-700 mb-2">Let's Get Started! 🚀</h3>
+                <p class="text-ice-600 mb-6">Create your first list to start organizing your tasks and boost productivity!</p>
+                <button onclick="openAddListModal()" 
+                        class="inline-flex items-center px-6 py-3 bg-gradient-to-r from-ice-500 to-blue-600 text-white font-semibold rounded-xl shadow-lg hover:shadow-xl transform hover:scale-105 transition-all duration-200">
+                    <i class="ri-add-line mr-2"></i>
+                    Create First List
+                </button>
+            </div>
+        </div>
+    `;
+}
+
+// Modal functions
+function openAddListModal() {
+    document.getElementById('addListModal').classList.remove('hidden');
+    document.getElementById('addListModal').classList.add('flex');
+    document.getElementById('listTitle').focus();
+}
+
+function closeAddListModal() {
+    document.getElementById('addListModal').classList.add('hidden');
+    document.getElementById('addListModal').classList.remove('flex');
+    document.getElementById('addListForm').reset();
+}
+
+function openAddTaskModal(listId) {
+    currentTaskListId = listId;
+    document.getElementById('taskListId').value = listId;
+    document.getElementById('addTaskModal').classList.remove('hidden');
+    document.getElementById('addTaskModal').classList.add('flex');
+    document.getElementById('taskTitle').focus();
+}
+
+function closeAddTaskModal() {
+    document.getElementById('addTaskModal').classList.add('hidden');
+    document.getElementById('addTaskModal').classList.remove('flex');
+    document.getElementById('addTaskForm').reset();
+}
+
+// Delete task
+async function deleteTask(taskId) {
+    if (!confirm('Are you sure you want to delete this task?')) return;
+
+    try {
+        const response = await fetch(`/api/tasks/${taskId}`, {
+            method: 'DELETE'
+        });
+
+        if (response.ok) {
+            await loadBoard();
+        } else {
+            alert('Failed to delete task');
+        }
+    } catch (error) {
+        console.error('Error deleting task:', error);
+    }
+}
+
+// Form submissions
+document.getElementById('addListForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    const formData = new FormData(e.target);
+
+    try {
+        const response = await fetch('/api/lists/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                title: formData.get('title'),
+                board_id: currentBoardId
+            })
+        });
+
+        if (response.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (response.ok) {
+            closeAddListModal();
+            await loadBoard();
+        } else {
+            alert('Failed to create list');
+        }
+    } catch (error) {
+        console.error('Error creating list:', error);
+    }
+});
+
+document.getElementById('addTaskForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    const formData = new FormData(e.target);
+
+    try {
+        const response = await fetch('/api/tasks/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                title: formData.get('title'),
+                description: formData.get('description'),
+                priority: formData.get('priority'),
+                list_id: parseInt(formData.get('list_id'))
+            })
+        });
+
+        if (response.status === 401) {
+            window.location.href = '/';
+            return;
+        }
+
+        if (response.ok) {
+            closeAddTaskModal();
+            await loadBoard();
+        } else {
+            alert('Failed to create task');
+        }
+    } catch (error) {
+        console.error('Error creating task:', error);
+    }
+});
+
+// Utility functions
+function logout() {
+    window.location.href = '/logout';
+}
+
+// Keyboard shortcuts
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        closeAddListModal();
+        closeAddTaskModal();
+    }
+
+    if (e.ctrlKey && e.key === 'n') {
+        e.preventDefault();
+        openAddListModal();
+    }
+});
+
+// Mouse wheel horizontal scrolling
+document.getElementById('kanbanBoard').addEventListener('wheel', function(e) {
+    if (e.deltaY !== 0) {
+        e.preventDefault();
+        this.scrollLeft += e.deltaY;
+    }
+});
+
+// Auto-refresh every 30 seconds
+setInterval(() => {
+    if (currentBoardId && document.visibilityState === 'visible') {
+        loadBoard();
+    }
+}, 30000);
+
+// Loading animation
+function showLoading() {
+    document.getElementById('kanbanBoard').innerHTML = `
+        <div class="flex items-center justify-center w-full h-full">
+            <div class="text-center">
+                <div class="w-16 h-16 mx-auto mb-4 bg-gradient-to-r from-ice-300 to-blue-300 rounded-full animate-pulse"></div>
+                <p class="text-ice-600 font-medium">Loading your board...</p>
+            </div>
+        </div>
+    `;
+}
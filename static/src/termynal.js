@@ -0,0 +1,235 @@
+'use strict';
+
+/** Generate a terminal widget. */
+class Termynal {
+    constructor(container = '#termynal', options = {}) {
+        this.container = (typeof container === 'string') ? document.querySelector(container) : container;
+        this.pfx = `data-${options.prefix || 'ty'}`;
+        this.startDelay = options.startDelay || 600;
+        this.typeDelay = options.typeDelay || 90;
+        this.lineDelay = options.lineDelay || 1500;
+        this.progressLength = options.progressLength || 40;
+        this.progressChar = options.progressChar || '█';
+        this.progressPercent = options.progressPercent || 100;
+        this.cursor = options.cursor || '▋';
+        this.lineData = this.lineDataToElements(options.lineData || []);
+        if (!options.noInit) this.init()
+    }
+
+    init() {
+        this.lines = [...this.container.querySelectorAll(`[${this.pfx}]`)].concat(this.lineData);
+        const containerStyle = getComputedStyle(this.container);
+        this.container.style.width = containerStyle.width !== '0px' ? containerStyle.width : undefined;
+        this.container.style.minHeight = containerStyle.height !== '0px' ? containerStyle.height : undefined;
+        this.container.setAttribute('data-termynal', '');
+        this.container.innerHTML = '';
+
+
+
+        this.start();
+    }
+
+    async start() {
+        await this._wait(this.startDelay);
+
+        // Add activity animation class after fade-in
+        this.container.classList.add('terminal-active');
+
+        // Dynamic terminal expansion
+        this._expandTerminal();
+
+        for (let line of this.lines) {
+            const type = line.getAttribute(this.pfx);
+            const delay = line.getAttribute(`${this.pfx}-delay`) || this.lineDelay;
+            if (type == 'input') {
+                line.setAttribute(`${this.pfx}-cursor`, this.cursor);
+                await this.type(line);
+                await this._wait(delay);
+            } else if (type == 'progress') {
+                await this.progress(line);
+                await this._wait(delay);
+            } else {
+                this.container.appendChild(line);
+                this._colorize(line);
+                await this._wait(delay);
+            }
+            line.removeAttribute(`${this.pfx}-cursor`);
+
+            // Expand terminal as content grows
+            this._expandTerminal();
+        }
+    }
+
+    _expandTerminal() {
+        // Calculate required height based on content
+        const lineCount = this.container.children.length;
+        const baseHeight = 120; // Initial height
+        const lineHeight = 29; // Approximate line height
+        const newMinHeight = Math.max(baseHeight, baseHeight + (lineCount * lineHeight));
+
+        // Smooth expansion
+        this.container.style.minHeight = `${newMinHeight}px`;
+
+        // Add expansion animation class
+        this.container.classList.add('expanding');
+        setTimeout(() => {
+            this.container.classList.remove('expanding');
+        }, 300);
+    }
+
+    _colorize(line) {
+        const text = line.textContent;
+        const isDark = document.documentElement.getAttribute('data-theme') === 'dark';
+
+        // PASSED tests - inverted colors
+        if (text.includes('PASSED')) {
+            line.style.color = isDark ? '#3ec930' : '#10b981';
+            line.style.fontWeight = 'bold';
+        }
+        // Test names - inverted colors
+        else if (text.includes('test_')) {
+            line.style.color = isDark ? '#3a1c71' : '#60a5fa';
+        }
+        // Headers with === - inverted colors
+        else if (text.includes('===')) {
+            line.style.color = isDark ? '#ffaf7b' : '#f59e0b';
+            line.style.fontWeight = 'bold';
+        }
+        // Platform info - inverted colors
+        else if (text.includes('platform') || text.includes('rootdir')) {
+            line.style.color = isDark ? '#d76d77' : '#8b5cf6';
+        }
+        // Collected items - inverted colors
+        else if (text.includes('collected')) {
+            line.style.color = isDark ? '#ffaf7b' : '#06b6d4';
+            line.style.fontWeight = 'bold';
+        }
+        // Coverage percentages - inverted colors
+        else if (text.includes('100%')) {
+            line.style.color = isDark ? '#3ec930' : '#10b981';
+            line.style.fontWeight = 'bold';
+        }
+        else if (text.includes('98%')) {
+            line.style.color = isDark ? '#3ec930' : '#10b981';
+            line.style.fontWeight = 'bold';
+        }
+        else if (text.includes('96%')) {
+            line.style.color = isDark ? '#f4c025' : '#eab308';
+            line.style.fontWeight = 'bold';
+        }
+        // Flask server info - inverted colors
+        else if (text.includes('Running on') || text.includes('Environment')) {
+            line.style.color = isDark ? '#d76d77' : '#06b6d4';
+        }
+        // Debug mode - inverted colors
+        else if (text.includes('Debug mode')) {
+            line.style.color = isDark ? '#ffaf7b' : '#f59e0b';
+        }
+        // Coverage table headers - inverted colors
+        else if (text.includes('Name') && text.includes('Stmts')) {
+            line.style.color = isDark ? '#1a1e24' : '#e2e8f0';
+            line.style.fontWeight = 'bold';
+        }
+        // TOTAL row - inverted colors
+        else if (text.includes('TOTAL')) {
+            line.style.color = isDark ? '#1a1e24' : '#f1f5f9';
+            line.style.fontWeight = 'bold';
+        }
+        // Control message - red (both themes)
+        else if (text.includes('Press CTRL+C')) {
+            line.style.color = isDark ? '#d9515d' : '#ef4444';
+            line.style.fontStyle = 'italic';
+        }
+    }
+
+    async type(line) {
+        const chars = [...line.textContent];
+        const delay = line.getAttribute(`${this.pfx}-typeDelay`) || this.typeDelay;
+        line.textContent = '';
+        this.container.appendChild(line);
+
+        // Add typing indicator
+        this.container.classList.add('typing-active');
+
+        for (let char of chars) {
+            await this._wait(delay);
+            line.textContent += char;
+        }
+
+        // Remove typing indicator and apply colors
+        this.container.classList.remove('typing-active');
+        this._colorize(line);
+    }
+
+    async progress(line) {
+        const progressLength = line.getAttribute(`${this.pfx}-progressLength`) || this.progressLength;
+        const progressChar = line.getAttribute(`${this.pfx}-progressChar`) || this.progressChar;
+        const chars = progressChar.repeat(progressLength);
+        const progressPercent = line.getAttribute(`${this.pfx}-progressPercent`) || this.progressPercent;
+        line.textContent = '';
+        this.container.appendChild(line);
+        for (let i = 1; i < chars.length + 1; i++) {
+            await this._wait(this.typeDelay);
+            const percent = Math.round(i / chars.length * 100);
+            line.textContent = `${chars.slice(0, i)} ${percent}%`;
+            if (percent > progressPercent) {
+                break;
+            }
+        }
+    }
+
+    _wait(time) {
+        return new Promise(resolve => setTimeout(resolve, time));
+    }
+
+    lineDataToElements(lineData) {
+        return lineData.map(line => {
+            let div = document.createElement('div');
+            div.innerHTML = `<span ${this._attributes(line)}>${line.value || ''}</span>`;
+            return div.firstElementChild;
+        });
+    }
+
+    _attributes(line) {
+        let attrs = '';
+        for (let prop in line) {
+            attrs += this.pfx;
+            if (prop === 'type') {
+                attrs += `="${line[prop]}" `
+            } else if (prop !== 'value') {
+                attrs += `-${prop}="${line[prop]}" `
+            }
+        }
+        return attrs;
+    }
+}
+
+// Smart terminal initialization with fade-in
+document.addEventListener('DOMContentLoaded', function() {
+    const terminal = document.getElementById('termynal');
+    let terminalStarted = false;
+
+    // Intersection Observer to start terminal when visible
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting && !terminalStarted) {
+                terminalStarted = true;
+
+                // Start terminal with fade-in
+                setTimeout(() => {
+                    new Termynal('#termynal', {
+                        startDelay: 800,
+                        typeDelay: 50,
+                        lineDelay: 900
+                    });
+                }, 300);
+            }
+        });
+    }, {
+        threshold: 0.3 // Start when 30% visible
+    });
+
+    if (terminal) {
+        observer.observe(terminal);
+    }
+});